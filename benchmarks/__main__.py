@@ -0,0 +1,33 @@
+import json
+import argparse
+from .suite import run, compare
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description='dbcode CRUD benchmarks')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000, 1000000], help='table sizes')
+    parser.add_argument('--ops', type=int, default=1000, help='operations per case')
+    parser.add_argument('--sqlite', default=None, help='sqlite3 file path (default temporary file)')
+    parser.add_argument('--psql', default=None, metavar='HOST:PORT:USER:PASSWORD:DBNAME', help='run against postgresql')
+    parser.add_argument('--output', default=None, help='save results as JSON')
+    parser.add_argument('--compare', default=None, help='compare with saved JSON results')
+    args = parser.parse_args()
+
+    psql: dict = None
+    if args.psql is not None:
+        host, port, user, password, dbname = args.psql.split(':', 4)
+        psql = {'host': host, 'port': port, 'user': user, 'password': password, 'dbname': dbname}
+
+    results: dict = run(args.sizes, args.ops, args.sqlite, psql)
+    if args.output is not None:
+        with open(args.output, mode='w', encoding='utf-8') as file:
+            json.dump(results, file, indent=2)
+    if args.compare is not None:
+        with open(args.compare, mode='r', encoding='utf-8') as file:
+            old: dict = json.load(file)
+        for size, op, before, after, ratio in compare(old, results):
+            print(f'{size:>9} {op:<28} {before:>12.1f} -> {after:>12.1f} ops/s  x{ratio:.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,170 @@
+import os
+import sys
+import time
+import random
+import sqlite3
+import platform
+import tempfile
+import tracemalloc
+from dbcode import database
+
+
+TABLES: dict = {
+    'bench': ['name', 'category', 'amount', 'created'],
+    'bench_category': ['category', 'label'],
+}
+CATEGORIES: int = 100
+
+
+def percentile(samples: list, p: float) -> float or None:
+    """
+    percentile of sorted samples. \n
+    :param samples: sorted samples.
+    :param p: percentile (0 - 100).
+    :return: value or None if no samples.
+    """
+    if not samples:
+        return None
+    return samples[min(len(samples) - 1, int(len(samples) * p / 100))]
+
+
+def rows(count: int, seed: int = 0):
+    generator = random.Random(seed)
+    for i in range(count):
+        yield [f'name_{i}', generator.randrange(CATEGORIES), generator.randrange(1000000), f'2024-01-01 00:00:{i % 60:02d}']
+
+
+def measure(size: int, name: str, fn, ops: int) -> dict:
+    """
+    run operation ops times, then once more under tracemalloc. \n
+    :param size: table size.
+    :param name: operation name.
+    :param fn: function (i) running one operation.
+    :param ops: count of operations.
+    :return: result dict.
+    """
+    latencies: list = []
+    start: float = time.perf_counter()
+    for i in range(ops):
+        begin: float = time.perf_counter()
+        fn(i)
+        latencies.append(time.perf_counter() - begin)
+    total: float = time.perf_counter() - start
+    tracemalloc.start()
+    fn(ops)
+    peak: int = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    latencies.sort()
+    return {
+        'size': size,
+        'op': name,
+        'ops': ops,
+        'seconds': total,
+        'throughput': ops / total if total else None,
+        'p50': percentile(latencies, 50),
+        'p99': percentile(latencies, 99),
+        'peak_memory': peak,
+    }
+
+
+def load(db: database, size: int) -> dict:
+    """
+    fill tables with size rows using insert_many. \n
+    :return: result dict.
+    """
+    db.drop_base([i for i in TABLES if i in (db.get_tables() or [])])
+    db.create_base(TABLES)
+    db.db_params.update(TABLES)
+    db.insert_many('bench_category', ([i, f'label_{i}'] for i in range(CATEGORIES)))
+    tracemalloc.start()
+    start: float = time.perf_counter()
+    db.insert_many('bench', rows(size), batch_size=10000)
+    total: float = time.perf_counter() - start
+    peak: int = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {'size': size, 'op': 'insert_many', 'ops': size, 'seconds': total, 'throughput': size / total if total else None,
+            'p50': None, 'p99': None, 'peak_memory': peak}
+
+
+def run_size(db: database, size: int, ops: int) -> list:
+    """
+    run all operations against table of size rows. \n
+    :param db: connected database.
+    :param size: table size.
+    :param ops: count of operations per case.
+    :return: list of result dicts.
+    """
+    results: list = [load(db, size)]
+    print(format_result(results[-1]), file=sys.stderr)
+    generator = random.Random(size)
+    ids: list = [generator.randrange(1, size + 1) for _ in range(ops * 2 + 2)]
+    cases: list = [
+        ('insert', lambda i: db.insert('bench', [f'new_{i}', i % CATEGORIES, i, '2024-01-02 00:00:00'])),
+        ('select_id', lambda i: db.select('bench', db.db_id, ids[i])),
+        ('select_filter_order_limit', lambda i: db.select('bench', 'category', i % CATEGORIES, order_fields='amount',
+                                                          order_type='DESC', limit=100)),
+        ('select_join', lambda i: db.select_join('bench', 'bench_category', [[('category', 'category')]], limit=100)),
+        ('select_count', lambda i: db.select_count('bench', 'category', i % CATEGORIES)),
+        ('update', lambda i: db.update('bench', 'amount', i, db.db_id, ids[i])),
+        ('delete', lambda i: db.delete('bench', db.db_id, ids[ops + i])),
+    ]
+    for name, fn in cases:
+        results.append(measure(size, name, fn, ops))
+        print(format_result(results[-1]), file=sys.stderr)
+    return results
+
+
+def format_result(result: dict) -> str:
+    p50: str = f"{result['p50'] * 1000:.3f}ms" if result['p50'] is not None else '-'
+    p99: str = f"{result['p99'] * 1000:.3f}ms" if result['p99'] is not None else '-'
+    return f"{result['size']:>9} {result['op']:<28} {result['throughput'] or 0:>12.1f} ops/s  p50 {p50:>10}  " \
+           f"p99 {p99:>10}  peak {result['peak_memory'] / 1024:>10.1f} KiB"
+
+
+def run(sizes: list, ops: int, path: str = None, psql: dict = None) -> dict:
+    """
+    run benchmark suite. \n
+    :param sizes: table sizes.
+    :param ops: count of operations per case.
+    :param path: sqlite3 file path (None - temporary file).
+    :param psql: postgresql connect arguments (host, port, user, password, dbname) instead of sqlite3.
+    :return: dict with meta and results.
+    """
+    results: list = []
+    with tempfile.TemporaryDirectory() as directory:
+        db = database()
+        if psql is not None:
+            db.connect_psql(**psql)
+        else:
+            db.connect_sql3(path or os.path.join(directory, 'bench.db'))
+        for size in sizes:
+            results.extend(run_size(db, size, ops))
+        db.drop_base(TABLES)
+        db.close()
+    return {
+        'meta': {
+            'backend': db.db_type,
+            'python': platform.python_version(),
+            'sqlite': sqlite3.sqlite_version,
+            'platform': platform.platform(),
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'ops': ops,
+        },
+        'results': results,
+    }
+
+
+def compare(old: dict, new: dict) -> list:
+    """
+    compare two runs. \n
+    :return: list of (size, op, old throughput, new throughput, ratio).
+    """
+    index: dict = {(i['size'], i['op']): i for i in old['results']}
+    rows: list = []
+    for result in new['results']:
+        before = index.get((result['size'], result['op']))
+        if before is None or not before['throughput'] or not result['throughput']:
+            continue
+        rows.append((result['size'], result['op'], before['throughput'], result['throughput'],
+                     result['throughput'] / before['throughput']))
+    return rows
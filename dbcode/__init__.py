@@ -1 +1,11 @@
 from dbcode.database import database
+
+
+def __getattr__(name: str):
+    # async_database loads asyncio, it is imported on first access
+    if name == 'async_database':
+        from dbcode.async_database import async_database
+        # importing submodule sets module attribute of the same name, class replaces it
+        globals()['async_database'] = async_database
+        return async_database
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
@@ -0,0 +1,73 @@
+import threading
+
+
+class advisor:
+    def __init__(self, max_shapes: int = None) -> None:
+        """
+        index advisor, records filter shapes of requests and explains the hottest ones. \n
+        :param max_shapes: max count of recorded shapes.
+        """
+        self.max_shapes: int = 1000 if max_shapes is None else max_shapes
+        self._shapes: dict = {}
+        self._lock = threading.Lock()
+
+    def record(self, method: str, table: str, params: tuple, order_fields: tuple, request: str, args: list) -> None:
+        """
+        record request shape. \n
+        :param method: method name.
+        :param table: table name.
+        :param params: filter parameters.
+        :param order_fields: order fields.
+        :param request: SQL request with placeholders.
+        :param args: bind parameters (last seen are used for EXPLAIN).
+        :return: None.
+        """
+        key: tuple = (method, table, params, order_fields)
+        with self._lock:
+            shape: dict = self._shapes.get(key)
+            if shape is None:
+                if len(self._shapes) >= self.max_shapes:
+                    return
+                shape = {'method': method, 'table': table, 'params': list(params),
+                         'order_fields': list(order_fields), 'count': 0}
+                self._shapes[key] = shape
+            shape['count'] += 1
+            shape['request'], shape['args'] = request, list(args)
+
+    def hottest(self, top: int = None) -> list:
+        """
+        hottest request shapes. \n
+        :param top: count of shapes (None - all).
+        :return: list of shapes sorted by count.
+        """
+        with self._lock:
+            shapes: list = sorted((dict(i) for i in self._shapes.values()), key=lambda i: i['count'], reverse=True)
+        return shapes if top is None else shapes[:top]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._shapes.clear()
+
+    @staticmethod
+    def is_scan(dialect, table: str, plan: list) -> bool:
+        """
+        plan has full table scan. \n
+        :param dialect: backend dialect.
+        :param table: table name.
+        :param plan: plan lines.
+        :return: bool.
+        """
+        table: str = table.lower()
+        return any(dialect.is_scan(table, line.strip().lower()) for line in plan)
+
+    @staticmethod
+    def suggest(shape: dict) -> list:
+        """
+        suggested index columns: equality filters first, then order fields. \n
+        :param shape: request shape.
+        :return: list of columns.
+        """
+        columns: list = []
+        for column in shape['params'] + shape['order_fields']:
+            columns.append(column) if column not in columns else None
+        return columns
@@ -0,0 +1,155 @@
+import asyncio
+import functools
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+from .database import database
+
+
+class async_database:
+    def __init__(self, **kwargs) -> None:
+        """
+        asyncio front-end of database, every request runs on executor threads,
+        SQL generation is the same as in database. \n
+        :param kwargs: database init arguments (db_id, db_debug, db_encode ...).
+        """
+        self.database = database(**kwargs)
+        self._executor = None
+        self._semaphore = None
+        self._connections = None
+
+    def _start(self, pool_size: int = None, concurrency: int = None) -> None:
+        workers: int = 1 if pool_size is None else pool_size
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='dbcode')
+        self._semaphore = asyncio.Semaphore(workers if concurrency is None else concurrency)
+        # pooled connections: requests wait for free connection on event loop, not on executor thread
+        self._connections = asyncio.Semaphore(pool_size) if pool_size is not None else None
+
+    async def _call(self, fn, *args, **kwargs):
+        async with self._semaphore:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, functools.partial(fn, *args, **kwargs))
+
+    async def _run(self, fn, *args, **kwargs):
+        if self._connections is None:
+            return await self._call(fn, *args, **kwargs)
+        async with self._connections:
+            return await self._call(fn, *args, **kwargs)
+
+    async def connect_sql3(self, path, pool_size: int = None, pool_timeout: float = None, concurrency: int = None,
+                           profile: str or dict = None, maintenance: float = None) -> None:
+        """
+        connect function, connect to sqlite3 database. \n
+        without pool_size connection lives on one dedicated executor thread.
+        :param path: file path to sqlite3 database.
+        :param pool_size: max count of pooled connections (and executor threads).
+        :param pool_timeout: max seconds to wait for pooled connection.
+        :param concurrency: max count of requests running at the same time (default pool_size or 1).
+        :param profile: performance profile (default / throughput / durable / readonly) or dict of pragmas.
+        :param maintenance: seconds between maintenance run after commit (None - off).
+        :return: None.
+        """
+        self._start(pool_size, concurrency)
+        await self._run(self.database.connect_sql3, path, pool_size, pool_timeout, profile, maintenance)
+
+    async def connect_psql(self, host, port, user, password, dbname, pool_size: int = None, pool_timeout: float = None,
+                           concurrency: int = None) -> None:
+        """
+        connect function, connect to postgresql database. \n
+        :param host: postgresql database host (ip address).
+        :param port: postgresql database port.
+        :param user: postgresql database user.
+        :param password: postgresql database password.
+        :param dbname: postgresql database name (database).
+        :param pool_size: max count of pooled connections (and executor threads).
+        :param pool_timeout: max seconds to wait for pooled connection.
+        :param concurrency: max count of requests running at the same time (default pool_size or 1).
+        :return: None.
+        """
+        self._start(pool_size, concurrency)
+        await self._run(self.database.connect_psql, host, port, user, password, dbname, pool_size, pool_timeout)
+
+    async def close(self) -> None:
+        """
+        close connection and executor. \n
+        :return: None.
+        """
+        if self._executor is not None:
+            await self._run(self.database.close)
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    async def run(self, fn, *args, **kwargs):
+        """
+        run function with database as first argument on executor thread,
+        use it for several requests in one transaction. \n
+        :param fn: function (database, *args, **kwargs).
+        :return: function result.
+        """
+        return await self._run(fn, self.database, *args, **kwargs)
+
+    async def _iter(self, generator, chunk_size: int):
+        # pooled generator keeps its connection between chunks, connection is reserved until it is closed
+        await self._connections.acquire() if self._connections is not None else None
+        try:
+            while True:
+                rows: list = await self._call(lambda: list(itertools.islice(generator, chunk_size)))
+                if not rows:
+                    break
+                for row in rows:
+                    yield row
+        finally:
+            try:
+                await self._call(generator.close)
+            finally:
+                self._connections.release() if self._connections is not None else None
+
+    async def iter_select(self, *args, chunk_size: int = 1000, **kwargs):
+        """
+        SELECT (**READ**) request, streaming (see database.iter_select). \n
+        :return: async generator of rows.
+        """
+        async for row in self._iter(self.database.iter_select(*args, chunk_size=chunk_size, **kwargs), chunk_size):
+            yield row
+
+    async def select_in(self, *args, fetch_size: int = 1000, **kwargs):
+        """
+        SELECT IN (**READ**) request, streaming (see database.select_in). \n
+        :return: async generator of rows.
+        """
+        async for row in self._iter(self.database.select_in(*args, fetch_size=fetch_size, **kwargs), fetch_size):
+            yield row
+
+    async def changes_since(self, *args, chunk_size: int = 1000, **kwargs):
+        """
+        CHANGES SINCE (**READ**) request, streaming (see database.changes_since). \n
+        :return: async generator of (version, operation, record).
+        """
+        async for row in self._iter(self.database.changes_since(*args, chunk_size=chunk_size, **kwargs), chunk_size):
+            yield row
+
+    async def iter_raw(self, request: str, chunk_size: int = 1000):
+        """
+        RAW request, streaming (see database.iter_raw). \n
+        :return: async generator of rows.
+        """
+        async for row in self._iter(self.database.iter_raw(request, chunk_size), chunk_size):
+            yield row
+
+    def statement_stats(self) -> dict:
+        return self.database.statement_stats()
+
+    def pool_stats(self) -> dict:
+        return self.database.pool_stats()
+
+
+def _proxy(name: str):
+    async def method(self, *args, **kwargs):
+        return await self._run(getattr(self.database, name), *args, **kwargs)
+    method.__name__ = name
+    method.__doc__ = getattr(database, name).__doc__
+    return method
+
+
+for _name in ('load_schema', 'get_schema_version', 'raw', 'sql_file', 'get_tables', 'get_columns', 'select', 'select_page', 'select_join', 'select_count', 'select_aggregate', 'parallel_select',
+              'update', 'update_many', 'insert', 'insert_many', 'upsert', 'delete', 'export_table', 'import_table', 'create_table', 'drop_table', 'create_base', 'drop_base',
+              'create_index', 'drop_index', 'index_advice', 'maintenance', 'track_changes', 'changes_version', 'sync_to'):
+    setattr(async_database, _name, _proxy(_name))
@@ -0,0 +1,177 @@
+import re
+import sys
+import time
+import threading
+from array import array
+from collections import OrderedDict
+
+
+_WRITE = re.compile(r'^\s*(?:INSERT\s+(?:OR\s+\w+\s+)?INTO|REPLACE\s+INTO|UPDATE(?:\s+OR\s+\w+)?|DELETE\s+FROM'
+                    r'|DROP\s+TABLE(?:\s+IF\s+EXISTS)?|ALTER\s+TABLE(?:\s+IF\s+EXISTS)?|TRUNCATE(?:\s+TABLE)?)'
+                    r'\s+(?:ONLY\s+)?([\w."]+)', re.IGNORECASE)
+_READ = re.compile(r'^\s*(?:SELECT|EXPLAIN)\b', re.IGNORECASE)
+
+
+def written_table(request: str) -> str or bool or None:
+    """
+    table written by SQL request. \n
+    :param request: SQL request.
+    :return: table name, None if request only reads or True if written tables are unknown.
+    """
+    match = _WRITE.match(request)
+    if match:
+        return match.group(1).replace('"', '').split('.')[-1]
+    if _READ.match(request) and ';' not in request.strip().rstrip(';'):
+        return None
+    return True
+
+
+def _sizeof(value) -> int:
+    size: int = sys.getsizeof(value)
+    if isinstance(value, (list, tuple)):
+        for row in value:
+            size += sys.getsizeof(row)
+            for item in (row.values() if isinstance(row, dict) else row):
+                size += sys.getsizeof(item)
+    return size
+
+
+def _column(values):
+    if isinstance(values, array):
+        return array(values.typecode, values)
+    return values.copy()
+
+
+def _copy(result, rows: type = list):
+    """
+    copy of result, cached result is never handed out (caller could change it). \n
+    :param result: rows (list / tuple), columns (dict of column arrays) or value.
+    :param rows: type of copied rows container.
+    :return: result copy.
+    """
+    if isinstance(result, (list, tuple)):
+        return rows(row.copy() if isinstance(row, dict) else row for row in result)
+    if isinstance(result, dict):
+        return {name: _column(values) for name, values in result.items()}
+    return result
+
+
+class result_cache:
+    def __init__(self, max_size: int = None, ttl: float = None) -> None:
+        """
+        read-through query result cache with LRU and TTL eviction and table-level invalidation. \n
+        :param max_size: max count of cached results.
+        :param ttl: seconds result lives in cache (None - until evicted or invalidated).
+        """
+        self.max_size: int = 1024 if max_size is None else max_size
+        self.ttl: float = ttl
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+        self.invalidations: int = 0
+        self._entries: OrderedDict = OrderedDict()
+        self._tables: dict = {}
+        self._generations: dict = {}
+        self._generation: int = 0
+        self._memory: int = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple) -> tuple:
+        """
+        get cached result. \n
+        :param key: normalized request.
+        :return: (True, copy of result) if cached or (False, None) if not.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] is not None and entry[0] < time.monotonic():
+                self._remove(key)
+                self.evictions += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return True, _copy(entry[2])
+
+    def generation(self, table: str) -> tuple:
+        """
+        invalidation generation of table, read before request and passed to set. \n
+        :param table: table name.
+        :return: generation.
+        """
+        with self._lock:
+            return self._generation, self._generations.get(table.lower(), 0)
+
+    def set(self, key: tuple, table: str, result, generation: tuple = None) -> None:
+        """
+        put copy of result in cache, result is dropped if table was invalidated after generation was read
+        (write finished while result was read). \n
+        :param key: normalized request.
+        :param table: table name.
+        :param result: request result.
+        :param generation: generation of table read before request.
+        :return: None.
+        """
+        table: str = table.lower()
+        expires: float = None if self.ttl is None else time.monotonic() + self.ttl
+        result = _copy(result, tuple)
+        size: int = _sizeof(result)
+        with self._lock:
+            if generation is not None and generation != (self._generation, self._generations.get(table, 0)):
+                return
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (expires, table, result, size)
+            self._tables.setdefault(table, set()).add(key)
+            self._memory += size
+            while len(self._entries) > self.max_size:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _remove(self, key: tuple) -> None:
+        _, table, _, size = self._entries.pop(key)
+        self._memory -= size
+        keys: set = self._tables.get(table)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._tables[table]
+
+    def invalidate(self, table: str = None) -> None:
+        """
+        drop cached results of table. \n
+        :param table: table name (None - all tables).
+        :return: None.
+        """
+        with self._lock:
+            if table is None:
+                self._generation += 1
+                self.invalidations += len(self._entries)
+                self._entries.clear()
+                self._tables.clear()
+                self._memory = 0
+                return
+            self._generations[table.lower()] = self._generations.get(table.lower(), 0) + 1
+            for key in list(self._tables.get(table.lower(), ())):
+                self._remove(key)
+                self.invalidations += 1
+
+    def stats(self) -> dict:
+        """
+        result cache stats. \n
+        :return: dict with hits, misses, hit_ratio, size, max_size, memory (bytes), evictions and invalidations.
+        """
+        with self._lock:
+            requests: int = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': self.hits / requests if requests else 0.0,
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'memory': self._memory,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+            }
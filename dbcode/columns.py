@@ -0,0 +1,122 @@
+import keyword
+from array import array
+from operator import itemgetter
+
+
+FORMATS: tuple = ('rows', 'tuples', 'columns')
+CHUNK_SIZE: int = 10000
+# numpy module, imported on first column result (False - not installed)
+numpy = None
+
+
+def _storage(values: tuple):
+    if all(type(i) is int for i in values):
+        try:
+            return array('q', values)
+        except OverflowError:
+            return list(values)
+    if all(type(i) is int or type(i) is float for i in values):
+        return array('d', values)
+    return list(values)
+
+
+def _extend(storage, values: tuple):
+    if storage is None:
+        return _storage(values)
+    if isinstance(storage, list):
+        storage.extend(values)
+        return storage
+    chunk = _storage(values)
+    if isinstance(chunk, array) and chunk.typecode == storage.typecode:
+        storage.extend(chunk)
+        return storage
+    if isinstance(chunk, array):
+        # int and float chunks are merged into float column
+        storage = storage if storage.typecode == 'd' else array('d', storage)
+        storage.extend(chunk if chunk.typecode == 'd' else array('d', chunk))
+        return storage
+    storage = storage.tolist()
+    storage.extend(values)
+    return storage
+
+
+def _finish(storage):
+    global numpy
+    if storage is None:
+        return []
+    if isinstance(storage, array):
+        if numpy is None:
+            try:
+                import numpy
+            except ImportError:
+                numpy = False
+        if numpy:
+            return numpy.frombuffer(storage, dtype=numpy.int64 if storage.typecode == 'q' else numpy.float64)
+    return storage
+
+
+def _names(cursor) -> list:
+    names: list = []
+    for column in cursor.description:
+        name: str = column[0]
+        count: int = 1
+        while name in names:
+            count += 1
+            name = f'{column[0]}_{count}'
+        names.append(name)
+    return names
+
+
+def fetch_columns(cursor, chunk_size: int = CHUNK_SIZE) -> dict or None:
+    """
+    fetch result chunk by chunk into columns: array.array for int / float columns
+    (numpy.ndarray when numpy is installed) and list for other columns. \n
+    :param cursor: executed cursor returning tuples.
+    :param chunk_size: rows per fetch.
+    :return: dict of column name and column values or None if no data.
+    """
+    names: list = _names(cursor)
+    columns: list = [None for _ in names]
+    count: int = 0
+    while True:
+        rows = cursor.fetchmany(chunk_size)
+        if not rows:
+            break
+        count += len(rows)
+        for i, values in enumerate(zip(*rows)):
+            columns[i] = _extend(columns[i], values)
+    if not count:
+        return None
+    return {name: _finish(columns[i]) for i, name in enumerate(names)}
+
+
+def row_class(names: list) -> type:
+    """
+    tuple subclass with attribute access by column name (no per-row dict). \n
+    :param names: column names.
+    :return: row class.
+    """
+    namespace: dict = {'__slots__': (), '_fields': tuple(names)}
+    for i, name in enumerate(names):
+        if name.isidentifier() and not keyword.iskeyword(name) and name not in ('count', 'index'):
+            namespace[name] = property(itemgetter(i))
+    namespace['__repr__'] = lambda self: f"row({', '.join(f'{k}={v!r}' for k, v in zip(self._fields, self))})"
+    namespace['_asdict'] = lambda self: dict(zip(self._fields, self))
+    return type('row', (tuple,), namespace)
+
+
+def fetch_tuples(cursor, chunk_size: int = CHUNK_SIZE) -> list or None:
+    """
+    fetch result chunk by chunk into tuple rows with attribute access (no per-row dict). \n
+    :param cursor: executed cursor returning tuples.
+    :param chunk_size: rows per fetch.
+    :return: list of rows or None if no data.
+    """
+    row: type = row_class(_names(cursor))
+    result: list = []
+    while True:
+        rows = cursor.fetchmany(chunk_size)
+        if not rows:
+            break
+        result.extend(map(row, rows))
+    return result or None
@@ -0,0 +1,354 @@
+import threading
+from collections import OrderedDict
+
+
+AGGREGATES: dict = {
+    'count': 'count({})',
+    'count_distinct': 'count(DISTINCT {})',
+    'sum': 'sum({})',
+    'avg': 'avg({})',
+    'min': 'min({})',
+    'max': 'max({})',
+}
+
+
+class statement:
+    __slots__ = ('sql', 'name', 'prepare', 'execute', 'hits')
+
+    def __init__(self, sql: str, name: str, prepare: str = None, execute: str = None) -> None:
+        """
+        compiled statement. \n
+        :param sql: SQL request with driver placeholders.
+        :param name: statement name (server-side prepared statement name).
+        :param prepare: PREPARE request (postgresql).
+        :param execute: EXECUTE request (postgresql).
+        """
+        self.sql: str = sql
+        self.name: str = name
+        self.prepare: str = prepare
+        self.execute: str = execute
+        self.hits: int = 0
+
+
+class compiler:
+    def __init__(self, placeholder: str = '?', prepare: bool = False, max_size: int = None,
+                 prepare_threshold: int = None) -> None:
+        """
+        query compiler, turns request shape into SQL with placeholders and keeps it in LRU cache. \n
+        :param placeholder: bind parameter placeholder of driver (? / %s).
+        :param prepare: backend supports PREPARE name AS ... $n / EXECUTE name (postgresql).
+        :param max_size: max count of compiled statements in cache.
+        :param prepare_threshold: count of hits after which statement is PREPAREd on server.
+        """
+        self.placeholder: str = placeholder
+        self.prepare: bool = prepare
+        self.max_size: int = 256 if max_size is None else max_size
+        self.prepare_threshold: int = 5 if prepare_threshold is None else prepare_threshold
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evicted: list = []
+        self._cache: OrderedDict = OrderedDict()
+        self._counter: int = 0
+        self._lock = threading.Lock()
+
+    def stats(self) -> dict:
+        """
+        compiled statement cache stats. \n
+        :return: dict with hits, misses, size and max_size.
+        """
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self._cache), 'max_size': self.max_size}
+
+    def clear(self) -> None:
+        """
+        clear compiled statement cache. \n
+        :return: None.
+        """
+        with self._lock:
+            self.evicted.extend(stmt.name for stmt in self._cache.values() if stmt.prepare)
+            self._cache.clear()
+
+    def _get(self, key: tuple, build) -> statement:
+        with self._lock:
+            stmt = self._cache.get(key)
+            if stmt is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                stmt.hits += 1
+                return stmt
+            self.misses += 1
+            self._counter += 1
+            name: str = f'dbcode_{self._counter}'
+        if self.prepare:
+            sql, count = build(lambda i: self.placeholder)
+            prepared, _ = build(lambda i: f'${i + 1}')
+            args: str = f" ({', '.join(self.placeholder for _ in range(count))})" if count else ''
+            stmt = statement(sql, name, f'PREPARE {name} AS {prepared}', f'EXECUTE {name}{args}')
+        else:
+            sql, _ = build(lambda i: self.placeholder)
+            stmt = statement(sql, name)
+        with self._lock:
+            self._cache[key] = stmt
+            if len(self._cache) > self.max_size:
+                evicted: statement = self._cache.popitem(last=False)[1]
+                self.evicted.append(evicted.name) if evicted.prepare else None
+        return stmt
+
+    @staticmethod
+    def _marks(conditions: tuple) -> int:
+        """
+        count of bind parameters of conditions, ('IN', n) operator takes n. \n
+        """
+        return sum(op[1] if isinstance(op, tuple) and op[0] == 'IN' else 1 for _, op in conditions)
+
+    @staticmethod
+    def _where(conditions: tuple, operator: str, mark, start: int = 0) -> str:
+        """
+        WHERE clause of (param, operator) pairs, operator is '=' / '!=' / ..., ('IN', n) - param IN (n marks)
+        or 'ANY' / ('ANY', type) - param = ANY(array mark [cast to type array]) (postgresql). \n
+        """
+        where: list = []
+        for param, op in conditions:
+            if isinstance(op, tuple) and op[0] == 'ANY':
+                where.append(f'{param} = ANY({mark(start)}::{op[1]}[])')
+                start += 1
+            elif isinstance(op, tuple):
+                where.append(f"{param} IN ({', '.join(mark(start + i) for i in range(op[1]))})")
+                start += op[1]
+            elif op == 'ANY':
+                where.append(f'{param} = ANY({mark(start)})')
+                start += 1
+            else:
+                where.append(f'{param}{op}{mark(start)}')
+                start += 1
+        return f' {operator} '.join(where)
+
+    def select(self, table: str, conditions: tuple, fields: tuple = None, distinct: bool = False,
+               order_fields: tuple = None, order_type: str = 'ASC', limit: bool = False, operator: str = 'AND') -> statement:
+        """
+        compile SELECT request. \n
+        :param table: table name.
+        :param conditions: tuple of (param, operator) pairs, operator is '=', '!=', ('IN', n), 'ANY' or ('ANY', type).
+        :param fields: request fields.
+        :param distinct: request distinct.
+        :param order_fields: request order fields.
+        :param order_type: request order type.
+        :param limit: request has limit.
+        :param operator: logical operator.
+        :return: compiled statement.
+        """
+        def build(mark):
+            request: str = f"SELECT {'DISTINCT ' if distinct else ''}{', '.join(fields) if fields else '*'} FROM {table}"
+            request += f' WHERE {self._where(conditions, operator, mark)}' if conditions else ''
+            request += f" ORDER BY {', '.join(order_fields)} {order_type}" if order_fields else ''
+            request += f' LIMIT {mark(self._marks(conditions))}' if limit else ''
+            return request, self._marks(conditions) + (1 if limit else 0)
+        key: tuple = ('select', table, conditions, fields, distinct, order_fields, order_type, limit, operator)
+        return self._get(key, build)
+
+    @staticmethod
+    def _seek(count: int, nulls: tuple, order_type: str = 'ASC') -> list or None:
+        """
+        keyset seek as OR of AND groups of (key index, operator, value index), NULL sorts first (smallest):
+        ASC without NULL values is plain row comparison (None), NULL value of cursor or DESC order needs
+        groups, because comparison with NULL is NULL. \n
+        :param count: count of order keys.
+        :param nulls: cursor value of key is NULL.
+        :param order_type: request order type.
+        :return: list of groups or None (row comparison).
+        """
+        if order_type != 'DESC' and not any(nulls):
+            return None
+        groups: list = []
+        for i in range(count):
+            if nulls[i] and order_type == 'DESC':
+                continue
+            group: list = [(j, 'IS NULL', None) if nulls[j] else (j, '=', j) for j in range(i)]
+            if order_type == 'DESC':
+                group.append((i, '<', i))
+            else:
+                group.append((i, 'IS NOT NULL', None) if nulls[i] else (i, '>', i))
+            groups.append(group)
+        return groups
+
+    @classmethod
+    def seek_args(cls, after: list, order_type: str = 'ASC') -> list:
+        """
+        bind parameters of keyset seek in order of page request marks. \n
+        :param after: cursor values of order keys (None - NULL).
+        :param order_type: request order type.
+        :return: list of bind parameters.
+        """
+        groups: list = cls._seek(len(after), tuple(i is None for i in after), order_type)
+        if groups is None:
+            return list(after)
+        return [after[value] for group in groups for _, _, value in group if value is not None]
+
+    def page(self, table: str, conditions: tuple, fields: tuple = None, keys: tuple = (), order_type: str = 'ASC',
+             after: tuple = None, operator: str = 'AND') -> statement:
+        """
+        compile keyset page SELECT request: WHERE (keys) > (after) ORDER BY keys LIMIT n,
+        NULL values of keys sort first (ASC) or last (DESC) on all backends. \n
+        :param table: table name.
+        :param conditions: tuple of (param, operator) pairs.
+        :param fields: request fields.
+        :param keys: order keys (last key is unique and not NULL).
+        :param order_type: request order type.
+        :param after: NULL flags of seek values (None - first page without seek).
+        :param operator: logical operator.
+        :return: compiled statement.
+        """
+        def build(mark):
+            where: list = [f'({self._where(conditions, operator, mark)})'] if conditions else []
+            count: int = self._marks(conditions)
+            if after is not None:
+                groups: list = self._seek(len(keys), after, order_type)
+                if groups is None:
+                    seek: str = ', '.join(mark(count + i) for i in range(len(keys)))
+                    where.append(f"({', '.join(keys)}) > ({seek})")
+                    count += len(keys)
+                else:
+                    seek: list = []
+                    for group in groups:
+                        terms: list = []
+                        for key, op, value in group:
+                            if value is None:
+                                terms.append(f'{keys[key]} {op}')
+                                continue
+                            last: bool = key == len(keys) - 1
+                            term: str = f'{keys[key]} {op} {mark(count)}'
+                            terms.append(f'({term} OR {keys[key]} IS NULL)' if op == '<' and not last else term)
+                            count += 1
+                        seek.append(f"({' AND '.join(terms)})")
+                    where.append(f"({' OR '.join(seek)})")
+            nulls: str = 'NULLS LAST' if order_type == 'DESC' else 'NULLS FIRST'
+            request: str = f"SELECT {', '.join(fields) if fields else '*'} FROM {table}"
+            request += f" WHERE {' AND '.join(where)}" if where else ''
+            request += f" ORDER BY {', '.join(f'{i} {order_type} {nulls}' if n < len(keys) - 1 else f'{i} {order_type}' for n, i in enumerate(keys))}"
+            return request + f' LIMIT {mark(count)}', count + 1
+        key: tuple = ('page', table, conditions, fields, keys, order_type, after, operator)
+        return self._get(key, build)
+
+    def partition(self, table: str, conditions: tuple, fields: tuple = None, key: str = '_id', operator: str = 'AND') -> statement:
+        """
+        compile SELECT request of id range: WHERE (conditions) AND key >= first AND key <= last. \n
+        :param table: table name.
+        :param conditions: tuple of (param, operator) pairs.
+        :param fields: request fields.
+        :param key: id column.
+        :param operator: logical operator.
+        :return: compiled statement.
+        """
+        def build(mark):
+            where: list = [f'({self._where(conditions, operator, mark)})'] if conditions else []
+            count: int = self._marks(conditions)
+            where.append(f'{key} >= {mark(count)} AND {key} <= {mark(count + 1)}')
+            request: str = f"SELECT {', '.join(fields) if fields else '*'} FROM {table} WHERE {' AND '.join(where)}"
+            return request, count + 2
+        return self._get(('partition', table, conditions, fields, key, operator), build)
+
+    def count(self, table: str, conditions: tuple) -> statement:
+        """
+        compile SELECT COUNT request. \n
+        :param table: table name.
+        :param conditions: tuple of (param, operator) pairs.
+        :return: compiled statement.
+        """
+        def build(mark):
+            request: str = f'SELECT count(*) AS count FROM {table}'
+            request += f" WHERE {self._where(conditions, 'AND', mark)}" if conditions else ''
+            return request, self._marks(conditions)
+        return self._get(('count', table, conditions), build)
+
+    def aggregate(self, table: str, conditions: tuple, aggregates: tuple, group_by: tuple = None, having: tuple = None,
+                  order_fields: tuple = None, order_type: str = 'ASC', limit: bool = False, operator: str = 'AND') -> statement:
+        """
+        compile SELECT aggregates GROUP BY HAVING request. \n
+        :param table: table name.
+        :param conditions: tuple of (param, operator) pairs (WHERE).
+        :param aggregates: tuple of (alias, function, column), function is a key of AGGREGATES.
+        :param group_by: group fields.
+        :param having: tuple of (alias, operator) pairs, alias is one of aggregates.
+        :param order_fields: request order fields (group fields or aliases).
+        :param order_type: request order type.
+        :param limit: request has limit.
+        :param operator: logical operator (WHERE).
+        :return: compiled statement.
+        """
+        expressions: dict = {alias: AGGREGATES[function].format(column) for alias, function, column in aggregates}
+
+        def build(mark):
+            request: str = f"SELECT {', '.join(list(group_by or ()) + [f'{e} AS {a}' for a, e in expressions.items()])} FROM {table}"
+            request += f' WHERE {self._where(conditions, operator, mark)}' if conditions else ''
+            request += f" GROUP BY {', '.join(group_by)}" if group_by else ''
+            request += f" HAVING {self._where(tuple((expressions[a], op) for a, op in having), 'AND', mark, self._marks(conditions))}" if having else ''
+            request += f" ORDER BY {', '.join(order_fields)} {order_type}" if order_fields else ''
+            count: int = self._marks(conditions) + len(having or ())
+            request += f' LIMIT {mark(count)}' if limit else ''
+            return request, count + (1 if limit else 0)
+        key: tuple = ('aggregate', table, conditions, aggregates, group_by, having, order_fields, order_type, limit, operator)
+        return self._get(key, build)
+
+    def update(self, table: str, params: tuple, conditions: tuple) -> statement:
+        """
+        compile UPDATE request. \n
+        :param table: table name.
+        :param params: request parameters (SET).
+        :param conditions: tuple of (param, operator) pairs (WHERE).
+        :return: compiled statement.
+        """
+        def build(mark):
+            request: str = f"UPDATE {table} SET {', '.join(f'{p}={mark(i)}' for i, p in enumerate(params))}"
+            request += f" WHERE {self._where(conditions, 'AND', mark, len(params))}" if conditions else ''
+            return request, len(params) + self._marks(conditions)
+        return self._get(('update', table, params, conditions), build)
+
+    def insert(self, table: str, params: tuple, returning: str = None) -> statement:
+        """
+        compile INSERT request. \n
+        :param table: table name.
+        :param params: request parameters.
+        :param returning: RETURNING column (postgresql).
+        :return: compiled statement.
+        """
+        def build(mark):
+            request: str = f"INSERT INTO {table} ({', '.join(params)}) VALUES ({', '.join(mark(i) for i in range(len(params)))})"
+            request += f' RETURNING {returning}' if returning else ''
+            return request, len(params)
+        return self._get(('insert', table, params, returning), build)
+
+    @staticmethod
+    def on_conflict(conflict: tuple, update: tuple) -> str:
+        """
+        ON CONFLICT clause of upsert. \n
+        :param conflict: conflict columns (unique or primary key).
+        :param update: columns updated on conflict (empty - DO NOTHING).
+        :return: SQL clause.
+        """
+        if not update:
+            return f"ON CONFLICT ({', '.join(conflict)}) DO NOTHING"
+        return f"ON CONFLICT ({', '.join(conflict)}) DO UPDATE SET {', '.join(f'{p}=excluded.{p}' for p in update)}"
+
+    def upsert(self, table: str, params: tuple, conflict: tuple, update: tuple) -> statement:
+        """
+        compile INSERT ... ON CONFLICT request. \n
+        :param table: table name.
+        :param params: request parameters.
+        :param conflict: conflict columns.
+        :param update: columns updated on conflict.
+        :return: compiled statement.
+        """
+        def build(mark):
+            request: str = f"INSERT INTO {table} ({', '.join(params)}) VALUES ({', '.join(mark(i) for i in range(len(params)))})"
+            return f'{request} {self.on_conflict(conflict, update)}', len(params)
+        return self._get(('upsert', table, params, conflict, update), build)
+
+    def delete(self, table: str, conditions: tuple) -> statement:
+        """
+        compile DELETE request. \n
+        :param table: table name.
+        :param conditions: tuple of (param, operator) pairs.
+        :return: compiled statement.
+        """
+        def build(mark):
+            return f"DELETE FROM {table} WHERE {self._where(conditions, 'AND', mark)}", self._marks(conditions)
+        return self._get(('delete', table, conditions), build)
@@ -1,42 +1,176 @@
-import psycopg2
-import sqlite3 as sql
-import psycopg2.extras
-from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+import os
+import time
+import json
+import base64
+import itertools
+import functools
+import threading
+from contextlib import contextmanager, nullcontext
 from .utils import deprecated
+from .compiler import compiler, AGGREGATES
+from .pool import pool
+from .schema import schema, read_snapshot, write_snapshot, column_type, column_definition, bind_value
+from .cache import result_cache, written_table
+from .instrument import instrumentation, null_measure
+from .columns import FORMATS, fetch_columns, fetch_tuples
+from .advisor import advisor
+from .profiles import profile_pragmas
+from .dialects import get_dialect, CHANGES
 
 
 class database:
-    def __init__(self, db_id: str = None, db_debug: bool = None, db_encode: str = None) -> None:
+    def __init__(self, db_id: str = None, db_debug: bool = None, db_encode: str = None,
+                 db_statement_cache: int = None, db_prepare_threshold: int = None,
+                 db_schema_lazy: bool = None, db_schema_snapshot: str = None,
+                 db_cache_size: int = None, db_cache_ttl: float = None,
+                 db_instrument: bool = None, db_slow_query: float = None, db_advisor: bool = None) -> None:
         """
         init function. \n
-        :param db_type: database type (sqlite3 / postgresql).
-        :param sql_init: SQL init file.
+        :param db_id: id column name.
+        :param db_debug: print debug requests.
+        :param db_encode: SQL files encoding.
+        :param db_statement_cache: max count of compiled statements in cache.
+        :param db_prepare_threshold: count of hits after which statement is PREPAREd on server (postgresql).
+        :param db_schema_lazy: load columns of table on first access to db_params.
+        :param db_schema_snapshot: schema snapshot file path (reused while schema version does not change).
+        :param db_cache_size: max count of cached select / select_count results (None - cache is off).
+        :param db_cache_ttl: seconds result lives in cache.
+        :param db_instrument: collect request latency and row count stats.
+        :param db_slow_query: seconds after which request is logged as slow (turns instrumentation on).
+        :param db_advisor: record filter shapes of select / select_count / update / delete for index_advice.
         """
         self.db_type = None
+        self._dialect = None
         self.db_id: str = '_id' if db_id is None else db_id
         self.db_debug: bool = False if db_debug is None else db_debug
         self.db_encode = 'utf-8' if db_encode is None else db_encode
         self.db_params: dict = {}
+        self.db_statement_cache: int = db_statement_cache
+        self.db_prepare_threshold: int = db_prepare_threshold
+        self.db_schema_lazy: bool = False if db_schema_lazy is None else db_schema_lazy
+        self.db_schema_snapshot: str = db_schema_snapshot
         self._connection = None
         self._cursor = None
+        self._compiler = None
+        self._cache = result_cache(db_cache_size, db_cache_ttl) if db_cache_size is not None else None
+        self._instrument = instrumentation(db_slow_query) if db_instrument or db_slow_query is not None else None
+        self._advisor = advisor() if db_advisor else None
+        self._pool = None
+        self._prepared: dict = {}
+        self._deallocate: dict = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._cursors: int = 0
+        self._path = None
+        self._connect_args: tuple = None
+        self._maintenance: float = None
+        self._maintained: float = 0.0
 
     def __del__(self):
+        self.close()
+
+    def close(self) -> None:
+        """
+        close connection (or connections of pool). \n
+        :return: None.
+        """
         if self._connection:
             self._connection.close()
+            self._connection, self._cursor = None, None
+        if self._pool:
+            self._pool.close()
 
-    def connect_sql3(self, path):
+    def connect_sql3(self, path, pool_size: int = None, pool_timeout: float = None, profile: str or dict = None,
+                     maintenance: float = None):
         """
         connect function, connect to sqlite3 database. \n
         :param path: file path to sqlite3 database.
+        :param pool_size: max count of pooled connections (None - one shared connection).
+        :param pool_timeout: max seconds to wait for pooled connection.
+        :param profile: performance profile (default / throughput / durable / readonly) or dict of pragmas
+                        (journal_mode, synchronous, cache_size, mmap_size, temp_store, busy_timeout, ...).
+        :param maintenance: seconds between maintenance (wal_checkpoint and optimize) run after commit (None - off).
         :return: None.
         """
-        self.db_type = 'sqlite3'
-        self._connection = sql.connect(path)
-        self._connection.row_factory = sql.Row
-        self._cursor = self._connection.cursor()
+        self._open_sql3(path, pool_size, pool_timeout, profile)
+        self._maintenance = maintenance
+        self._maintained = time.monotonic()
         self.load_schema()
 
-    def connect_psql(self, host, port, user, password, dbname):
+    def _open_sql3(self, path, pool_size: int = None, pool_timeout: float = None, profile: str or dict = None,
+                   readonly: bool = None) -> None:
+        pragmas: dict = profile_pragmas(profile)
+        readonly: bool = profile == 'readonly' if readonly is None else readonly
+        self._dialect = get_dialect('sqlite3')
+        self.db_type = self._dialect.name
+        self._path = path
+        self._connect_args = ((path,), {'pragmas': pragmas, 'readonly': readonly})
+        if pool_size is None:
+            self._connection = self._dialect.connect(path, pragmas=pragmas, readonly=readonly)
+            self._cursor = self._connection.cursor()
+        else:
+            self._pool = pool(functools.partial(self._dialect.connect, path, check_same_thread=False, pragmas=pragmas,
+                                                readonly=readonly), pool_size, pool_timeout)
+        self._init_compiler()
+
+    def reader(self, pool_size: int = None, pool_timeout: float = None, profile: str or dict = 'readonly'):
+        """
+        READER, read-only connection to the same sqlite3 database (concurrent reads while writer is active in WAL mode),
+        schema (db_params) is shared with this database. \n
+        :param pool_size: max count of pooled read-only connections (None - one connection).
+        :param pool_timeout: max seconds to wait for pooled connection.
+        :param profile: performance profile of reader (readonly or dict of pragmas).
+        :return: database object or bool False if error.
+        """
+        if self.db_type != 'sqlite3' or self._path is None:
+            print('[error] (reader) reader is available for sqlite3 database only')
+            return False
+        reader = database(db_id=self.db_id, db_debug=self.db_debug, db_encode=self.db_encode,
+                          db_statement_cache=self.db_statement_cache, db_prepare_threshold=self.db_prepare_threshold)
+        reader.db_params = self.db_params
+        try:
+            reader._open_sql3(self._path, pool_size, pool_timeout, profile, readonly=True)
+            if pool_size is None:
+                reader._connection.execute('SELECT 1 FROM sqlite_schema LIMIT 1')
+        except reader._errors as e:
+            print('[error] (reader) ' + str(e))
+            return False
+        return reader
+
+    def maintenance(self, checkpoint: str = 'PASSIVE', optimize: bool = True) -> dict or bool:
+        """
+        MAINTENANCE of sqlite3 database: WAL checkpoint and optimize. \n
+        :param checkpoint: checkpoint mode (PASSIVE / FULL / RESTART / TRUNCATE or None - no checkpoint).
+        :param optimize: run PRAGMA optimize (statistics for query planner).
+        :return: dict with busy, log and checkpointed pages or bool False if error.
+        """
+        if self.db_type != 'sqlite3':
+            print('[error] (maintenance) maintenance is available for sqlite3 database only')
+            return False
+        try:
+            with self._session(plain=True) as cursor:
+                result: dict = self._maintain(cursor.connection, checkpoint, optimize)
+            self._maintained = time.monotonic()
+            return result
+        except self._errors as e:
+            print('[error] (maintenance) ' + str(e))
+        return False
+
+    def _maintain(self, connection, checkpoint: str = 'PASSIVE', optimize: bool = True) -> dict:
+        result: dict = {}
+        if checkpoint is not None:
+            request: str = f"PRAGMA wal_checkpoint({'PASSIVE' if checkpoint not in ('FULL', 'RESTART', 'TRUNCATE') else checkpoint})"
+            print(f'[debug] (maintenance) request: {request}') if self.db_debug else None
+            with self._measure('maintenance', None, request):
+                busy, log, checkpointed = connection.execute(request).fetchone()
+            result.update({'busy': busy, 'log': log, 'checkpointed': checkpointed})
+        if optimize:
+            print('[debug] (maintenance) request: PRAGMA optimize') if self.db_debug else None
+            with self._measure('maintenance', None, 'PRAGMA optimize'):
+                connection.execute('PRAGMA optimize')
+        return result
+
+    def connect_psql(self, host, port, user, password, dbname, pool_size: int = None, pool_timeout: float = None):
         """
         connect function, connect to postgresql database. \n
         :param host: postgresql database host (ip address).
@@ -44,80 +178,559 @@ class database:
         :param user: postgresql database user.
         :param password: postgresql database password.
         :param dbname: postgresql database name (database).
+        :param pool_size: max count of pooled connections (None - one shared connection).
+        :param pool_timeout: max seconds to wait for pooled connection.
         :return: None.
         """
-        self.db_type = 'postgresql'
-        self._connection = psycopg2.connect(host=host, port=port, user=user, password=password, database=dbname)
-        self._connection.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
-        self._cursor = self._connection.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
+        self._dialect = get_dialect('postgresql')
+        self.db_type = self._dialect.name
+        self._connect_args = ((host, port, user, password, dbname), {})
+        if pool_size is None:
+            self._connection = self._dialect.connect(host, port, user, password, dbname)
+            self._cursor = self._dialect.cursor(self._connection)
+        else:
+            self._pool = pool(functools.partial(self._dialect.connect, host, port, user, password, dbname), pool_size, pool_timeout)
+        self._init_compiler()
         self.load_schema()
 
-    def load_schema(self) -> None:
+    def pool_stats(self) -> dict:
+        """
+        connection pool stats. \n
+        :return: dict with pool size, in use, wait time and utilisation or empty dict if not pooled.
+        """
+        return self._pool.stats() if self._pool is not None else {}
+
+    def _new_cursor(self, connection, plain: bool = False):
+        return self._dialect.cursor(connection, plain)
+
+    @property
+    def _errors(self) -> tuple:
+        """
+        driver exceptions of connected backend. \n
+        """
+        return self._dialect.errors if self._dialect is not None else ()
+
+    @contextmanager
+    def _session(self, plain: bool = False):
+        """
+        cursor for one call: cursor of current transaction, shared cursor
+        or new cursor on connection taken from pool. \n
+        :param plain: new cursor returning tuples.
+        :return: cursor.
+        """
+        pinned = getattr(self._local, 'cursor', None)
+        if pinned is not None and not plain:
+            try:
+                yield pinned
+            except self._errors as e:
+                self._fail(e)
+                raise
+            return
+        if pinned is None and self._pool is None and not plain:
+            yield self._cursor
+            return
+        if pinned is not None:
+            connection = pinned.connection
+        else:
+            connection = self._connection if self._pool is None else self._pool.acquire()
+        cursor = self._new_cursor(connection, plain)
+        try:
+            yield cursor
+        except self._errors as e:
+            self._fail(e)
+            raise
+        finally:
+            cursor.close()
+            if pinned is None and self._pool is not None:
+                self._pool.release(connection)
+
+    @staticmethod
+    def _fetch(cursor, result_format: str = None) -> list or dict or None:
         """
-        Load database schema. \n
+        fetch result in format: rows (sqlite3.Row / RealDictRow), tuples (tuple rows)
+        or columns (dict of column name and column values). \n
+        :param cursor: executed cursor.
+        :param result_format: result format (None - rows).
+        :return: result.
+        """
+        if result_format == 'columns':
+            return fetch_columns(cursor)
+        if result_format == 'tuples':
+            return fetch_tuples(cursor)
+        return cursor.fetchall()
+
+    @staticmethod
+    def _count(result) -> int:
+        if isinstance(result, dict):
+            return len(next(iter(result.values()))) if result else 0
+        return len(result) if result else 0
+
+    @property
+    def _depth(self) -> int:
+        return getattr(self._local, 'depth', 0)
+
+    @_depth.setter
+    def _depth(self, value: int) -> None:
+        self._local.depth = value
+
+    def _init_compiler(self) -> None:
+        self._compiler = compiler(self._dialect.placeholder, self._dialect.prepare, self.db_statement_cache, self.db_prepare_threshold)
+        self._prepared = {}
+        self._deallocate = {}
+
+    def _execute(self, cursor, stmt, args: list = None) -> None:
+        """
+        execute compiled statement, hot statements are PREPAREd on server (postgresql). \n
+        :param cursor: cursor.
+        :param stmt: compiled statement.
+        :param args: bind parameters.
         :return: None.
         """
-        tables = self.get_tables()
-        if not tables:
+        if not self._compiler.prepare:
+            cursor.execute(stmt.sql, args or ())
             return
-        for table in tables:
-            columns = self.get_columns(table)
-            if not columns:
+        key: int = id(cursor.connection)
+        with self._lock:
+            while self._compiler.evicted:
+                name: str = self._compiler.evicted.pop()
+                for connection, names in self._prepared.items():
+                    if name in names:
+                        names.discard(name)
+                        self._deallocate.setdefault(connection, set()).add(name)
+            prepared: set = self._prepared.setdefault(key, set())
+            deallocate: set = self._deallocate.pop(key, set())
+        for name in deallocate:
+            cursor.execute(f'DEALLOCATE {name}')
+        if stmt.hits >= self._compiler.prepare_threshold:
+            if stmt.name not in prepared:
+                cursor.execute(stmt.prepare)
+                prepared.add(stmt.name)
+            cursor.execute(stmt.execute, args or None)
+        else:
+            cursor.execute(stmt.sql, args or None)
+
+    @staticmethod
+    def _conditions(params: list) -> tuple:
+        """
+        request parameters to conditions, '!param' means 'param!=value'. \n
+        :param params: request parameters.
+        :return: tuple of (param, operator) pairs.
+        """
+        if params is None:
+            return ()
+        return tuple((str(i)[1:], '!=') if str(i)[0] == '!' else (str(i), '=') for i in params)
+
+    def _types(self, table: str) -> dict:
+        """
+        column types of table from db_params (empty if table columns are not typed). \n
+        :param table: table name.
+        :return: dict of column and column type.
+        """
+        try:
+            columns = self.db_params[f'{table}'] if table is not None else None
+        except KeyError:
+            return {}
+        if not isinstance(columns, dict):
+            return {}
+        return {self.db_id: 'INTEGER', **columns}
+
+    def _kinds(self, table: str, params: list) -> list or None:
+        """
+        column types of request parameters. \n
+        :param table: table name.
+        :param params: request parameters.
+        :return: list of column types or None if table columns are not typed.
+        """
+        types: dict = self._types(table) if params else {}
+        return [types.get(str(i).lstrip('!')) for i in params] if types else None
+
+    def _bind(self, values: list, table: str = None, params: list = None, kinds: list = None) -> list:
+        """
+        request values to bind parameters, typed by column types of table (text if untyped). \n
+        :param values: request values.
+        :param table: table name.
+        :param params: request parameters (columns of values).
+        :param kinds: column types of values (instead of table and params).
+        :return: list of bind parameters.
+        """
+        if values is None:
+            return []
+        kinds: list = self._kinds(table, params) if kinds is None else kinds
+        if not kinds:
+            return [str(i) for i in values]
+        return [bind_value(self._dialect, kinds[n] if n < len(kinds) else None, i) for n, i in enumerate(values)]
+
+    @staticmethod
+    def _lists(values: list) -> list:
+        """
+        indexes of request values which are lists of values (param IN values). \n
+        """
+        return [n for n, i in enumerate(values or []) if isinstance(i, (list, tuple, set, frozenset, range))]
+
+    def _in_chunks(self, table: str, param: str, values, chunk_size: int = None, reserved: int = 0):
+        """
+        IN condition of param chunk by chunk, sqlite3 - param IN (...) under max count of bind parameters,
+        postgresql - param = ANY(array::type[]). \n
+        :param table: table name.
+        :param param: request parameter.
+        :param values: iterable of values (duplicates are dropped).
+        :param chunk_size: values per chunk (None - max count of bind parameters or all values).
+        :param reserved: bind parameters of other conditions of request.
+        :return: generator of (condition, bind parameters).
+        """
+        param: str = str(param)
+        values: list = list(dict.fromkeys(values))
+        limit: int = self._dialect.max_variables()
+        size: int = chunk_size or (limit - reserved if limit is not None else len(values))
+        size: int = max(min(size, limit - reserved) if limit is not None else size, 1)
+        kinds: list = self._kinds(table, [param])
+        kind: str = kinds[0] if kinds else None
+        # array elements are not casted by server as single text values are
+        kind: str = 'INTEGER' if kind is None and limit is None and param == self.db_id else kind
+        # text bound values (TIMESTAMP / JSON / ...) are text[], array is casted to column type array
+        cast: str = (self._dialect.types or {}).get(kind) if kind is not None else None
+        for start in range(0, len(values), size):
+            chunk: list = self._bind(values[start:start + size], kinds=[kind] * size)
+            if limit is None:
+                yield (param, ('ANY', cast) if cast else 'ANY'), [chunk]
                 continue
-            self.db_params.update({table: columns})
+            # chunk is padded to power of two (IN ignores duplicates), so few statements are compiled
+            count: int = min(1 << (len(chunk) - 1).bit_length(), size)
+            yield (param, ('IN', count)), chunk + [chunk[-1]] * (count - len(chunk))
+
+    @staticmethod
+    def _key(args: list) -> tuple:
+        """
+        bind parameters as result cache key (array of = ANY is list). \n
+        """
+        return tuple(tuple(i) if isinstance(i, list) else i for i in args)
+
+    def _parts(self, table: str, params: list, values: list, chunk_size: int = None):
+        """
+        equality conditions of request, list value means param IN values and splits request into parts. \n
+        :param table: table name.
+        :param params: request parameters.
+        :param values: request values (one of them can be list).
+        :param chunk_size: values of list per part.
+        :return: generator of (conditions, bind parameters).
+        """
+        lists: list = self._lists(values)
+        if not lists:
+            yield tuple((str(i), '=') for i in params), self._bind(values, table, params)
+            return
+        others: list = [n for n in range(len(params)) if n != lists[0]]
+        conditions: tuple = tuple((str(params[n]), '=') for n in others)
+        args: list = self._bind([values[n] for n in others], table, [params[n] for n in others])
+        for condition, chunk in self._in_chunks(table, params[lists[0]], values[lists[0]], chunk_size, len(args)):
+            yield conditions + (condition,), args + chunk
+
+    def statement_stats(self) -> dict:
+        """
+        compiled statement cache stats. \n
+        :return: dict with hits, misses, size, max_size and prepared count.
+        """
+        if self._compiler is None:
+            return {}
+        return {**self._compiler.stats(), 'prepared': sum(len(i) for i in self._prepared.values())}
+
+    def _measure(self, method: str, table: str, request: str, args=None):
+        if self._instrument is None:
+            return null_measure
+        return self._instrument.measure(method, table, request, args)
+
+    def add_hook(self, before=None, after=None) -> None:
+        """
+        add instrumentation hooks (turns instrumentation on). \n
+        :param before: function (method, table, request, args) called before request.
+        :param after: function (method, table, request, args, elapsed, rows, error) called after request.
+        :return: None.
+        """
+        self._instrument = instrumentation() if self._instrument is None else self._instrument
+        self._instrument.add_hook(before, after)
+
+    def instrument_stats(self) -> dict:
+        """
+        request stats: per-method and per-table latency histograms, row counts and slow request count. \n
+        :return: dict with methods, tables and slow or empty dict if instrumentation is off.
+        """
+        return self._instrument.stats() if self._instrument is not None else {}
+
+    def instrument_reset(self) -> None:
+        """
+        reset request stats. \n
+        :return: None.
+        """
+        self._instrument.reset() if self._instrument is not None else None
 
-    def raw(self, request: str) -> list or bool or None:
+    def cache_stats(self) -> dict:
+        """
+        result cache stats. \n
+        :return: dict with hits, misses, hit_ratio, size, memory (bytes) or empty dict if cache is off.
+        """
+        return self._cache.stats() if self._cache is not None else {}
+
+    def cache_clear(self, table: str = None) -> None:
+        """
+        drop cached results. \n
+        :param table: table name (None - all tables).
+        :return: None.
+        """
+        self._cache.invalidate(table) if self._cache is not None else None
+
+    def _invalidate(self, table: str = None) -> None:
+        """
+        drop cached results of written table, inside transaction table is dropped again on commit / rollback. \n
+        :param table: table name (None - all tables).
+        :return: None.
+        """
+        if self._cache is None:
+            return
+        self._cache.invalidate(table)
+        if self._depth:
+            self._local.written.add(table)
+
+    def _commit(self, cursor) -> None:
+        if self._depth == 0:
+            cursor.connection.commit()
+            if self._maintenance is not None and time.monotonic() - self._maintained >= self._maintenance:
+                self._maintained = time.monotonic()
+                try:
+                    self._maintain(cursor.connection)
+                except self._errors as e:
+                    print('[error] (maintenance) ' + str(e))
+
+    def _rollback(self, cursor, error: BaseException = None) -> None:
+        if self._depth == 0:
+            cursor.connection.rollback()
+        else:
+            self._fail(error)
+
+    def _fail(self, error: BaseException) -> None:
+        """
+        failed request inside transaction (error is printed and method returns False),
+        transaction is rolled back and first error is raised on its exit. \n
+        """
+        if self._depth and getattr(self._local, 'failed', None) is None:
+            self._local.failed = error
+
+    @contextmanager
+    def transaction(self):
+        """
+        TRANSACTION context, requests inside are committed once on exit and rolled back on exception
+        or failed request (method returned False on driver error, the error is raised on exit),
+        nested transaction joins the outer one. \n
+        :return: database.
+        """
+        if self._depth:
+            yield self
+            if self._local.failed is not None:
+                raise self._local.failed
+            return
+        connection = self._pool.acquire() if self._pool is not None else self._connection
+        cursor = self._new_cursor(connection) if self._pool is not None else self._cursor
+        self._dialect.begin(connection, cursor)
+        print('[debug] (transaction) BEGIN') if self.db_debug else None
+        self._local.cursor = cursor
+        self._local.written = set()
+        self._local.failed = None
+        self._depth = 1
+        try:
+            yield self
+            if self._local.failed is not None:
+                raise self._local.failed
+        except BaseException:
+            self._depth = 0
+            print('[debug] (transaction) ROLLBACK') if self.db_debug else None
+            connection.rollback()
+            raise
+        else:
+            self._depth = 0
+            print('[debug] (transaction) COMMIT') if self.db_debug else None
+            connection.commit()
+        finally:
+            self._local.cursor = None
+            self._local.failed = None
+            for table in self._local.written if self._cache is not None else ():
+                self._cache.invalidate(table)
+            self._dialect.end(connection)
+            if self._pool is not None:
+                cursor.close()
+                self._pool.release(connection)
+
+    @contextmanager
+    def savepoint(self):
+        """
+        SAVEPOINT context, nestable, rolls back to savepoint on exception or failed request
+        (the error is raised on exit), outside of transaction works as transaction. \n
+        :return: database.
+        """
+        if not self._depth:
+            with self.transaction():
+                yield self
+            return
+        cursor = self._local.cursor
+        name: str = f'dbcode_sp_{self._depth}'
+        print(f'[debug] (savepoint) SAVEPOINT {name}') if self.db_debug else None
+        cursor.execute(f'SAVEPOINT {name}')
+        self._depth += 1
+        failed = self._local.failed
+        try:
+            yield self
+            if self._local.failed is not failed:
+                raise self._local.failed
+        except BaseException:
+            self._local.failed = failed
+            self._depth -= 1
+            print(f'[debug] (savepoint) ROLLBACK TO SAVEPOINT {name}') if self.db_debug else None
+            cursor.execute(f'ROLLBACK TO SAVEPOINT {name}')
+            cursor.execute(f'RELEASE SAVEPOINT {name}')
+            raise
+        self._depth -= 1
+        cursor.execute(f'RELEASE SAVEPOINT {name}')
+
+    def load_schema(self) -> None:
+        """
+        Load database schema (one request), from snapshot file if schema version did not change
+        or lazy (columns of table are loaded on first access). \n
+        :return: None.
+        """
+        version: str = None
+        if self.db_schema_snapshot is not None:
+            version = self.get_schema_version()
+            params = read_snapshot(self.db_schema_snapshot, self.db_type, version)
+            if params is not None:
+                self.db_params.update(params)
+                return
+        if self.db_schema_lazy and self.db_schema_snapshot is None:
+            self.db_params = schema(self.get_column_types, self.db_params)
+            return
+        response = self.raw(self._dialect.schema_request())
+        params: dict = {}
+        for column in response or []:
+            if column['tbl'] != CHANGES:
+                params.setdefault(column['tbl'], {})[column['name']] = column_type(column['type'])
+        self.db_params.update(params)
+        if self.db_schema_snapshot is not None and response is not False:
+            write_snapshot(self.db_schema_snapshot, self.db_type, version, params)
+
+    def get_schema_version(self) -> str or None:
+        """
+        GET SCHEMA VERSION of base (changes on every schema change). \n
+        :return: schema version or None.
+        """
+        response = self.raw(self._dialect.schema_version_request())
+        if not response:
+            return None
+        return str(response[0]['schema_version'])
+
+    def raw(self, request: str, result_format: str = None) -> list or dict or bool or None:
         """
         RAW request. \n
         :param request: SQL request.
+        :param result_format: result format (rows / tuples / columns).
         :return:
         """
+        if result_format is not None and result_format not in FORMATS:
+            print(f'[error] (raw) result_format {result_format} does not match existing')
+            return False
         try:
             request: str = f"{request}"
             print(f'[debug] (raw) request: {request}') if self.db_debug else None
-            self._cursor.execute(request)
-            result = self._cursor.fetchall()
+            table = written_table(request)
+            with self._session(result_format in ('tuples', 'columns')) as cursor, \
+                    self._measure('raw', table if isinstance(table, str) else None, request) as m:
+                cursor.execute(request)
+                result = self._fetch(cursor, result_format) if cursor.description is not None else cursor.fetchall()
+                m.rows = self._count(result)
+            self._invalidate(None if table is True else table) if table is not None else None
             return None if not result else result
-        except psycopg2.Error or sql.Error as e:
+        except self._errors as e:
             print('[error] (raw) ' + str(e))
         return False
 
-    def sql_file(self, file_path):
+    def sql_file(self, file_path, batch_size: int = 1000, progress=None, resume_from: int = 0,
+                 compress: bool = None) -> int or bool or None:
         """
-        SQL files commands. \n
-        :param file_path:
-        :return:
+        SQL files commands, file is read chunk by chunk and executed statement by statement
+        in transactions of batch_size statements (BEGIN / COMMIT of the file are skipped). \n
+        :param file_path: file path or file object.
+        :param batch_size: statements per transaction.
+        :param progress: function (statements, size) called after every commit, statements is count of committed
+                         statements, size is count of characters of file they take.
+        :param resume_from: count of statements committed before (statements are skipped), see progress.
+        :param compress: gzip (None - if file path ends with .gz).
+        :return: count of committed statements or bool False if error.
         """
         if file_path is None:
             print('[error] (sql_init) sql_filepath is None')
             return
-        if self.db_type == 'sqlite3':
-            with open(file_path, mode='r', encoding=self.db_encode) as file:
-                self._cursor.executescript(file.read())
-            self._connection.commit()
-        elif self.db_type == 'postgresql':
-            with open(file_path, mode='r', encoding=self.db_encode) as file:
-                self._cursor.execute(file.read())
-            self._connection.commit()
-        else:
+        if self._dialect is None:
             print('[error] (sql_init) database_type does not match existing')
+            return
+        from .transfer import open_stream
+        from .script import script, strip_comments, is_transaction, is_autocommit
+        count: int = 0
+        index: int = 0
+        owned: bool = self._depth == 0
+        try:
+            with open_stream(file_path, 'r', compress, self.db_encode) as source:
+                statements = script(source, self._dialect.complete)
+                iterator = iter(statements)
+                # statements committed before are skipped and counted, first batch is full batch_size
+                count = index = sum(1 for _ in itertools.islice(iterator, resume_from))
+                pending: tuple = None
+                finished: bool = False
+                while not finished:
+                    if pending is not None:
+                        index = count
+                        with self._session() as cursor:
+                            self._script_execute(cursor, *pending)
+                            self._commit(cursor)
+                        count, pending = count + 1, None
+                        progress(count, statements.position) if progress is not None else None
+                    index = count
+                    with self.transaction(), self._session() as cursor:
+                        for statement, data in iterator:
+                            bare: str = strip_comments(statement)
+                            if is_transaction(bare):
+                                index += 1
+                                continue
+                            if is_autocommit(bare) and owned:
+                                pending = (statement, data)
+                                break
+                            self._script_execute(cursor, statement, data)
+                            index += 1
+                            if index - count >= batch_size:
+                                break
+                        else:
+                            finished = pending is None
+                    count, committed = index, index > count
+                    progress(count, statements.position) if progress is not None and committed else None
+            return count
+        except self._errors as e:
+            print(f'[error] (sql_file) statement {index + 1} (resume_from={count}): ' + str(e))
+        except OSError as e:
+            print('[error] (sql_file) ' + str(e))
+        finally:
+            self._invalidate()
+        return False
+
+    def _script_execute(self, cursor, statement: str, data=None) -> None:
+        print(f'[debug] (sql_file) request: {statement}') if self.db_debug else None
+        with self._measure('sql_file', None, statement):
+            self._dialect.copy_in(cursor, statement, data) if data is not None else cursor.execute(statement)
 
     def get_tables(self) -> list or None:
         """
         GET TABLES in base. \n
         :return: list of tables or None.
         """
-        request: str = ''
         tables: list = []
-        if self.db_type == 'sqlite3':
-            request: str = "SELECT name FROM sqlite_schema WHERE type ='table' AND name NOT LIKE 'sqlite_%';"
-        elif self.db_type == 'postgresql':
-            request: str = "SELECT table_name AS name FROM information_schema.tables WHERE table_schema='public' AND table_type='BASE TABLE';"
-        response = self.raw(request)
-        if response is None or False:
+        response = self.raw(self._dialect.tables_request())
+        if response is None or response is False:
             return None
         for table in response:
-            tables.append(table['name'])
+            tables.append(table['name']) if table['name'] != CHANGES else None
         return tables
 
     def get_columns(self, table: str) -> list or None:
@@ -126,22 +739,29 @@ class database:
         :param table: table name.
         :return: list of tables or None.
         """
-        request: str = ''
         columns: list = []
-        if self.db_type == 'sqlite3':
-            request: str = f"SELECT name FROM pragma_table_info('{table}') WHERE name IS NOT '_id';"
-        elif self.db_type == 'postgresql':
-            request: str = f"SELECT column_name AS name FROM information_schema.columns WHERE table_schema = 'public' AND table_name = '{table}';"
-        response = self.raw(request)
-        if response is None or False:
+        response = self.raw(self._dialect.columns_request(table))
+        if response is None or response is False:
             return None
         for column in response:
             columns.append(column['name'])
         return columns
 
+    def get_column_types(self, table: str) -> dict or None:
+        """
+        GET COLUMN TYPES of table. \n
+        :param table: table name.
+        :return: dict of column and column type (TEXT / INTEGER / REAL / NUMERIC / BLOB / BOOLEAN / TIMESTAMP / JSON) or None.
+        """
+        response = self.raw(self._dialect.columns_request(table, types=True))
+        if response is None or response is False:
+            return None
+        return {column['name']: column_type(column['type']) for column in response}
+
     def select(self, table: str, params: str or int or list = None, values: str or int or list = None,
                fields: str or int or list = None, limit: int = None, cut: bool = False, distinct: bool = False,
-               order_fields: str or int or list = None, order_type: str = None, operator: str = 'AND') -> list or bool or None:
+               order_fields: str or int or list = None, order_type: str = None, operator: str = 'AND',
+               result_format: str = None) -> list or dict or bool or None:
         """
         SELECT (**READ**) request. \n
         :param table: table name.
@@ -154,53 +774,300 @@ class database:
         :param order_fields: request order fields.
         :param order_type: request order type.
         :param operator: logical operator.
+        :param result_format: result format: rows (default), tuples (tuple rows) or columns (dict of column arrays).
         :return: data from database or bool type if success or error or None if no data.
         """
+        fields: list = [fields] if isinstance(fields, int) or isinstance(fields, str) else fields
+
+        if result_format is not None and result_format not in FORMATS:
+            print(f'[error] (select) result_format {result_format} does not match existing')
+            return False
+
+        try:
+            stmt, args = self._select_statement(table, params, values, fields, limit, distinct, order_fields, order_type, operator)
+            key: tuple = ('select', stmt.sql, self._key(args), result_format)
+            cached, result = self._cache.get(key) if self._cache is not None else (False, None)
+            generation: tuple = self._cache.generation(table) if self._cache is not None else None
+            if not cached:
+                print(f'[debug] (select) request: {stmt.sql} {args}') if self.db_debug else None
+                with self._session(result_format in ('tuples', 'columns')) as cursor, \
+                        self._measure('select', table, stmt.sql, args) as m:
+                    self._execute(cursor, stmt, args)
+                    result = self._fetch(cursor, result_format)
+                    m.rows = self._count(result)
+                self._cache.set(key, table, result, generation) if self._cache is not None else None
+            if not result:
+                return None
+            if len(result) == 1 and cut is True and result_format != 'columns':
+                result = result[0]
+                if len(fields) == 1:
+                    result = result[0]
+            return result
+        except self._errors as e:
+            print('[error] (select) ' + str(e))
+        return False
+
+    def select_page(self, table: str, after=None, page_size: int = 100, params: str or int or list = None,
+                    values: str or int or list = None, fields: str or int or list = None,
+                    order_fields: str or int or list = None, order_type: str = None, operator: str = 'AND',
+                    result_format: str = None) -> tuple or bool:
+        """
+        SELECT PAGE (**READ**) keyset pagination request, page N costs the same as page 1. \n
+        :param table: table name.
+        :param after: cursor token of previous page, last id or list of last order values and id (None - first page).
+        :param page_size: rows per page.
+        :param params: request parameters.
+        :param values: request values.
+        :param fields: request fields (order fields and id are added if missing).
+        :param order_fields: request order fields (id is added as tiebreaker).
+        :param order_type: request order type.
+        :param operator: logical operator.
+        :param result_format: result format: rows (default) or tuples.
+        :return: (rows, cursor token of next page or None if last page) or bool False if error.
+        """
         params: list = [params] if isinstance(params, int) or isinstance(params, str) else params
         values: list = [values] if isinstance(values, int) or isinstance(values, str) else values
-
         fields: list = [fields] if isinstance(fields, int) or isinstance(fields, str) else fields
-        field: str = ', '.join(str(fields[i]) for i in range(0, len(fields))) if fields is not None else '*'
+        order_fields: list = [order_fields] if isinstance(order_fields, int) or isinstance(order_fields, str) else order_fields
 
-        distinct: str = 'DISTINCT' if distinct else ''
+        operator: str = operator if operator == 'AND' else 'OR'
+        order_type: str = order_type if order_type == 'DESC' else 'ASC'
 
-        param_not: list = ['' for _ in range(len(params))] if params or values is not None else []
+        keys: list = [str(i) for i in order_fields or [] if str(i) != self.db_id] + [self.db_id]
+        fields: list = [str(i) for i in fields] + [i for i in keys if i not in fields] if fields else None
 
-        if params is not None:
-            for i in range(len(params)):
-                if params[i][0] == '!':
-                    param_not[i] = '!'
-                    params[i] = params[i][1:]
+        if result_format not in (None, 'rows', 'tuples'):
+            print(f'[error] (select_page) result_format {result_format} does not match existing')
+            return False
+        if isinstance(after, str):
+            try:
+                after: list = json.loads(base64.urlsafe_b64decode(after.encode()).decode())
+            except ValueError:
+                print('[error] (select_page) cursor token is not valid')
+                return False
+        elif after is not None:
+            after: list = list(after) if isinstance(after, (list, tuple)) else [after]
+        if after is not None and len(after) != len(keys):
+            print(f'[error] (select_page) cursor has {len(after)} values, order keys are {keys}')
+            return False
 
-        operator: str = operator if operator == 'AND' else 'OR'
+        conditions: tuple = self._conditions(params)
+        args: list = self._bind(values, table, params) if conditions else []
+        if after is not None:
+            after: list = [None if i is None else v for i, v in zip(after, self._bind(after, table, keys))]
+            args += self._compiler.seek_args(after, order_type)
+        args += [int(page_size)]
 
-        p_v: str = 'WHERE ' + f' {operator} '.join(f"{params[i]}{param_not[i]}='{values[i]}'" for i in range(0, len(params))) if params is not None else ''
+        try:
+            stmt = self._compiler.page(table, conditions, tuple(fields) if fields else None, tuple(keys), order_type,
+                                       tuple(i is None for i in after) if after is not None else None, operator)
+            print(f'[debug] (select_page) request: {stmt.sql} {args}') if self.db_debug else None
+            with self._session(result_format == 'tuples') as cursor, self._measure('select_page', table, stmt.sql, args) as m:
+                self._execute(cursor, stmt, args)
+                result = self._fetch(cursor, result_format)
+                m.rows = self._count(result)
+            if not result:
+                return None, None
+            if len(result) < page_size:
+                return result, None
+            last = result[-1]
+            # tuple rows have no attribute for count / index / keywords, values are read by position
+            last: list = [last[last._fields.index(i)] for i in keys] if result_format == 'tuples' else [last[i] for i in keys]
+            return result, base64.urlsafe_b64encode(json.dumps(last, default=str).encode()).decode()
+        except self._errors as e:
+            print('[error] (select_page) ' + str(e))
+        return False
 
-        limit: str or int = '' if limit is None else f'LIMIT {limit}'
+    def _select_statement(self, table: str, params, values, fields, limit, distinct, order_fields, order_type, operator) -> tuple:
+        """
+        compile SELECT request shared by select and iter_select. \n
+        :return: compiled statement and bind parameters.
+        """
+        params: list = [params] if isinstance(params, int) or isinstance(params, str) else params
+        values: list = [values] if isinstance(values, int) or isinstance(values, str) else values
+
+        fields: list = [fields] if isinstance(fields, int) or isinstance(fields, str) else fields
+
+        operator: str = operator if operator == 'AND' else 'OR'
 
         order_fields: list = [order_fields] if isinstance(order_fields, int) or isinstance(order_fields, str) else order_fields
-        order_field: str = ', '.join(str(order_fields[i]) for i in range(0, len(order_fields))) if order_fields is not None else '*'
         order_type: str = order_type if order_type == 'DESC' else 'ASC'
-        order: str = f'ORDER BY {order_field} {order_type}' if order_fields is not None else ''
 
+        conditions: tuple = self._conditions(params)
+        args: list = self._bind(values, table, params) if conditions else []
+        args += [int(limit)] if limit is not None else []
+
+        stmt = self._compiler.select(table, conditions, tuple(str(i) for i in fields) if fields else None, bool(distinct),
+                                     tuple(str(i) for i in order_fields) if order_fields else None, order_type,
+                                     limit is not None, operator)
+        if self._advisor is not None:
+            self._advisor.record('select', table, tuple(i for i, op in conditions if op == '='),
+                                 tuple(str(i) for i in order_fields or []), stmt.sql, args)
+        return stmt, args
+
+    def _iter(self, method: str, request: str, args: list = None, chunk_size: int = 1000, table: str = None,
+              strict: bool = False):
+        """
+        execute request on own cursor and yield rows chunk by chunk (fetchmany),
+        postgresql uses named server-side cursor. \n
+        :param method: caller name (for debug and error messages).
+        :param request: SQL request.
+        :param args: bind parameters.
+        :param chunk_size: rows per fetch.
+        :param table: table name (for instrumentation).
+        :param strict: raise driver errors to caller (not print them and stop).
+        :return: generator of rows.
+        """
+        pinned = getattr(self._local, 'cursor', None)
+        if pinned is not None:
+            connection = pinned.connection
+        else:
+            connection = self._pool.acquire() if self._pool is not None else self._connection
+        with self._lock:
+            self._cursors += 1
+            name: str = f'dbcode_cursor_{self._cursors}'
+        cursor = self._dialect.stream_cursor(connection, name, self._depth == 0, chunk_size)
         try:
-            request: str = f"SELECT {distinct} {field} FROM {table} {p_v} {order} {limit}"
-            print(f'[debug] (select) request: {request}') if self.db_debug else None
-            self._cursor.execute(request)
-            result = self._cursor.fetchall()
-            if not result:
+            print(f'[debug] ({method}) request: {request} {args or []}') if self.db_debug else None
+            with self._measure(method, table, request, args):
+                cursor.execute(request, args) if args else cursor.execute(request)
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                yield from rows
+        except self._errors as e:
+            self._fail(e)
+            if strict:
+                raise
+            print(f'[error] ({method}) ' + str(e))
+        finally:
+            cursor.close()
+            if pinned is None and self._pool is not None:
+                self._pool.release(connection)
+
+    def iter_select(self, table: str, params: str or int or list = None, values: str or int or list = None,
+                    fields: str or int or list = None, limit: int = None, distinct: bool = False,
+                    order_fields: str or int or list = None, order_type: str = None, operator: str = 'AND',
+                    chunk_size: int = 1000):
+        """
+        SELECT (**READ**) request, streaming. \n
+        :param table: table name.
+        :param params: request parameters.
+        :param values: request values.
+        :param fields: request fields.
+        :param limit: request limit.
+        :param distinct: request distinct.
+        :param order_fields: request order fields.
+        :param order_type: request order type.
+        :param operator: logical operator.
+        :param chunk_size: rows per fetch.
+        :return: generator of rows.
+        """
+        stmt, args = self._select_statement(table, params, values, fields, limit, distinct, order_fields, order_type, operator)
+        yield from self._iter('iter_select', stmt.sql, args, chunk_size, table)
+
+    def select_in(self, table: str, param: str or int, values, fields: str or int or list = None,
+                  chunk_size: int = None, fetch_size: int = 1000):
+        """
+        SELECT IN (**READ**) request, records of many values of one param, streaming.
+        sqlite3 - param IN (...) chunked under max count of bind parameters, postgresql - param = ANY(array). \n
+        :param table: table name.
+        :param param: request parameter.
+        :param values: iterable of request values.
+        :param fields: request fields.
+        :param chunk_size: values per request (None - max count of bind parameters or all values).
+        :param fetch_size: rows per fetch.
+        :return: generator of rows (order of values is not kept).
+        """
+        fields: list = [fields] if isinstance(fields, int) or isinstance(fields, str) else fields
+
+        for condition, args in self._in_chunks(table, param, values, chunk_size):
+            stmt = self._compiler.select(table, (condition,), tuple(str(i) for i in fields) if fields else None)
+            if self._advisor is not None:
+                self._advisor.record('select_in', table, (str(param),), (), stmt.sql, args)
+            yield from self._iter('select_in', stmt.sql, args, fetch_size, table)
+
+    def parallel_select(self, table: str, fn, workers: int = None, params: str or int or list = None,
+                        values: str or int or list = None, fields: str or int or list = None, reduce=None,
+                        operator: str = 'AND', partitions: int = None, chunk_size: int = 1000) -> list or bool or None:
+        """
+        PARALLEL SELECT (**READ**) request, table is split into id ranges scanned by process pool,
+        every worker opens own connection (read-only for sqlite3) and applies fn to rows of its range.
+        fn and reduce must be picklable (module level functions), partitions of postgresql are read
+        on separate connections (not one snapshot). \n
+        :param table: table name.
+        :param fn: function (iterable of rows) returning partial result of partition.
+        :param workers: count of worker processes (default count of CPUs).
+        :param params: request parameters.
+        :param values: request values.
+        :param fields: request fields.
+        :param reduce: function (result, partial result) merging partial results (None - list of partial results).
+        :param operator: logical operator.
+        :param partitions: count of id ranges (default 4 per worker).
+        :param chunk_size: rows per fetch.
+        :return: merged result or list of partial results in id order or bool False if error or None if no data.
+        """
+        params: list = [params] if isinstance(params, int) or isinstance(params, str) else params
+        values: list = [values] if isinstance(values, int) or isinstance(values, str) else values
+        fields: list = [fields] if isinstance(fields, int) or isinstance(fields, str) else fields
+
+        operator: str = operator if operator == 'AND' else 'OR'
+        workers: int = workers or os.cpu_count() or 1
+        from concurrent.futures import ProcessPoolExecutor
+        from .parallel import id_ranges, scan_partition
+
+        try:
+            connect: tuple = self._dialect.worker_connect(self._connect_args)
+        except ValueError as e:
+            print('[error] (parallel_select) ' + str(e))
+            return False
+
+        conditions: tuple = self._conditions(params)
+        args: list = self._bind(values, table, params) if conditions else []
+
+        try:
+            bounds = self._compiler.aggregate(table, conditions, (('low', 'min', self.db_id), ('high', 'max', self.db_id)),
+                                              operator=operator)
+            print(f'[debug] (parallel_select) request: {bounds.sql} {args}') if self.db_debug else None
+            with self._session() as cursor:
+                self._execute(cursor, bounds, args)
+                bound = cursor.fetchone()
+            if bound is None or bound['low'] is None:
                 return None
-            if len(result) == 1 and cut is True:
-                result = result[0]
-                if len(fields) == 1:
-                    result = result[0]
-            return result
-        except psycopg2.Error or sql.Error as e:
-            print('[error] (select) ' + str(e))
+            stmt = self._compiler.partition(table, conditions, tuple(str(i) for i in fields) if fields else None,
+                                            self.db_id, operator)
+            if self._advisor is not None:
+                self._advisor.record('parallel_select', table, tuple(i for i, op in conditions if op == '='), (), stmt.sql,
+                                     args + [bound['low'], bound['high']])
+            ranges: list = id_ranges(int(bound['low']), int(bound['high']), partitions or workers * 4)
+            print(f'[debug] (parallel_select) request: {stmt.sql} {args} x {len(ranges)}') if self.db_debug else None
+            with self._measure('parallel_select', table, stmt.sql, args), \
+                    ProcessPoolExecutor(min(workers, len(ranges))) as executor:
+                results: list = [future.result() for future in [
+                    executor.submit(scan_partition, self.db_type, connect, stmt.sql, args + [first, last], fn, chunk_size)
+                    for first, last in ranges]]
+            return functools.reduce(reduce, results) if reduce is not None else results
+        except self._errors as e:
+            print('[error] (parallel_select) ' + str(e))
         return False
 
+    def iter_raw(self, request: str, chunk_size: int = 1000):
+        """
+        RAW request, streaming. \n
+        :param request: SQL request.
+        :param chunk_size: rows per fetch.
+        :return: generator of rows.
+        """
+        table = written_table(f'{request}')
+        try:
+            yield from self._iter('iter_raw', f'{request}', None, chunk_size, table if isinstance(table, str) else None)
+        finally:
+            self._invalidate(None if table is True else table) if table is not None else None
+
     def select_join(self, table: str, tables: str or list, fields: list, join_type: str = 'INNER', limit: int = None,
-                    order_fields: str or int or list = None, order_type: str = None, operator: str = 'AND'):
+                    order_fields: str or int or list = None, order_type: str = None, operator: str = 'AND',
+                    result_format: str = None):
         """
         SELECT (**READ**) with join param, request. \n
         :param table: table name.
@@ -211,12 +1078,17 @@ class database:
         :param order_fields: request order fields.
         :param order_type: request order type.
         :param operator: logical operator.
+        :param result_format: result format: rows (default), tuples (tuple rows) or columns (dict of column arrays).
         :return:
         """
         tables: list = [tables] if isinstance(tables, str) else tables
 
+        if result_format is not None and result_format not in FORMATS:
+            print(f'[error] (select_join) result_format {result_format} does not match existing')
+            return False
+
         join_type: str = join_type if join_type != 'INNER' else 'INNER'
-        if join_type != 'INNER' and join_type != 'LEFT' and self.db_type == 'sqlite3':
+        if self._dialect.join_types is not None and join_type not in self._dialect.join_types:
             print(f'[error] (select_join) {join_type} are not currently supported')
             return False
 
@@ -238,12 +1110,15 @@ class database:
         try:
             request: str = f"SELECT * FROM {table} {inner_joins} {order} {limit};"
             print(f'[debug] (select_join) request: {request}') if self.db_debug else None
-            self._cursor.execute(request)
-            result = self._cursor.fetchall()
+            with self._session(result_format in ('tuples', 'columns')) as cursor, \
+                    self._measure('select_join', table, request) as m:
+                cursor.execute(request)
+                result = self._fetch(cursor, result_format)
+                m.rows = self._count(result)
             if not result:
                 return None
             return result
-        except psycopg2.Error or sql.Error as e:
+        except self._errors as e:
             print('[error] (select_join) ' + str(e))
         return False
 
@@ -294,8 +1169,10 @@ class database:
         try:
             request: str = f"SELECT {distinct} {field} FROM {table} WHERE {p_v} {order} {limit}"
             print(f'[debug] (select_where) request: {request}') if self.db_debug else None
-            self._cursor.execute(request)
-            result = self._cursor.fetchall()
+            with self._session() as cursor, self._measure('select_where', table, request) as m:
+                cursor.execute(request)
+                result = cursor.fetchall()
+                m.rows = len(result)
             if not result:
                 return None
             if len(result) == 1 and cut is True:
@@ -303,7 +1180,7 @@ class database:
                 if fields and len(fields) == 1:
                     result = result[0]
             return result
-        except psycopg2.Error or sql.Error as e:
+        except self._errors as e:
             print('[error] (select_where) ' + str(e))
         return False
 
@@ -322,14 +1199,16 @@ class database:
         try:
             request: str = f"SELECT DISTINCT {param} FROM {table} {limit}"
             print(f'[debug] (select_distinct) request: {request}') if self.db_debug else None
-            self._cursor.execute(request)
-            result = self._cursor.fetchall()
+            with self._session() as cursor, self._measure('select_distinct', table, request) as m:
+                cursor.execute(request)
+                result = cursor.fetchall()
+                m.rows = len(result)
             if not result:
                 return None
             if len(result) == 1 and cut is True:
                 result = result[0]
             return result
-        except psycopg2.Error or sql.Error as e:
+        except self._errors as e:
             print('[error] (select_distinct) ' + str(e))
         return False
 
@@ -338,26 +1217,124 @@ class database:
         SELECT COUNT (**COUNT**) request. \n
         :param table: table name.
         :param params: request parameters.
-        :param values: request values.
+        :param values: request values, list value means param IN values.
         :return: count int type from database or bool type if success or error or None if no data.
         """
         params: list = [params] if isinstance(params, int) or isinstance(params, str) else params
         values: list = [values] if isinstance(values, int) or isinstance(values, str) else values
 
-        p_v: str = 'WHERE ' + ' AND '.join(f"{params[i]}='{values[i]}'" for i in range(0, len(params))) if params and values else ''
+        if len(self._lists(values)) > 1:
+            print('[error] (select_count) only one param can have list of values')
+            return False
 
         try:
-            request: str = f"SELECT count(*) as count FROM {table} {p_v}"
-            print(f'[debug] (select_count) request: {request}') if self.db_debug else None
-            self._cursor.execute(request)
-            result = int(self._cursor.fetchone()['count'])
+            result: int = 0
+            for conditions, args in self._parts(table, params, values) if params and values else [((), [])]:
+                stmt = self._compiler.count(table, conditions)
+                if self._advisor is not None:
+                    self._advisor.record('select_count', table, tuple(i for i, _ in conditions), (), stmt.sql, args)
+                key: tuple = ('select_count', stmt.sql, self._key(args))
+                cached, count = self._cache.get(key) if self._cache is not None else (False, None)
+                generation: tuple = self._cache.generation(table) if self._cache is not None else None
+                if not cached:
+                    print(f'[debug] (select_count) request: {stmt.sql} {args}') if self.db_debug else None
+                    with self._session() as cursor, self._measure('select_count', table, stmt.sql, args) as m:
+                        self._execute(cursor, stmt, args)
+                        count = int(cursor.fetchone()['count'])
+                        m.rows = 1
+                    self._cache.set(key, table, count, generation) if self._cache is not None else None
+                result += count
             if not result:
                 return None
             return result
-        except psycopg2.Error or sql.Error as e:
+        except self._errors as e:
             print('[error] (select_count) ' + str(e))
         return False
 
+    def select_aggregate(self, table: str, aggregates: dict, group_by: str or int or list = None, having: dict or list = None,
+                         params: str or int or list = None, values: str or int or list = None,
+                         order_fields: str or int or list = None, order_type: str = None, limit: int = None,
+                         operator: str = 'AND', result_format: str = None) -> list or dict or bool or None:
+        """
+        SELECT AGGREGATE (**READ**) request, aggregates are computed by database. \n
+        :param table: table name.
+        :param aggregates: dict of alias and (function, column), functions are count / count_distinct / sum / avg / min / max,
+                           column '*' (or only function) for count.
+        :param group_by: group fields.
+        :param having: dict of alias and value or (operator, value), or list of (alias, operator, value),
+                       operators are = / != / < / <= / > / >=.
+        :param params: request parameters.
+        :param values: request values.
+        :param order_fields: request order fields (group fields or aliases).
+        :param order_type: request order type.
+        :param limit: request limit.
+        :param operator: logical operator.
+        :param result_format: result format: rows (default), tuples (tuple rows) or columns (dict of column arrays).
+        :return: data from database or bool type if success or error or None if no data.
+        """
+        params: list = [params] if isinstance(params, int) or isinstance(params, str) else params
+        values: list = [values] if isinstance(values, int) or isinstance(values, str) else values
+        group_by: list = [group_by] if isinstance(group_by, int) or isinstance(group_by, str) else group_by
+        order_fields: list = [order_fields] if isinstance(order_fields, int) or isinstance(order_fields, str) else order_fields
+
+        operator: str = operator if operator == 'AND' else 'OR'
+        order_type: str = order_type if order_type == 'DESC' else 'ASC'
+
+        if result_format is not None and result_format not in FORMATS:
+            print(f'[error] (select_aggregate) result_format {result_format} does not match existing')
+            return False
+        functions: list = []
+        for alias, aggregate in (aggregates or {}).items():
+            aggregate: tuple = (aggregate,) if isinstance(aggregate, str) else tuple(aggregate)
+            function, column = str(aggregate[0]).lower(), str(aggregate[1]) if len(aggregate) > 1 else '*'
+            if function not in AGGREGATES:
+                print(f'[error] (select_aggregate) function {function} does not match existing {list(AGGREGATES)}')
+                return False
+            functions.append((str(alias), function, column))
+        if not functions:
+            print('[error] (select_aggregate) aggregates are empty')
+            return False
+        having: list = [(a, *(v if isinstance(v, tuple) else ('=', v))) for a, v in having.items()] \
+            if isinstance(having, dict) else list(having or [])
+        columns: dict = {alias: (function, column) for alias, function, column in functions}
+        for alias, op, _ in having:
+            if alias not in columns or op not in ('=', '!=', '<', '<=', '>', '>='):
+                print(f'[error] (select_aggregate) having {alias} {op} does not match aggregates')
+                return False
+
+        conditions: tuple = self._conditions(params)
+        args: list = self._bind(values, table, params) if conditions else []
+        types: dict = self._types(table)
+        for alias, _, value in having:
+            function, column = columns[alias]
+            kind: str = {'count': 'INTEGER', 'count_distinct': 'INTEGER', 'avg': 'REAL'}.get(function) or types.get(column)
+            kind: str = 'REAL' if function == 'sum' and kind not in ('INTEGER', 'REAL') else kind
+            args.append(value if isinstance(value, (int, float)) else bind_value(self._dialect, kind, value))
+        args += [int(limit)] if limit is not None else []
+
+        try:
+            stmt = self._compiler.aggregate(table, conditions, tuple(functions), tuple(str(i) for i in group_by) if group_by else None,
+                                            tuple((a, op) for a, op, _ in having) or None,
+                                            tuple(str(i) for i in order_fields) if order_fields else None, order_type,
+                                            limit is not None, operator)
+            key: tuple = ('select_aggregate', stmt.sql, self._key(args), result_format)
+            cached, result = self._cache.get(key) if self._cache is not None else (False, None)
+            generation: tuple = self._cache.generation(table) if self._cache is not None else None
+            if not cached:
+                print(f'[debug] (select_aggregate) request: {stmt.sql} {args}') if self.db_debug else None
+                with self._session(result_format in ('tuples', 'columns')) as cursor, \
+                        self._measure('select_aggregate', table, stmt.sql, args) as m:
+                    self._execute(cursor, stmt, args)
+                    result = self._fetch(cursor, result_format)
+                    m.rows = self._count(result)
+                self._cache.set(key, table, result, generation) if self._cache is not None else None
+            if not result:
+                return None
+            return result
+        except self._errors as e:
+            print('[error] (select_aggregate) ' + str(e))
+        return False
+
     @deprecated
     def select_count_where(self, table: str, params: str or int or list, values: str or int or list) -> int or bool or None:
         """
@@ -375,12 +1352,14 @@ class database:
         try:
             request: str = f"SELECT count(*) as count FROM {table} WHERE {p_v}"
             print(f'[debug] (select_count_where) request: {request}') if self.db_debug else None
-            self._cursor.execute(request)
-            result = int(self._cursor.fetchone()['count'])
+            with self._session() as cursor, self._measure('select_count_where', table, request) as m:
+                cursor.execute(request)
+                result = int(cursor.fetchone()['count'])
+                m.rows = 1
             if not result:
                 return None
             return result
-        except psycopg2.Error or sql.Error as e:
+        except self._errors as e:
             print('[error] (select_count_where) ' + str(e))
         return False
 
@@ -400,16 +1379,21 @@ class database:
         params_b: list = [params_b] if isinstance(params_b, int) or isinstance(params_b, str) else params_b
         values_b: list = [values_b] if isinstance(values_b, int) or isinstance(values_b, str) else values_b
 
-        p_v_set: str = ', '.join(f"{params_a[i]}='{values_a[i]}'" for i in range(0, len(params_a)))
-        p_v_where: str = ' AND '.join(f"{params_b[i]}='{values_b[i]}'" for i in range(0, len(params_b)))
+        args: list = self._bind(values_a, table, params_a) + self._bind(values_b, table, params_b)
 
         try:
-            request: str = f"UPDATE {table} SET {p_v_set} WHERE {p_v_where}"
-            print(f'[debug] (update) request: {request}') if self.db_debug else None
-            self._cursor.execute(request)
-            self._connection.commit()
+            stmt = self._compiler.update(table, tuple(str(i) for i in params_a), tuple((str(i), '=') for i in params_b))
+            if self._advisor is not None:
+                self._advisor.record('update', table, tuple(str(i) for i in params_b), (), stmt.sql, args)
+            print(f'[debug] (update) request: {stmt.sql} {args}') if self.db_debug else None
+            with self._session() as cursor:
+                with self._measure('update', table, stmt.sql, args) as m:
+                    self._execute(cursor, stmt, args)
+                    m.rows = cursor.rowcount
+                self._commit(cursor)
+            self._invalidate(table)
             return True
-        except psycopg2.Error or sql.Error as e:
+        except self._errors as e:
             print('[error] (update) ' + str(e))
         return False
 
@@ -425,88 +1409,536 @@ class database:
         values: list = [values] if isinstance(values, int) or isinstance(values, str) else values
         params: list = [params] if isinstance(params, int) or isinstance(params, str) else params
 
-        param: str = ', '.join(str(i) for i in params) if params is not None else ', '.join(self.db_params[f'{table}'])
-        value: str = "', '".join([str(i) for i in values])
-
-        if param == '' and value == '':
-            param: str = ', '.join(self.db_params[f'{table}'])
-            value: str = "', '".join(['' for _ in range(0, len(self.db_params[f'{table}']), 1)])
+        params: list = list(params) if params is not None else list(self.db_params[f'{table}'])
+        values: list = list(values) if values else ['' for _ in range(0, len(params), 1)]
 
         if _id is not None:
-            param, value = f"{self.db_id}, {param}", f"{_id}', '{value}"
+            params, values = [self.db_id] + params, [_id] + values
+
+        args: list = self._bind(values, table, params)
 
         last_id: int = 0
         try:
-            if self.db_type == 'sqlite3':
-                request: str = f"INSERT INTO {table} ({param}) VALUES ('{value}')"
-                print(f'[debug] (insert) request: {request}') if self.db_debug else None
-                self._cursor.execute(request)
-                last_id: int = self._cursor.lastrowid
-            elif self.db_type == 'postgresql':
-                request: str = f"INSERT INTO {table} ({param}) VALUES ('{value}') RETURNING {self.db_id}"
-                print(f'[debug] (insert) request: {request}') if self.db_debug else None
-                self._cursor.execute(request)
-                result = self._cursor.fetchone()[self.db_id]
-                last_id: int = int(result)
-            self._connection.commit()
+            with self._session() as cursor:
+                stmt = self._compiler.insert(table, tuple(str(i) for i in params), self._dialect.returning(self.db_id))
+                print(f'[debug] (insert) request: {stmt.sql} {args}') if self.db_debug else None
+                with self._measure('insert', table, stmt.sql, args) as m:
+                    self._execute(cursor, stmt, args)
+                    last_id: int = self._dialect.last_id(cursor, self.db_id)
+                    m.rows = 1
+                self._commit(cursor)
+            self._invalidate(table)
             return last_id
-        except psycopg2.Error or sql.Error as e:
+        except self._errors as e:
             print('[error] (insert) ' + str(e))
         return False
 
+    def insert_many(self, table: str, rows, params: str or int or list = None, batch_size: int = 1000,
+                    returning: bool = False) -> list or int or bool:
+        """
+        INSERT MANY (**BULK CREATE**) request. \n
+        :param table: table name.
+        :param rows: iterable (list or generator) of rows, every row is request values.
+        :param params: request parameters.
+        :param batch_size: rows per batch (one commit per batch).
+        :param returning: return list of records id.
+        :return: list of records id if returning, count of records if not, or bool False if error.
+        """
+        params: list = [params] if isinstance(params, int) or isinstance(params, str) else params
+        params: list = list(params) if params is not None else list(self.db_params[f'{table}'])
+        kinds: list = self._kinds(table, params) or []
+        request, run = self._dialect.bulk_insert(self._compiler, table, tuple(str(i) for i in params),
+                                                 self.db_id if returning else None, kinds, batch_size)
+
+        rows = iter(rows)
+        ids: list = []
+        count: int = 0
+        with self._session() as cursor:
+            try:
+                while True:
+                    batch: list = [self._bind([row] if isinstance(row, int) or isinstance(row, str) else row, kinds=kinds)
+                                   for row in itertools.islice(rows, batch_size)]
+                    if not batch:
+                        break
+                    print(f'[debug] (insert_many) request: {request} x {len(batch)}') if self.db_debug else None
+                    with self._measure('insert_many', table, request) as m:
+                        result = run(cursor, batch)
+                        m.rows = len(batch)
+                    ids.extend(result) if returning else None
+                    self._commit(cursor)
+                    self._invalidate(table)
+                    count += len(batch)
+                return ids if returning else count
+            except self._errors as e:
+                self._rollback(cursor, e)
+                print('[error] (insert_many) ' + str(e))
+        return False
+
+    def update_many(self, table: str, rows, params: str or int or list = None, key: str or int or list = None,
+                    batch_size: int = 1000) -> int or bool:
+        """
+        UPDATE MANY (**BULK UPDATE**) request, row-specific updates in one transaction. \n
+        :param table: table name.
+        :param rows: iterable (list or generator) of rows, every row is request values (key values included).
+        :param params: request parameters (default table columns).
+        :param key: key parameters (WHERE) found in params (default id).
+        :param batch_size: rows per batch.
+        :return: count of updated records or bool False if error.
+        """
+        params: list = [params] if isinstance(params, int) or isinstance(params, str) else params
+        key: list = [key] if isinstance(key, int) or isinstance(key, str) else key
+        params: list = [str(i) for i in params] if params is not None else list(self.db_params[f'{table}'])
+        key: list = [str(i) for i in key] if key is not None else [self.db_id]
+        if not all(i in params for i in key):
+            print(f'[error] (update_many) key {key} is not in params {params}')
+            return False
+
+        columns: list = [i for i in params if i not in key]
+        order: list = [params.index(i) for i in columns + key]
+        kinds: list = self._kinds(table, columns + key) or []
+        request, run = self._dialect.bulk_update(self._compiler, table, tuple(columns), tuple(key), kinds, batch_size)
+
+        rows = iter(rows)
+        count: int = 0
+        try:
+            with self.transaction(), self._session() as cursor:
+                while True:
+                    batch: list = [self._bind([row[i] for i in order], kinds=kinds) for row in (
+                        [row] if isinstance(row, int) or isinstance(row, str) else row
+                        for row in itertools.islice(rows, batch_size))]
+                    if not batch:
+                        break
+                    print(f'[debug] (update_many) request: {request} x {len(batch)}') if self.db_debug else None
+                    with self._measure('update_many', table, request) as m:
+                        m.rows = run(cursor, batch)
+                    count += m.rows
+                    self._invalidate(table)
+            return count
+        except self._errors as e:
+            print('[error] (update_many) ' + str(e))
+        return False
+
+    def upsert(self, table: str, rows, params: str or int or list = None, conflict_columns: str or int or list = None,
+               update_columns: str or int or list = None, batch_size: int = 1000) -> int or bool:
+        """
+        UPSERT (**CREATE or UPDATE**) request, INSERT ... ON CONFLICT DO UPDATE in batches. \n
+        :param table: table name.
+        :param rows: iterable (list or generator) of rows, every row is request values.
+        :param params: request parameters (default table columns).
+        :param conflict_columns: conflict parameters, primary key or unique index columns (default id).
+        :param update_columns: parameters updated on conflict (default params except conflict_columns, [] - DO NOTHING).
+        :param batch_size: rows per batch (one commit per batch).
+        :return: count of processed records or bool False if error.
+        """
+        params: list = [params] if isinstance(params, int) or isinstance(params, str) else params
+        conflict_columns: list = [conflict_columns] if isinstance(conflict_columns, int) or isinstance(conflict_columns, str) else conflict_columns
+        update_columns: list = [update_columns] if isinstance(update_columns, int) or isinstance(update_columns, str) else update_columns
+        params: list = [str(i) for i in params] if params is not None else list(self.db_params[f'{table}'])
+        conflict: tuple = tuple(str(i) for i in conflict_columns) if conflict_columns is not None else (self.db_id,)
+        update: tuple = tuple(str(i) for i in update_columns) if update_columns is not None else \
+            tuple(i for i in params if i not in conflict)
+        kinds: list = self._kinds(table, params) or []
+        request, run = self._dialect.upsert(self._compiler, table, tuple(params), conflict, update, batch_size)
+
+        rows = iter(rows)
+        count: int = 0
+        with self._session() as cursor:
+            try:
+                while True:
+                    batch: list = [self._bind([row] if isinstance(row, int) or isinstance(row, str) else row, kinds=kinds)
+                                   for row in itertools.islice(rows, batch_size)]
+                    if not batch:
+                        break
+                    print(f'[debug] (upsert) request: {request} x {len(batch)}') if self.db_debug else None
+                    with self._measure('upsert', table, request) as m:
+                        m.rows = run(cursor, batch)
+                    self._commit(cursor)
+                    self._invalidate(table)
+                    count += m.rows
+                return count
+            except self._errors as e:
+                self._rollback(cursor, e)
+                print('[error] (upsert) ' + str(e))
+        return False
+
     def delete(self, table: str, params: str or int or list, values: str or int or list) -> bool:
         """
         DELETE (**DELETE**) request. \n
         :param table: table name.
         :param params: request parameters.
-        :param values: request values.
+        :param values: request values, list value means param IN values (parts are deleted in one transaction).
         :return: bool type if success True, if not False.
         """
         values: list = [values] if isinstance(values, int) or isinstance(values, str) else values
         params: list = [params] if isinstance(params, int) or isinstance(params, str) else params
 
-        p_v: str = ' AND '.join(f"{params[i]}='{values[i]}'" for i in range(0, len(params)))
+        lists: list = self._lists(values)
+        if len(lists) > 1:
+            print('[error] (delete) only one param can have list of values')
+            return False
 
         try:
-            request: str = f"DELETE FROM {table} WHERE {p_v}"
-            print(f'[debug] (delete) request: {request}') if self.db_debug else None
-            self._cursor.execute(request)
-            self._connection.commit()
+            with self.transaction() if lists else nullcontext(), self._session() as cursor:
+                for conditions, args in self._parts(table, params, values):
+                    stmt = self._compiler.delete(table, conditions)
+                    if self._advisor is not None:
+                        self._advisor.record('delete', table, tuple(i for i, _ in conditions), (), stmt.sql, args)
+                    print(f'[debug] (delete) request: {stmt.sql} {args}') if self.db_debug else None
+                    with self._measure('delete', table, stmt.sql, args) as m:
+                        self._execute(cursor, stmt, args)
+                        m.rows = cursor.rowcount
+                self._commit(cursor)
+            self._invalidate(table)
             return True
-        except psycopg2.Error or sql.Error as e:
+        except self._errors as e:
             print('[error] (delete) ' + str(e))
         return False
 
-    def create_table(self, table: str, params: dict) -> bool:
+    def export_table(self, table: str, file, file_format: str = 'csv', params: str or int or list = None,
+                     values: str or int or list = None, fields: str or int or list = None, operator: str = 'AND',
+                     compress: bool = None, chunk_size: int = 10000, progress=None) -> int or bool:
+        """
+        EXPORT TABLE (**READ**) to CSV (with header) or JSON Lines file in constant memory,
+        CSV of backend with COPY (postgresql) uses COPY TO STDOUT. \n
+        :param table: table name.
+        :param file: file path or file object.
+        :param file_format: file format (csv / jsonl).
+        :param params: request parameters.
+        :param values: request values.
+        :param fields: request fields.
+        :param operator: logical operator.
+        :param compress: gzip (None - if file path ends with .gz).
+        :param chunk_size: rows per fetch.
+        :param progress: function (rows, size) called every chunk, size is count of characters written
+                         (rows is None while COPY is running).
+        :return: count of exported records or bool False if error.
+        """
+        from .transfer import FILE_FORMATS, open_stream, json_default, csv_line
+        if file_format not in FILE_FORMATS:
+            print(f'[error] (export_table) file_format {file_format} does not match existing')
+            return False
+        stmt, args = self._select_statement(table, params, values, fields, None, False, None, None, operator)
+        count: int = 0
+        try:
+            with open_stream(file, 'w', compress, self.db_encode) as out:
+                if self._dialect.copy and file_format == 'csv':
+                    with self._session(plain=True) as cursor:
+                        print(f'[debug] (export_table) request: COPY ({stmt.sql}) TO STDOUT {args}') if self.db_debug else None
+                        out.progress = progress
+                        with self._measure('export_table', table, stmt.sql, args) as m:
+                            count = m.rows = self._dialect.copy_out(cursor, stmt.sql, args, out)
+                else:
+                    names: list = None
+                    for row in self._iter('export_table', stmt.sql, args, chunk_size, table, strict=True):
+                        if names is None:
+                            names = list(row.keys())
+                            out.write(csv_line(names)) if file_format == 'csv' else None
+                        if file_format == 'csv':
+                            out.write(csv_line([row[i] for i in names]))
+                        else:
+                            out.write(json.dumps({i: row[i] for i in names}, default=json_default) + '\n')
+                        count += 1
+                        progress(count, out.size) if progress is not None and count % chunk_size == 0 else None
+                progress(count, out.size) if progress is not None else None
+            return count
+        except self._errors as e:
+            print('[error] (export_table) ' + str(e))
+        except OSError as e:
+            print('[error] (export_table) ' + str(e))
+        return False
+
+    def import_table(self, table: str, file, file_format: str = 'csv', params: str or int or list = None,
+                     header: bool = True, compress: bool = None, batch_size: int = 10000, progress=None) -> int or bool:
+        """
+        IMPORT TABLE (**BULK CREATE**) from CSV or JSON Lines file in constant memory, in batches of insert_many
+        (executemany on sqlite3, COPY FROM STDIN on postgresql). \n
+        :param table: table name.
+        :param file: file path or file object.
+        :param file_format: file format (csv / jsonl).
+        :param params: request parameters (default CSV header, keys of the first JSON line or table columns).
+        :param header: CSV file has header.
+        :param compress: gzip (None - if file path ends with .gz).
+        :param batch_size: rows per batch (one commit per batch).
+        :param progress: function (rows, size) called every batch, size is count of characters read.
+        :return: count of imported records or bool False if error.
+        """
+        from .transfer import FILE_FORMATS, open_stream, read_csv, read_jsonl
+        if file_format not in FILE_FORMATS:
+            print(f'[error] (import_table) file_format {file_format} does not match existing')
+            return False
+        params: list = [params] if isinstance(params, int) or isinstance(params, str) else params
+        params: list = [str(i) for i in params] if params is not None else None
+        try:
+            with open_stream(file, 'r', compress, self.db_encode) as source:
+                if file_format == 'csv':
+                    rows = read_csv(source)
+                    names: list = next(rows, None) if header else None
+                    if header and names is None:
+                        return 0
+                    if names is not None and params is not None:
+                        order: list = [names.index(i) for i in params]
+                        rows = ([row[i] for i in order] for row in rows)
+                    params: list = names if params is None else params
+                else:
+                    params, rows = read_jsonl(source, params)
+                params: list = params if params is not None else list(self.db_params[f'{table}'])
+
+                def counted(rows):
+                    for n, row in enumerate(rows, 1):
+                        yield row
+                        progress(n, source.size) if n % batch_size == 0 else None
+                result = self.insert_many(table, counted(rows) if progress is not None else rows, params, batch_size)
+                progress(result, source.size) if progress is not None and result is not False else None
+            return result
+        except (OSError, ValueError) as e:
+            print('[error] (import_table) ' + str(e))
+        return False
+
+    def create_table(self, table: str, params: dict, indexes: list = None, track: bool = False) -> bool:
         """
         CREATE TABLE in base. \n
         :param table: table.
-        :param params: table columns.
+        :param params: table columns, list of columns (TEXT) or dict of column and column type:
+                       'TYPE [NOT NULL] [DEFAULT value]' or dict (type, null, default), types are
+                       TEXT / INTEGER / REAL / NUMERIC / BLOB / BOOLEAN / TIMESTAMP / JSON.
+        :param indexes: table indexes, every index is column, list of columns
+                        or dict (columns, unique, where, name), see create_index.
+        :param track: track changes of table (see track_changes).
         :return: bool type if success True, if not False.
         """
+        if self._dialect is None:
+            print('[error] (create_table) database_type does not match existing')
+            return False
         try:
-            params: str = ', '.join(f'{i} TEXT' for i in params[table])
+            columns = params[table]
+            columns: dict = columns if isinstance(columns, dict) else {i: None for i in columns}
+            columns: dict = {str(i): column_definition(self._dialect, str(i), spec) for i, spec in columns.items()}
+            params: str = ', '.join(i[1] for i in columns.values())
             print(params)
-            if self.db_type == 'sqlite3':
-                params = f'{self.db_id} INTEGER NOT NULL UNIQUE, {params}, PRIMARY KEY ({self.db_id} AUTOINCREMENT)'
-            elif self.db_type == 'postgresql':
-                params = f'{self.db_id} INT PRIMARY KEY NOT NULL, {params}'
-            else:
-                print('[error] (create_table) database_type does not match existing')
-            request: str = f"CREATE TABLE IF NOT EXISTS {table} ({params});"
-            print(f'[debug] (create_table) request: {request}') if self.db_debug else None
-            self._cursor.execute(request)
-            if self.db_type == 'postgresql':
-                request: str = f"CREATE SEQUENCE IF NOT EXISTS {table}_seq INCREMENT 1 START 1 NO CYCLE OWNED BY {table}.{self.db_id};"
-                print(f'[debug] (create_table) request: {request}') if self.db_debug else None
-                self._cursor.execute(request)
-                request: str = f"ALTER TABLE {table} ALTER COLUMN {self.db_id} SET DEFAULT nextval('{table}_seq');"
-                print(f'[debug] (create_table) request: {request}') if self.db_debug else None
-                self._cursor.execute(request)
-            self._connection.commit()
+            with self._session() as cursor:
+                for request in self._dialect.create_table_requests(table, self.db_id, params):
+                    print(f'[debug] (create_table) request: {request}') if self.db_debug else None
+                    with self._measure('create_table', table, request):
+                        cursor.execute(request)
+                for index in indexes or []:
+                    index: dict = index if isinstance(index, dict) else {'columns': index}
+                    request: str = self._index_request(table, **index)
+                    print(f'[debug] (create_table) request: {request}') if self.db_debug else None
+                    with self._measure('create_table', table, request):
+                        cursor.execute(request)
+                for request in self._dialect.track_requests(table, self.db_id) if track else []:
+                    print(f'[debug] (create_table) request: {request}') if self.db_debug else None
+                    with self._measure('create_table', table, request):
+                        cursor.execute(request)
+                self._commit(cursor)
+            self.db_params[table] = {i: kind for i, (kind, _) in columns.items()}
             return True
-        except psycopg2.Error or sql.Error as e:
+        except self._errors as e:
             print('[error] (create_table) ' + str(e))
+        except ValueError as e:
+            print('[error] (create_table) ' + str(e))
+        return False
+
+    def track_changes(self, table: str) -> bool:
+        """
+        TRACK CHANGES of table, triggers write id and operation (I / U / D) of every inserted, updated
+        and deleted record to change log table with monotonic version (see changes_since, sync_to). \n
+        :param table: table name.
+        :return: bool type if success True, if not False.
+        """
+        try:
+            with self._session() as cursor:
+                for request in self._dialect.track_requests(table, self.db_id):
+                    print(f'[debug] (track_changes) request: {request}') if self.db_debug else None
+                    with self._measure('track_changes', table, request):
+                        cursor.execute(request)
+                self._commit(cursor)
+            return True
+        except self._errors as e:
+            print('[error] (track_changes) ' + str(e))
+        return False
+
+    def changes_version(self, table: str = None) -> int or bool or None:
+        """
+        CHANGES VERSION, last version of change log. \n
+        :param table: table name (None - all tables).
+        :return: version int type or bool False if error or None if no changes.
+        """
+        conditions: tuple = (('tbl', '='),) if table is not None else ()
+        args: list = [str(table)] if table is not None else []
+        try:
+            stmt = self._compiler.aggregate(CHANGES, conditions, (('version', 'max', 'version'),))
+            print(f'[debug] (changes_version) request: {stmt.sql} {args}') if self.db_debug else None
+            with self._session() as cursor, self._measure('changes_version', CHANGES, stmt.sql, args):
+                self._execute(cursor, stmt, args)
+                version = cursor.fetchone()['version']
+            return int(version) if version is not None else None
+        except self._errors as e:
+            print('[error] (changes_version) ' + str(e))
+        return False
+
+    def changes_since(self, table: str, version: int = 0, fields: str or int or list = None, chunk_size: int = 1000):
+        """
+        CHANGES SINCE (**READ**) request, records of tracked table changed after version, streaming.
+        Every record is returned once with its last change, deleted records are returned with id only.
+        postgresql versions come from sequence, with concurrent writers a change committed later
+        can have lower version than already returned one. \n
+        :param table: table name.
+        :param version: last version already seen (0 - all changes).
+        :param fields: request fields (id is always returned).
+        :param chunk_size: rows per fetch.
+        :return: generator of (version, operation I / U / D, record dict).
+        """
+        return self._changes(table, version, fields, chunk_size)
+
+    def _changes(self, table: str, version: int = 0, fields: str or int or list = None, chunk_size: int = 1000,
+                 strict: bool = False):
+        fields: list = [fields] if isinstance(fields, int) or isinstance(fields, str) else fields
+        mark: str = self._dialect.placeholder
+        columns: str = ', '.join(f't.{i}' for i in fields) if fields else 't.*'
+        request: str = f"SELECT c.version AS dbcode_version, c.op AS dbcode_op, c.row_id AS dbcode_row_id, " \
+                       f"t.{self.db_id} AS dbcode_found, {columns} FROM {CHANGES} AS c " \
+                       f"JOIN (SELECT row_id, max(version) AS version FROM {CHANGES} WHERE tbl = {mark} AND version > {mark} " \
+                       f"GROUP BY row_id) AS l ON c.version = l.version " \
+                       f"LEFT JOIN {table} AS t ON t.{self.db_id} = c.row_id AND c.op != 'D' ORDER BY c.version"
+        for row in self._iter('changes_since', request, [str(table), int(version)], chunk_size, table, strict):
+            if row['dbcode_found'] is None:
+                yield int(row['dbcode_version']), 'D', {self.db_id: row['dbcode_row_id']}
+                continue
+            record: dict = {i: row[i] for i in row.keys() if not i.startswith('dbcode_')}
+            record[self.db_id] = row['dbcode_row_id']
+            yield int(row['dbcode_version']), row['dbcode_op'], record
+
+    def sync_to(self, other, tables: str or list, since: int or dict = None, batch_size: int = 1000) -> dict or bool:
+        """
+        SYNC TO other database, changes of tracked tables since version are applied in batches
+        (upsert of inserted and updated records, delete of deleted ones, one transaction per batch).
+        Applying is idempotent, sync can be repeated from the last returned version after error. \n
+        :param other: target database object (tables with the same columns and unique id).
+        :param tables: tracked tables.
+        :param since: last synced version, int for all tables or dict of table and version (None - 0).
+        :param batch_size: changes per batch.
+        :return: dict of table and last synced version or bool False if error or table is not tracked.
+        """
+        tables: list = [tables] if isinstance(tables, int) or isinstance(tables, str) else tables
+        versions: dict = {str(i): (since.get(str(i), 0) if isinstance(since, dict) else since or 0) for i in tables}
+
+        for table in versions:
+            try:
+                request: str = self._dialect.tracked_request(table)
+                print(f'[debug] (sync_to) request: {request}') if self.db_debug else None
+                with self._session() as cursor, self._measure('sync_to', table, request):
+                    cursor.execute(request)
+                    tracked: int = cursor.fetchone()['tracked']
+            except self._errors as e:
+                print('[error] (sync_to) ' + str(e))
+                return False
+            if not tracked:
+                print(f'[error] (sync_to) {table} is not tracked (see track_changes)')
+                return False
+            changes = self._changes(table, versions[table], chunk_size=batch_size, strict=True)
+            try:
+                while True:
+                    batch: list = list(itertools.islice(changes, batch_size))
+                    if not batch:
+                        break
+                    records: list = [record for _, op, record in batch if op != 'D']
+                    deleted: list = [record[self.db_id] for _, op, record in batch if op == 'D']
+                    params: list = list(records[0]) if records else []
+                    print(f'[debug] (sync_to) {table}: {len(records)} upserted, {len(deleted)} deleted') if self.db_debug else None
+                    # failed upsert or delete rolls back transaction of batch and its error is raised
+                    with other.transaction():
+                        upserted = other.upsert(table, ([record.get(i) for i in params] for record in records),
+                                                [other.db_id if i == self.db_id else i for i in params],
+                                                other.db_id, batch_size=batch_size) if records else True
+                        other.delete(table, other.db_id, [deleted]) if deleted and upserted is not False else None
+                    versions[table] = batch[-1][0]
+            except self._errors + other._errors as e:
+                print(f'[error] (sync_to) {table} is synced to version {versions[table]}: ' + str(e))
+                return False
+            finally:
+                changes.close()
+        return versions
+
+    @staticmethod
+    def _index_name(table: str, columns: list, unique: bool = False) -> str:
+        return f"{table}_{'_'.join(columns)}_{'uidx' if unique else 'idx'}"
+
+    def _index_request(self, table: str, columns: str or list, unique: bool = False, where: str = None,
+                       name: str = None) -> str:
+        columns: list = [columns] if isinstance(columns, str) else [str(i) for i in columns]
+        name: str = self._index_name(table, columns, unique) if name is None else name
+        request: str = f"CREATE {'UNIQUE ' if unique else ''}INDEX IF NOT EXISTS {name} ON {table} ({', '.join(columns)})"
+        return request + (f' WHERE {where}' if where else '')
+
+    def create_index(self, table: str, columns: str or list, unique: bool = False, where: str = None,
+                     name: str = None) -> bool:
+        """
+        CREATE INDEX in base. \n
+        :param table: table.
+        :param columns: index column or columns (composite index).
+        :param unique: unique index.
+        :param where: partial index condition (SQL).
+        :param name: index name (default {table}_{columns}_idx / _uidx).
+        :return: bool type if success True, if not False.
+        """
+        try:
+            request: str = self._index_request(table, columns, unique, where, name)
+            print(f'[debug] (create_index) request: {request}') if self.db_debug else None
+            with self._session() as cursor:
+                with self._measure('create_index', table, request):
+                    cursor.execute(request)
+                self._commit(cursor)
+            return True
+        except self._errors as e:
+            print('[error] (create_index) ' + str(e))
+        return False
+
+    def drop_index(self, name: str, table: str = None, unique: bool = False) -> bool:
+        """
+        DROP INDEX in base. \n
+        :param name: index name or index column / columns if table is set.
+        :param table: table (index name is made from table and columns).
+        :param unique: unique index (with table).
+        :return: bool type if success True, if not False.
+        """
+        if table is not None:
+            name: str = self._index_name(table, [name] if isinstance(name, str) else [str(i) for i in name], unique)
+        try:
+            request: str = f"DROP INDEX IF EXISTS {name}"
+            print(f'[debug] (drop_index) request: {request}') if self.db_debug else None
+            with self._session() as cursor:
+                with self._measure('drop_index', table, request):
+                    cursor.execute(request)
+                self._commit(cursor)
+            return True
+        except self._errors as e:
+            print('[error] (drop_index) ' + str(e))
+        return False
+
+    def index_advice(self, top: int = 10) -> list or bool:
+        """
+        INDEX ADVICE, EXPLAIN (QUERY PLAN) of the hottest recorded request shapes (needs db_advisor). \n
+        :param top: count of shapes.
+        :return: list of shapes (method, table, params, count, plan, scan, suggestion) or bool False if error.
+        """
+        if self._advisor is None:
+            print('[error] (index_advice) advisor is off (db_advisor)')
+            return False
+        explain: str = self._dialect.explain
+        report: list = []
+        try:
+            with self._session(plain=True) as cursor:
+                for shape in self._advisor.hottest(top):
+                    cursor.execute(f"{explain} {shape.pop('request')}", shape.pop('args') or ())
+                    shape['plan'] = [str(i[-1]) for i in cursor.fetchall()]
+                    shape['scan'] = self._advisor.is_scan(self._dialect, shape['table'], shape['plan'])
+                    columns: list = self._advisor.suggest(shape)
+                    shape['suggestion'] = self._index_request(shape['table'], columns) if shape['scan'] and columns else None
+                    report.append(shape)
+            return report
+        except self._errors as e:
+            print('[error] (index_advice) ' + str(e))
         return False
 
     def drop_table(self, table: str) -> bool:
@@ -518,25 +1950,30 @@ class database:
         try:
             request: str = f"DROP TABLE {table}"
             print(f'[debug] (drop_table) request: {request}') if self.db_debug else None
-            self._cursor.execute(request)
-            self._connection.commit()
+            with self._session() as cursor:
+                with self._measure('drop_table', table, request):
+                    cursor.execute(request)
+                self._commit(cursor)
+            self._invalidate(table)
             return True
-        except psycopg2.Error or sql.Error as e:
+        except self._errors as e:
             print('[error] (drop_table) ' + str(e))
         return False
 
-    def create_base(self, params: dict = None) -> None:
+    def create_base(self, params: dict = None, indexes: dict = None) -> None:
         """
         CREATE BASE using params. \n
         :param params: tables and columns.
+        :param indexes: tables and indexes (see create_table).
         :return: None
         """
-        params = self.db_params.keys() if params is None else params
+        params = self.db_params if params is None else params
         tables: list = list(params)
+        indexes: dict = {} if indexes is None else indexes
         for table in tables:
             print(params)
             print(type(params))
-            self.create_table(table, params)
+            self.create_table(table, params, indexes.get(table))
 
     def drop_base(self, params: dict = None) -> None:
         """
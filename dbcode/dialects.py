@@ -0,0 +1,499 @@
+import io
+import os
+import json
+import decimal
+import datetime
+from .schema import TYPES, boolean, timestamp
+from .profiles import apply_pragmas, profile_pragmas
+
+
+# change log table of tracked tables (version, table, row id, operation I / U / D)
+CHANGES: str = 'dbcode_changes'
+
+
+class dialect:
+    name: str = None
+    placeholder: str = '?'
+    prepare: bool = False
+    explain: str = 'EXPLAIN'
+    types: dict = None
+    join_types: tuple = None
+    copy: bool = False
+    # column types bound as python values (Decimal / bool / datetime) adapted by driver, other are bound as text or int
+    native: tuple = ('NUMERIC', 'BOOLEAN', 'TIMESTAMP')
+
+    def __init__(self) -> None:
+        """
+        backend dialect: driver (imported on first use), connections and cursors, transactions
+        and SQL which differs between backends. \n
+        """
+        self._driver = None
+
+    @property
+    def driver(self):
+        if self._driver is None:
+            self._driver = self.load()
+        return self._driver
+
+    def load(self):
+        """
+        import driver module. \n
+        :return: driver module.
+        """
+        raise NotImplementedError
+
+    @property
+    def errors(self) -> tuple:
+        """
+        driver exceptions caught by database methods. \n
+        """
+        return (self.driver.Error,)
+
+    def connect(self, *args, **kwargs):
+        raise NotImplementedError
+
+    def cursor(self, connection, plain: bool = False):
+        """
+        new cursor returning rows (dict-like) or tuples if plain. \n
+        """
+        return connection.cursor()
+
+    def stream_cursor(self, connection, name: str, withhold: bool, chunk_size: int):
+        """
+        cursor fetching result chunk by chunk. \n
+        """
+        return self.cursor(connection)
+
+    def begin(self, connection, cursor) -> None:
+        raise NotImplementedError
+
+    def end(self, connection) -> None:
+        pass
+
+    def returning(self, db_id: str) -> str or None:
+        """
+        RETURNING column of INSERT (None - id is read from cursor). \n
+        """
+        return None
+
+    def last_id(self, cursor, db_id: str) -> int:
+        return int(cursor.lastrowid)
+
+    def bind(self, kind: str, value):
+        """
+        bind parameter of column type from request value (see schema.bind_value). \n
+        :param kind: column type.
+        :param value: request value (not None).
+        :return: bind parameter.
+        """
+        if kind == 'INTEGER':
+            return value if type(value) is int else int(value)
+        if kind == 'REAL':
+            return value if type(value) is float else float(value)
+        if kind == 'NUMERIC':
+            # exact value: int, decimal or its text (numeric affinity of sqlite3 keeps it exact)
+            if isinstance(value, bool) or type(value) is int:
+                return int(value)
+            value = value if isinstance(value, decimal.Decimal) else decimal.Decimal(str(value).strip())
+            return value if kind in self.native else str(value)
+        if kind == 'BOOLEAN':
+            return boolean(value) if kind in self.native else int(boolean(value))
+        if kind == 'TIMESTAMP':
+            return value if kind in self.native and isinstance(value, datetime.date) else timestamp(value)
+        if kind == 'JSON':
+            return value if isinstance(value, str) else json.dumps(value)
+        if kind == 'BLOB':
+            if isinstance(value, str):
+                return bytes.fromhex(value[2:]) if value.startswith('\\x') else value.encode()
+            return bytes(value)
+        return str(value)
+
+    def default(self, value) -> str:
+        """
+        DEFAULT literal of column definition. \n
+        :param value: default value (None, bool, number, text or JSON value).
+        :return: SQL literal.
+        """
+        if value is None:
+            return 'NULL'
+        if isinstance(value, bool):
+            return ('TRUE' if value else 'FALSE') if 'BOOLEAN' in self.native else str(int(value))
+        if isinstance(value, (int, float)):
+            return str(value)
+        value: str = value if isinstance(value, str) else json.dumps(value)
+        return "'" + value.replace("'", "''") + "'"
+
+    def complete(self, text: str) -> bool:
+        """
+        text ends with complete statement (for script tokenizer). \n
+        """
+        return True
+
+    def max_variables(self) -> int or None:
+        """
+        max count of bind parameters of request, IN lists are chunked under it
+        (None - list is bound as one array: param = ANY(array)). \n
+        """
+        return None
+
+    def tables_request(self) -> str:
+        raise NotImplementedError
+
+    def columns_request(self, table: str, types: bool = False) -> str:
+        raise NotImplementedError
+
+    def schema_request(self) -> str:
+        raise NotImplementedError
+
+    def schema_version_request(self) -> str:
+        raise NotImplementedError
+
+    def create_table_requests(self, table: str, db_id: str, columns: str) -> list:
+        raise NotImplementedError
+
+    def is_scan(self, table: str, line: str) -> bool:
+        """
+        EXPLAIN plan line is full table scan. \n
+        """
+        return False
+
+    def track_requests(self, table: str, db_id: str) -> list:
+        """
+        change log table and triggers writing inserted, updated and deleted ids of table to it. \n
+        """
+        raise NotImplementedError
+
+    def tracked_request(self, table: str) -> str:
+        """
+        count of change tracking triggers of table (tracked column). \n
+        """
+        raise NotImplementedError
+
+    def bulk_insert(self, compiler, table: str, params: tuple, returning: str = None, kinds: list = None,
+                    page_size: int = 1000) -> tuple:
+        """
+        INSERT of batch of rows (insert_many), executemany by default. \n
+        :param compiler: query compiler.
+        :param table: table name.
+        :param params: request parameters.
+        :param returning: id column returned for every row (None - no ids).
+        :param kinds: column types of params.
+        :param page_size: rows per request.
+        :return: (SQL request, function (cursor, batch) returning list of ids or None).
+        """
+        stmt = compiler.insert(table, params, self.returning(returning) if returning else None)
+
+        def run(cursor, batch: list) -> list or None:
+            if returning is None:
+                cursor.executemany(stmt.sql, batch)
+                return None
+            ids: list = []
+            for row in batch:
+                cursor.execute(stmt.sql, row)
+                ids.append(self.last_id(cursor, returning))
+            return ids
+        return stmt.sql, run
+
+    def bulk_update(self, compiler, table: str, columns: tuple, key: tuple, kinds: list = None,
+                    page_size: int = 1000) -> tuple:
+        """
+        row-specific UPDATE of batch of rows (update_many), executemany by default. \n
+        :param compiler: query compiler.
+        :param table: table name.
+        :param columns: updated columns (SET).
+        :param key: key columns (WHERE), rows are values of columns and then of key.
+        :param kinds: column types of columns and key.
+        :param page_size: rows per request.
+        :return: (SQL request, function (cursor, batch) returning count of updated records).
+        """
+        stmt = compiler.update(table, columns, tuple((i, '=') for i in key))
+
+        def run(cursor, batch: list) -> int:
+            cursor.executemany(stmt.sql, batch)
+            return max(cursor.rowcount, 0)
+        return stmt.sql, run
+
+    def upsert(self, compiler, table: str, params: tuple, conflict: tuple, update: tuple,
+               page_size: int = 1000) -> tuple:
+        """
+        INSERT ... ON CONFLICT of batch of rows (upsert), executemany by default. \n
+        :param compiler: query compiler.
+        :param table: table name.
+        :param params: request parameters.
+        :param conflict: conflict columns.
+        :param update: columns updated on conflict.
+        :param page_size: rows per request.
+        :return: (SQL request, function (cursor, batch) returning count of processed rows).
+        """
+        stmt = compiler.upsert(table, params, conflict, update)
+
+        def run(cursor, batch: list) -> int:
+            cursor.executemany(stmt.sql, batch)
+            return len(batch)
+        return stmt.sql, run
+
+    def copy_out(self, cursor, request: str, args: list, file) -> int:
+        """
+        write result of request to file as CSV with header by backend (export_table, when copy is True). \n
+        :return: count of rows.
+        """
+        raise NotImplementedError
+
+    def copy_in(self, cursor, request: str, data) -> None:
+        """
+        execute COPY ... FROM STDIN of script with its data (sql_file), backends without COPY fail on request. \n
+        """
+        cursor.execute(request)
+
+    def worker_connect(self, connect: tuple) -> tuple:
+        """
+        connect arguments of connection opened by worker process (parallel_select). \n
+        :param connect: (args, kwargs) of connect of database.
+        :return: (args, kwargs).
+        """
+        return connect
+
+
+class sqlite3_dialect(dialect):
+    name: str = 'sqlite3'
+    placeholder: str = '?'
+    explain: str = 'EXPLAIN QUERY PLAN'
+    types: dict = TYPES['sqlite3']
+    join_types: tuple = ('INNER', 'LEFT')
+    native: tuple = ()
+
+    def load(self):
+        import sqlite3
+        return sqlite3
+
+    def connect(self, path, check_same_thread: bool = True, pragmas: dict = None, readonly: bool = False):
+        if readonly:
+            connection = self.driver.connect(f'file:{os.path.abspath(path)}?mode=ro', check_same_thread=check_same_thread, uri=True)
+        else:
+            connection = self.driver.connect(path, check_same_thread=check_same_thread)
+        connection.row_factory = self.driver.Row
+        apply_pragmas(connection, pragmas or {}, readonly)
+        return connection
+
+    def cursor(self, connection, plain: bool = False):
+        cursor = connection.cursor()
+        if plain:
+            cursor.row_factory = None
+        return cursor
+
+    def begin(self, connection, cursor) -> None:
+        if not connection.in_transaction:
+            cursor.execute('BEGIN')
+
+    def complete(self, text: str) -> bool:
+        return self.driver.complete_statement(text)
+
+    def max_variables(self) -> int or None:
+        # SQLITE_MAX_VARIABLE_NUMBER default, 999 before 3.32.0
+        return 32766 if self.driver.sqlite_version_info >= (3, 32, 0) else 999
+
+    def tables_request(self) -> str:
+        return "SELECT name FROM sqlite_schema WHERE type ='table' AND name NOT LIKE 'sqlite_%';"
+
+    def columns_request(self, table: str, types: bool = False) -> str:
+        return f"SELECT name{', type' if types else ''} FROM pragma_table_info('{table}') WHERE name IS NOT '_id';"
+
+    def schema_request(self) -> str:
+        return "SELECT m.name AS tbl, p.name AS name, p.type AS type FROM sqlite_schema AS m JOIN pragma_table_info(m.name) AS p " \
+               "WHERE m.type = 'table' AND m.name NOT LIKE 'sqlite_%' AND p.name IS NOT '_id' ORDER BY m.name, p.cid;"
+
+    def schema_version_request(self) -> str:
+        return "SELECT schema_version FROM pragma_schema_version;"
+
+    def create_table_requests(self, table: str, db_id: str, columns: str) -> list:
+        return [f"CREATE TABLE IF NOT EXISTS {table} ({db_id} INTEGER NOT NULL UNIQUE, {columns}, PRIMARY KEY ({db_id} AUTOINCREMENT));"]
+
+    def is_scan(self, table: str, line: str) -> bool:
+        return line.startswith(f'scan {table}') and 'using' not in line
+
+    def track_requests(self, table: str, db_id: str) -> list:
+        insert: str = f'INSERT INTO {CHANGES} (tbl, row_id, op)'
+        return [f'CREATE TABLE IF NOT EXISTS {CHANGES} (version INTEGER PRIMARY KEY AUTOINCREMENT, tbl TEXT NOT NULL, '
+                f'row_id INTEGER NOT NULL, op TEXT NOT NULL);',
+                f'CREATE INDEX IF NOT EXISTS {CHANGES}_tbl_idx ON {CHANGES} (tbl, version);',
+                f"CREATE TRIGGER IF NOT EXISTS {table}_insert_track AFTER INSERT ON {table} "
+                f"BEGIN {insert} VALUES ('{table}', NEW.{db_id}, 'I'); END;",
+                f"CREATE TRIGGER IF NOT EXISTS {table}_update_track AFTER UPDATE ON {table} "
+                f"BEGIN {insert} SELECT '{table}', OLD.{db_id}, 'D' WHERE OLD.{db_id} IS NOT NEW.{db_id}; "
+                f"{insert} VALUES ('{table}', NEW.{db_id}, 'U'); END;",
+                f"CREATE TRIGGER IF NOT EXISTS {table}_delete_track AFTER DELETE ON {table} "
+                f"BEGIN {insert} VALUES ('{table}', OLD.{db_id}, 'D'); END;"]
+
+    def tracked_request(self, table: str) -> str:
+        return f"SELECT count(*) AS tracked FROM sqlite_schema WHERE type = 'trigger' AND tbl_name = '{table}' " \
+               f"AND name IN ('{table}_insert_track', '{table}_update_track', '{table}_delete_track');"
+
+    def worker_connect(self, connect: tuple) -> tuple:
+        (path, *_), kwargs = connect
+        if str(path) in ('', ':memory:') or 'mode=memory' in str(path):
+            raise ValueError('sqlite3 database must be file')
+        return (path,), {**kwargs, 'pragmas': profile_pragmas('readonly'), 'readonly': True}
+
+
+class postgresql_dialect(dialect):
+    name: str = 'postgresql'
+    placeholder: str = '%s'
+    prepare: bool = True
+    explain: str = 'EXPLAIN'
+    types: dict = TYPES['postgresql']
+    copy: bool = True
+
+    def load(self):
+        import psycopg2
+        import psycopg2.extras
+        return psycopg2
+
+    def connect(self, host, port, user, password, dbname):
+        from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+        connection = self.driver.connect(host=host, port=port, user=user, password=password, database=dbname)
+        connection.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+        return connection
+
+    def cursor(self, connection, plain: bool = False):
+        return connection.cursor() if plain else connection.cursor(cursor_factory=self.driver.extras.RealDictCursor)
+
+    def stream_cursor(self, connection, name: str, withhold: bool, chunk_size: int):
+        cursor = connection.cursor(name=name, withhold=withhold, cursor_factory=self.driver.extras.RealDictCursor)
+        cursor.itersize = chunk_size
+        return cursor
+
+    def begin(self, connection, cursor) -> None:
+        connection.autocommit = False
+
+    def end(self, connection) -> None:
+        connection.autocommit = True
+
+    def returning(self, db_id: str) -> str or None:
+        return db_id
+
+    def last_id(self, cursor, db_id: str) -> int:
+        return int(cursor.fetchone()[db_id])
+
+    def execute_values(self, cursor, request: str, rows: list, page_size: int, fetch: bool = False):
+        return self.driver.extras.execute_values(cursor, request, rows, page_size=page_size, fetch=fetch)
+
+    def bulk_insert(self, compiler, table: str, params: tuple, returning: str = None, kinds: list = None,
+                    page_size: int = 1000) -> tuple:
+        if returning is not None:
+            request: str = f"INSERT INTO {table} ({', '.join(params)}) VALUES %s RETURNING {returning}"
+            return request, lambda cursor, batch: [
+                int(i[returning]) for i in self.execute_values(cursor, request, batch, page_size, fetch=True)]
+        # text format keeps NULL (\\N) and empty string apart
+        request: str = f"COPY {table} ({', '.join(params)}) FROM STDIN"
+
+        def run(cursor, batch: list) -> None:
+            from .transfer import copy_rows
+            cursor.copy_expert(request, io.StringIO(copy_rows(batch)))
+        return request, run
+
+    def bulk_update(self, compiler, table: str, columns: tuple, key: tuple, kinds: list = None,
+                    page_size: int = 1000) -> tuple:
+        types: dict = dict(zip(columns + key, kinds or []))
+        value = lambda i: f'v.{i}::{self.types[types[i]]}' if types.get(i) else f'v.{i}'
+        request: str = f"UPDATE {table} AS t SET {', '.join(f'{i} = {value(i)}' for i in columns)} " \
+                       f"FROM (VALUES %s) AS v ({', '.join(columns + key)}) " \
+                       f"WHERE {' AND '.join(f't.{i} = {value(i)}' for i in key)}"
+
+        def run(cursor, batch: list) -> int:
+            self.execute_values(cursor, request, batch, page_size)
+            return max(cursor.rowcount, 0)
+        return request, run
+
+    def upsert(self, compiler, table: str, params: tuple, conflict: tuple, update: tuple,
+               page_size: int = 1000) -> tuple:
+        request: str = f"INSERT INTO {table} ({', '.join(params)}) VALUES %s {compiler.on_conflict(conflict, update)}"
+        keys: list = [params.index(i) for i in conflict if i in params]
+
+        def run(cursor, batch: list) -> int:
+            # one row per conflict key in a batch (last wins), as with sequential upserts
+            batch: list = list({tuple(row[i] for i in keys): row for row in batch}.values()) if keys else batch
+            self.execute_values(cursor, request, batch, page_size)
+            return len(batch)
+        return request, run
+
+    def copy_out(self, cursor, request: str, args: list, file) -> int:
+        cursor.copy_expert(f"COPY ({cursor.mogrify(request, args or None).decode()}) TO STDOUT WITH (FORMAT csv, HEADER true)",
+                           file, size=1 << 16)
+        return cursor.rowcount
+
+    def copy_in(self, cursor, request: str, data) -> None:
+        cursor.copy_expert(request, data)
+
+    def tables_request(self) -> str:
+        return "SELECT table_name AS name FROM information_schema.tables WHERE table_schema='public' AND table_type='BASE TABLE';"
+
+    def columns_request(self, table: str, types: bool = False) -> str:
+        return f"SELECT column_name AS name{', data_type AS type' if types else ''} FROM information_schema.columns " \
+               f"WHERE table_schema = 'public' AND table_name = '{table}' ORDER BY ordinal_position;"
+
+    def schema_request(self) -> str:
+        return "SELECT c.table_name AS tbl, c.column_name AS name, c.data_type AS type FROM information_schema.columns AS c " \
+               "JOIN information_schema.tables AS t ON t.table_schema = c.table_schema AND t.table_name = c.table_name " \
+               "WHERE c.table_schema = 'public' AND t.table_type = 'BASE TABLE' ORDER BY c.table_name, c.ordinal_position;"
+
+    def schema_version_request(self) -> str:
+        return "SELECT md5(string_agg(table_name || '.' || column_name || '.' || data_type, ',' " \
+               "ORDER BY table_name, ordinal_position)) AS schema_version " \
+               "FROM information_schema.columns WHERE table_schema = 'public';"
+
+    def create_table_requests(self, table: str, db_id: str, columns: str) -> list:
+        return [f"CREATE TABLE IF NOT EXISTS {table} ({db_id} INT PRIMARY KEY NOT NULL, {columns});",
+                f"CREATE SEQUENCE IF NOT EXISTS {table}_seq INCREMENT 1 START 1 NO CYCLE OWNED BY {table}.{db_id};",
+                f"ALTER TABLE {table} ALTER COLUMN {db_id} SET DEFAULT nextval('{table}_seq');"]
+
+    def is_scan(self, table: str, line: str) -> bool:
+        return f'seq scan on {table}' in line
+
+    def track_requests(self, table: str, db_id: str) -> list:
+        # function of table reads id column directly (no row to jsonb conversion per change)
+        insert: str = f'INSERT INTO {CHANGES} (tbl, row_id, op) VALUES'
+        return [f'CREATE TABLE IF NOT EXISTS {CHANGES} (version BIGSERIAL PRIMARY KEY, tbl TEXT NOT NULL, '
+                f'row_id BIGINT NOT NULL, op CHAR(1) NOT NULL);',
+                f'CREATE INDEX IF NOT EXISTS {CHANGES}_tbl_idx ON {CHANGES} (tbl, version);',
+                f"CREATE OR REPLACE FUNCTION {table}_track() RETURNS trigger LANGUAGE plpgsql AS $$ BEGIN "
+                f"IF TG_OP = 'DELETE' OR (TG_OP = 'UPDATE' AND OLD.{db_id} IS DISTINCT FROM NEW.{db_id}) THEN "
+                f"{insert} ('{table}', OLD.{db_id}, 'D'); END IF; "
+                f"IF TG_OP IN ('INSERT', 'UPDATE') THEN {insert} ('{table}', NEW.{db_id}, left(TG_OP, 1)); END IF; "
+                f"RETURN NULL; END $$;",
+                f'DROP TRIGGER IF EXISTS {table}_track ON {table};',
+                f"CREATE TRIGGER {table}_track AFTER INSERT OR UPDATE OR DELETE ON {table} "
+                f"FOR EACH ROW EXECUTE FUNCTION {table}_track();"]
+
+    def tracked_request(self, table: str) -> str:
+        return f"SELECT count(*) AS tracked FROM pg_trigger WHERE tgname = '{table}_track' " \
+               f"AND tgrelid = to_regclass('{table}');"
+
+
+DIALECTS: dict = {}
+
+
+def register(name: str, dialect_class: type) -> None:
+    """
+    register backend dialect. \n
+    :param name: database type.
+    :param dialect_class: dialect subclass.
+    :return: None.
+    """
+    DIALECTS[name] = dialect_class
+    if dialect_class.types is not None:
+        TYPES[name] = dialect_class.types
+
+
+def get_dialect(name: str) -> dialect:
+    """
+    new dialect of database type. \n
+    :param name: database type.
+    :return: dialect.
+    """
+    if name not in DIALECTS:
+        raise ValueError(f'database type {name} does not match existing {list(DIALECTS)}')
+    return DIALECTS[name]()
+
+
+register('sqlite3', sqlite3_dialect)
+register('postgresql', postgresql_dialect)
@@ -0,0 +1,168 @@
+import time
+import threading
+
+
+BUCKETS: tuple = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class histogram:
+    __slots__ = ('count', 'errors', 'rows', 'total', 'min', 'max', 'buckets')
+
+    def __init__(self) -> None:
+        """
+        latency histogram with fixed buckets (seconds). \n
+        """
+        self.count: int = 0
+        self.errors: int = 0
+        self.rows: int = 0
+        self.total: float = 0.0
+        self.min: float = None
+        self.max: float = None
+        self.buckets: list = [0 for _ in range(len(BUCKETS) + 1)]
+
+    def add(self, elapsed: float, rows: int = None, error: bool = False) -> None:
+        self.count += 1
+        self.errors += 1 if error else 0
+        self.rows += rows if rows is not None and rows > 0 else 0
+        self.total += elapsed
+        self.min = elapsed if self.min is None else min(self.min, elapsed)
+        self.max = elapsed if self.max is None else max(self.max, elapsed)
+        for i, bound in enumerate(BUCKETS):
+            if elapsed <= bound:
+                self.buckets[i] += 1
+                return
+        self.buckets[-1] += 1
+
+    def percentile(self, p: float) -> float or None:
+        """
+        estimated percentile (upper bound of bucket). \n
+        :param p: percentile (0 - 100).
+        :return: seconds or None if empty.
+        """
+        if not self.count:
+            return None
+        rank: float = self.count * p / 100
+        seen: int = 0
+        for i, count in enumerate(self.buckets):
+            seen += count
+            if seen >= rank and count:
+                return min(BUCKETS[i], self.max) if i < len(BUCKETS) else self.max
+        return self.max
+
+    def export(self) -> dict:
+        return {
+            'count': self.count,
+            'errors': self.errors,
+            'rows': self.rows,
+            'total': self.total,
+            'mean': self.total / self.count if self.count else None,
+            'min': self.min,
+            'max': self.max,
+            'p50': self.percentile(50),
+            'p90': self.percentile(90),
+            'p99': self.percentile(99),
+            'buckets': {**{str(bound): self.buckets[i] for i, bound in enumerate(BUCKETS)}, 'inf': self.buckets[-1]},
+        }
+
+
+class measure:
+    __slots__ = ('owner', 'method', 'table', 'request', 'args', 'rows', 'start')
+
+    def __init__(self, owner, method: str, table: str, request: str, args) -> None:
+        """
+        one measured request, rows can be set inside the with block. \n
+        """
+        self.owner = owner
+        self.method: str = method
+        self.table: str = table
+        self.request: str = request
+        self.args = args
+        self.rows: int = None
+        self.start: float = 0.0
+
+    def __enter__(self):
+        for hook in self.owner.before:
+            hook(self.method, self.table, self.request, self.args)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        self.owner.record(self, time.perf_counter() - self.start, exc)
+        return False
+
+
+class _null_measure:
+    __slots__ = ('rows',)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        return False
+
+
+null_measure = _null_measure()
+
+
+class instrumentation:
+    def __init__(self, slow_query: float = None) -> None:
+        """
+        request instrumentation: before / after hooks, per-method and per-table latency histograms,
+        row counts and slow request log (logging 'dbcode'). \n
+        :param slow_query: seconds after which request is logged as slow (None - off).
+        """
+        self.slow_query: float = slow_query
+        self.before: list = []
+        self.after: list = []
+        self.slow: int = 0
+        self._methods: dict = {}
+        self._tables: dict = {}
+        self._lock = threading.Lock()
+
+    def add_hook(self, before=None, after=None) -> None:
+        """
+        add hooks. \n
+        :param before: function (method, table, request, args) called before request.
+        :param after: function (method, table, request, args, elapsed, rows, error) called after request.
+        :return: None.
+        """
+        self.before.append(before) if before is not None else None
+        self.after.append(after) if after is not None else None
+
+    def measure(self, method: str, table: str, request: str, args=None) -> measure:
+        return measure(self, method, table, request, args)
+
+    def record(self, item: measure, elapsed: float, error: BaseException = None) -> None:
+        with self._lock:
+            self._methods.setdefault(item.method, histogram()).add(elapsed, item.rows, error is not None)
+            if item.table is not None:
+                self._tables.setdefault(str(item.table), histogram()).add(elapsed, item.rows, error is not None)
+            slow: bool = self.slow_query is not None and elapsed >= self.slow_query
+            self.slow += 1 if slow else 0
+        if slow:
+            import logging
+            logging.getLogger('dbcode').warning('slow request (%s) %.6fs: %s %s', item.method, elapsed, item.request, item.args or '')
+        for hook in self.after:
+            hook(item.method, item.table, item.request, item.args, elapsed, item.rows, error)
+
+    def stats(self) -> dict:
+        """
+        aggregated stats. \n
+        :return: dict with methods and tables histograms and slow request count.
+        """
+        with self._lock:
+            return {
+                'methods': {name: value.export() for name, value in self._methods.items()},
+                'tables': {name: value.export() for name, value in self._tables.items()},
+                'slow': self.slow,
+            }
+
+    def reset(self) -> None:
+        """
+        reset aggregated stats. \n
+        :return: None.
+        """
+        with self._lock:
+            self._methods.clear()
+            self._tables.clear()
+            self.slow = 0
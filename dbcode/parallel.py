@@ -0,0 +1,44 @@
+from .dialects import get_dialect
+
+
+def id_ranges(low: int, high: int, count: int) -> list:
+    """
+    split id range into partitions of the same width. \n
+    :param low: min id.
+    :param high: max id.
+    :param count: count of partitions.
+    :return: list of (first id, last id) pairs.
+    """
+    width: int = max(-(-(high - low + 1) // max(count, 1)), 1)
+    return [(start, min(start + width - 1, high)) for start in range(low, high + 1, width)]
+
+
+def scan_partition(db_type: str, connect: tuple, request: str, args: list, fn, chunk_size: int = 1000):
+    """
+    worker of parallel_select: open own connection, run request of one partition and apply fn to its rows. \n
+    :param db_type: database type (sqlite3 / postgresql).
+    :param connect: (args, kwargs) of dialect connect.
+    :param request: SELECT request of partition.
+    :param args: bind parameters.
+    :param fn: function (iterable of rows) returning partial result.
+    :param chunk_size: rows per fetch.
+    :return: partial result.
+    """
+    dialect = get_dialect(db_type)
+    connection = dialect.connect(*connect[0], **connect[1])
+    try:
+        cursor = dialect.stream_cursor(connection, 'dbcode_partition', True, chunk_size)
+        try:
+            cursor.execute(request, args)
+
+            def rows():
+                while True:
+                    chunk: list = cursor.fetchmany(chunk_size)
+                    if not chunk:
+                        break
+                    yield from chunk
+            return fn(rows())
+        finally:
+            cursor.close()
+    finally:
+        connection.close()
@@ -0,0 +1,109 @@
+import time
+import threading
+
+
+class pool:
+    def __init__(self, connect, size: int, timeout: float = None) -> None:
+        """
+        bounded thread-safe connection pool. \n
+        :param connect: function without arguments which opens new connection.
+        :param size: max count of connections.
+        :param timeout: max seconds to wait for free connection (None - wait forever).
+        """
+        self.size: int = size
+        self.timeout: float = timeout
+        self._connect = connect
+        self._idle: list = []
+        self._connections: list = []
+        self._condition = threading.Condition()
+        self._since: dict = {}
+        self._started: float = time.perf_counter()
+        self._acquired: int = 0
+        self._waited: int = 0
+        self._wait_time: float = 0.0
+        self._wait_max: float = 0.0
+        self._busy_time: float = 0.0
+        self._peak: int = 0
+
+    def acquire(self):
+        """
+        take connection from pool, open new one if pool is not full or wait for free one. \n
+        :return: connection.
+        """
+        start: float = time.perf_counter()
+        deadline: float = None if self.timeout is None else start + self.timeout
+        connection = None
+        with self._condition:
+            while not self._idle and len(self._connections) >= self.size:
+                remaining: float = None if deadline is None else deadline - time.perf_counter()
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError(f'connection pool exhausted ({self.size} connections in use)')
+                self._condition.wait(remaining)
+            if self._idle:
+                connection = self._idle.pop()
+            else:
+                self._connections.append(None)
+        if connection is None:
+            try:
+                connection = self._connect()
+            except BaseException:
+                with self._condition:
+                    self._connections.remove(None)
+                    self._condition.notify()
+                raise
+            with self._condition:
+                self._connections[self._connections.index(None)] = connection
+        now: float = time.perf_counter()
+        with self._condition:
+            wait: float = now - start
+            self._acquired += 1
+            self._waited += 1 if wait > 0.001 else 0
+            self._wait_time += wait
+            self._wait_max = max(self._wait_max, wait)
+            self._since[id(connection)] = now
+            self._peak = max(self._peak, len(self._since))
+        return connection
+
+    def release(self, connection) -> None:
+        """
+        return connection to pool. \n
+        :param connection: connection taken by acquire.
+        :return: None.
+        """
+        with self._condition:
+            self._busy_time += time.perf_counter() - self._since.pop(id(connection))
+            self._idle.append(connection)
+            self._condition.notify()
+
+    def stats(self) -> dict:
+        """
+        pool stats. \n
+        :return: dict with size, open, in_use, peak, acquired, waited, wait_total, wait_avg, wait_max and utilisation.
+        """
+        with self._condition:
+            now: float = time.perf_counter()
+            busy: float = self._busy_time + sum(now - i for i in self._since.values())
+            elapsed: float = now - self._started
+            return {
+                'size': self.size,
+                'open': len(self._connections),
+                'in_use': len(self._since),
+                'peak': self._peak,
+                'acquired': self._acquired,
+                'waited': self._waited,
+                'wait_total': self._wait_time,
+                'wait_avg': self._wait_time / self._acquired if self._acquired else 0.0,
+                'wait_max': self._wait_max,
+                'utilisation': busy / (elapsed * self.size) if elapsed and self.size else 0.0,
+            }
+
+    def close(self) -> None:
+        """
+        close all idle connections of pool. \n
+        :return: None.
+        """
+        with self._condition:
+            for connection in self._idle:
+                connection.close()
+                self._connections.remove(connection)
+            self._idle.clear()
@@ -0,0 +1,57 @@
+PROFILES: dict = {
+    'default': {},
+    'throughput': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'cache_size': -65536,
+        'mmap_size': 268435456,
+        'temp_store': 'MEMORY',
+        'busy_timeout': 5000,
+    },
+    'durable': {
+        'journal_mode': 'WAL',
+        'synchronous': 'FULL',
+        'cache_size': -16384,
+        'temp_store': 'MEMORY',
+        'busy_timeout': 10000,
+    },
+    'readonly': {
+        'cache_size': -65536,
+        'mmap_size': 268435456,
+        'temp_store': 'MEMORY',
+        'busy_timeout': 5000,
+        'query_only': 1,
+    },
+}
+
+# pragmas which change database file, they are not applied on read-only connections
+_WRITE_PRAGMAS: tuple = ('journal_mode', 'auto_vacuum', 'page_size')
+
+
+def profile_pragmas(profile: str or dict = None) -> dict:
+    """
+    sqlite3 pragmas of performance profile. \n
+    :param profile: profile name (default / throughput / durable / readonly) or dict of pragmas.
+    :return: dict of pragma and value.
+    """
+    if profile is None:
+        return {}
+    if isinstance(profile, dict):
+        return dict(profile)
+    if profile not in PROFILES:
+        raise ValueError(f'profile {profile} does not match existing {list(PROFILES)}')
+    return dict(PROFILES[profile])
+
+
+def apply_pragmas(connection, pragmas: dict, readonly: bool = False) -> None:
+    """
+    apply pragmas to sqlite3 connection. \n
+    :param connection: sqlite3 connection.
+    :param pragmas: dict of pragma and value.
+    :param readonly: connection is read-only (pragmas changing database file are skipped).
+    :return: None.
+    """
+    for pragma, value in pragmas.items():
+        if readonly and pragma in _WRITE_PRAGMAS:
+            continue
+        connection.execute(f'PRAGMA {pragma}={value}')
@@ -0,0 +1,160 @@
+import os
+import json
+import decimal
+import datetime
+
+
+class schema(dict):
+    def __init__(self, load, params: dict = None) -> None:
+        """
+        lazy database schema, columns of table are loaded on first access. \n
+        :param load: function (table) returning list of columns or None.
+        :param params: already loaded tables and columns.
+        """
+        super().__init__(params or {})
+        self._load = load
+
+    def __missing__(self, table: str) -> list:
+        columns = self._load(table)
+        if not columns:
+            raise KeyError(table)
+        self[table] = columns
+        return columns
+
+    def __contains__(self, table) -> bool:
+        if dict.__contains__(self, table):
+            return True
+        try:
+            self.__missing__(table)
+            return True
+        except KeyError:
+            return False
+
+
+def read_snapshot(path: str, db_type: str, version: str) -> dict or None:
+    """
+    read schema snapshot file. \n
+    :param path: snapshot file path.
+    :param db_type: database type (sqlite3 / postgresql).
+    :param version: current schema version.
+    :return: tables and columns or None if there is no snapshot or it is outdated.
+    """
+    if not os.path.isfile(path):
+        return None
+    try:
+        with open(path, mode='r', encoding='utf-8') as file:
+            snapshot: dict = json.load(file)
+    except (OSError, ValueError):
+        return None
+    if snapshot.get('db_type') != db_type or snapshot.get('version') != version:
+        return None
+    return snapshot.get('params')
+
+
+def write_snapshot(path: str, db_type: str, version: str, params: dict) -> None:
+    """
+    write schema snapshot file. \n
+    :param path: snapshot file path.
+    :param db_type: database type (sqlite3 / postgresql).
+    :param version: current schema version.
+    :param params: tables and columns.
+    :return: None.
+    """
+    temp: str = f'{path}.tmp'
+    with open(temp, mode='w', encoding='utf-8') as file:
+        json.dump({'db_type': db_type, 'version': version, 'params': params}, file)
+    os.replace(temp, path)
+
+
+TYPES: dict = {
+    'sqlite3': {'TEXT': 'TEXT', 'INTEGER': 'INTEGER', 'REAL': 'REAL', 'NUMERIC': 'NUMERIC', 'BLOB': 'BLOB',
+                'BOOLEAN': 'BOOLEAN', 'TIMESTAMP': 'TIMESTAMP', 'JSON': 'JSON'},
+    'postgresql': {'TEXT': 'TEXT', 'INTEGER': 'BIGINT', 'REAL': 'DOUBLE PRECISION', 'NUMERIC': 'NUMERIC', 'BLOB': 'BYTEA',
+                   'BOOLEAN': 'BOOLEAN', 'TIMESTAMP': 'TIMESTAMP', 'JSON': 'JSONB'},
+}
+
+# native type names (sqlite3 declared types and postgresql data_type), without (precision) and lower case
+NATIVE_TYPES: dict = {
+    'INTEGER': ('int', 'integer', 'tinyint', 'smallint', 'mediumint', 'bigint', 'unsigned big int',
+                'int2', 'int4', 'int8', 'serial', 'smallserial', 'bigserial'),
+    'REAL': ('real', 'float', 'double', 'double precision', 'float4', 'float8'),
+    'NUMERIC': ('numeric', 'decimal'),
+    'BOOLEAN': ('boolean', 'bool'),
+    'TIMESTAMP': ('timestamp', 'timestamp without time zone', 'timestamp with time zone', 'timestamptz',
+                  'datetime', 'date'),
+    'JSON': ('json', 'jsonb'),
+    'BLOB': ('blob', 'bytea'),
+}
+
+
+def column_type(native: str) -> str:
+    """
+    column type from native (declared) column type. \n
+    :param native: native column type (sqlite3 declared type / postgresql data_type).
+    :return: column type (TEXT / INTEGER / REAL / NUMERIC / BLOB / BOOLEAN / TIMESTAMP / JSON).
+    """
+    native: str = ' '.join((native or '').split('(')[0].lower().split())
+    for kind, names in NATIVE_TYPES.items():
+        if native in names:
+            return kind
+    return 'TEXT'
+
+
+def column_definition(dialect, column: str, spec) -> tuple:
+    """
+    column definition of CREATE TABLE. \n
+    :param dialect: backend dialect (column types and DEFAULT literals).
+    :param column: column name.
+    :param spec: column type: None (TEXT), 'TYPE [NOT NULL] [DEFAULT value]'
+                 or dict (type, null, default).
+    :return: (column type, column definition).
+    """
+    if isinstance(spec, dict):
+        kind: str = str(spec.get('type') or 'TEXT').upper()
+        extra: str = '' if spec.get('null', True) else ' NOT NULL'
+        extra += f" DEFAULT {dialect.default(spec['default'])}" if 'default' in spec else ''
+    else:
+        kind, _, extra = str(spec or 'TEXT').strip().partition(' ')
+        kind, extra = kind.upper(), f' {extra.strip()}' if extra.strip() else ''
+    types: dict = dialect.types or {}
+    if kind not in types:
+        raise ValueError(f'column {column} type {kind} does not match existing {list(types)}')
+    return kind, f'{column} {types[kind]}{extra}'
+
+
+def boolean(value) -> bool:
+    """
+    boolean of request value (1 / t / true / y / yes / on for text). \n
+    """
+    if isinstance(value, str):
+        return value.strip().lower() in ('1', 't', 'true', 'y', 'yes', 'on')
+    return bool(value)
+
+
+def timestamp(value) -> str:
+    """
+    ISO text of timestamp request value. \n
+    """
+    if isinstance(value, datetime.datetime):
+        return value.isoformat(sep=' ')
+    if isinstance(value, datetime.date):
+        return value.isoformat()
+    return str(value)
+
+
+def bind_value(dialect, kind: str, value):
+    """
+    request value to bind parameter of column type. \n
+    :param dialect: backend dialect (binding of column types).
+    :param kind: column type (None - untyped, value is bound as text).
+    :param value: request value.
+    :return: bind parameter.
+    """
+    if kind is None:
+        return str(value)
+    if value is None or (value == '' and kind != 'TEXT'):
+        return None
+    try:
+        return dialect.bind(kind, value)
+    except (TypeError, ValueError, decimal.InvalidOperation):
+        return str(value)
@@ -0,0 +1,217 @@
+import re
+
+
+_SPECIAL = re.compile(r"""[;'"$]|--|/\*""")
+_TAG = re.compile(r'\$([A-Za-z_][A-Za-z0-9_]*)?\$')
+_COMMENTS = re.compile(r'--[^\n]*|/\*.*?\*/', re.DOTALL)
+_COPY = re.compile(r'^\s*COPY\b.*\bFROM\s+STDIN\b', re.IGNORECASE | re.DOTALL)
+_IDENTIFIER: str = 'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_'
+
+
+def strip_comments(statement: str) -> str:
+    """
+    statement without comments (to check if statement is empty and to match its kind). \n
+    :param statement: SQL statement.
+    :return: SQL statement.
+    """
+    return _COMMENTS.sub(' ', statement).strip()
+
+
+class script:
+    def __init__(self, file, complete=None, chunk_size: int = 1 << 20) -> None:
+        """
+        SQL script tokenizer, reads file chunk by chunk and splits it into statements on ';'
+        outside of quotes, comments and dollar-quoted (postgresql) bodies. \n
+        :param file: text file object.
+        :param complete: function (text) returning True if text is complete statement
+                         (sqlite3.complete_statement for CREATE TRIGGER ... BEGIN ...; END bodies).
+        :param chunk_size: characters per read.
+        """
+        self.file = file
+        self.complete = complete
+        self.chunk_size: int = chunk_size
+        self.position: int = 0
+        # text before offset is taken, buffer is compacted only after chunk_size characters are taken
+        # (not on every statement, that would copy the rest of buffer per statement)
+        self._buffer: str = ''
+        self._offset: int = 0
+        self._eof: bool = False
+        self._copy: bool = False
+
+    def _fill(self) -> bool:
+        if self._eof:
+            return False
+        chunk: str = self.file.read(self.chunk_size)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buffer += chunk
+        return True
+
+    def _need(self, end: int) -> bool:
+        while len(self._buffer) < end:
+            if not self._fill():
+                return False
+        return True
+
+    def _skip(self, start: int) -> int or None:
+        """
+        end of quoted string, comment or dollar-quoted body starting at start. \n
+        :return: index after it or None if it is not closed before end of file.
+        """
+        buffer: str = self._buffer
+        char: str = buffer[start]
+        if char == '-':
+            end, close = start + 2, '\n'
+        elif char == '/':
+            depth, end = 1, start + 2
+            while depth:
+                self._need(end + 2)
+                opening, closing = self._buffer.find('/*', end), self._buffer.find('*/', end)
+                if closing == -1:
+                    if not self._fill():
+                        return None
+                    continue
+                if opening != -1 and opening < closing:
+                    depth, end = depth + 1, opening + 2
+                else:
+                    depth, end = depth - 1, closing + 2
+            return end
+        elif char == '$':
+            self._need(start + 64)
+            match = _TAG.match(self._buffer, start)
+            if match is None or (start > self._offset and self._buffer[start - 1] in _IDENTIFIER):
+                return start + 1
+            end, close = match.end(), match.group()
+        else:
+            end, close = start + 1, char
+        escaped: bool = char == "'" and start > self._offset and buffer[start - 1] in 'eE' and \
+            (start - 1 == self._offset or buffer[start - 2] not in _IDENTIFIER)
+        while True:
+            found: int = self._buffer.find(close, end)
+            if found == -1:
+                if not self._fill():
+                    return None if close != '\n' else len(self._buffer)
+                continue
+            if escaped:
+                slashes: int = 0
+                while self._buffer[found - 1 - slashes] == '\\':
+                    slashes += 1
+                if slashes % 2:
+                    end = found + 1
+                    continue
+            if close in ("'", '"'):
+                if not self._need(found + 2) or self._buffer[found + 1] != close:
+                    return found + 1
+                end = found + 2
+                continue
+            return found + len(close)
+
+    def _take(self, end: int) -> str:
+        text: str = self._buffer[self._offset:end]
+        self.position += end - self._offset
+        self._offset = end
+        if self._offset >= self.chunk_size:
+            self._buffer, self._offset = self._buffer[self._offset:], 0
+        return text
+
+    def __iter__(self):
+        """
+        statements of script. \n
+        :return: generator of (statement without ';', copy data or None), copy data is file object
+                 with rows of COPY ... FROM STDIN statement and must be read before next statement.
+        """
+        start: int = self._offset
+        while True:
+            if self._copy:
+                self.read()
+                start = self._offset
+            match = _SPECIAL.search(self._buffer, start)
+            if match is None:
+                # '-' or '/' at the end of buffer can start '--' or '/*' with next chunk
+                start = max(len(self._buffer) - 1, self._offset)
+                if self._fill():
+                    continue
+                statement: str = self._take(len(self._buffer))
+                if strip_comments(statement):
+                    yield statement.strip(), None
+                return
+            if match.group() != ';':
+                end = self._skip(match.start())
+                if end is None:
+                    statement: str = self._take(len(self._buffer))
+                    yield statement.strip(), None
+                    return
+                start = end
+                continue
+            if self.complete is not None and not self.complete(self._buffer[self._offset:match.end()]):
+                start = match.end()
+                continue
+            statement: str = self._take(match.end())[:-1]
+            start = self._offset
+            if not strip_comments(statement):
+                continue
+            if _COPY.match(strip_comments(statement)):
+                self._need(self._offset + 1)
+                newline: int = self._buffer.find('\n', self._offset)
+                while newline == -1 and self._fill():
+                    newline = self._buffer.find('\n', self._offset)
+                self._take(newline + 1 if newline != -1 else len(self._buffer))
+                self._copy = True
+                yield statement.strip(), self
+                start = self._offset
+            else:
+                yield statement.strip(), None
+
+    def readline(self, size: int = -1) -> str:
+        """
+        next row of COPY data ('' after end-of-data marker). \n
+        """
+        if not self._copy:
+            return ''
+        newline: int = self._buffer.find('\n', self._offset)
+        while newline == -1 and self._fill():
+            newline = self._buffer.find('\n', self._offset)
+        line: str = self._take(newline + 1 if newline != -1 else len(self._buffer))
+        if not line or line.rstrip('\r\n') == '\\.':
+            self._copy = False
+            return ''
+        return line
+
+    def read(self, size: int = -1) -> str:
+        """
+        COPY data, whole lines up to size characters ('' after end-of-data marker). \n
+        """
+        lines: list = []
+        count: int = 0
+        while size < 0 or count < size:
+            line: str = self.readline()
+            if not line:
+                break
+            lines.append(line)
+            count += len(line)
+        return ''.join(lines)
+
+
+_TRANSACTION = re.compile(r'^(BEGIN|COMMIT|END|START\s+TRANSACTION)(\s+(DEFERRED|IMMEDIATE|EXCLUSIVE))?(\s+(TRANSACTION|WORK))?$',
+                          re.IGNORECASE)
+_AUTOCOMMIT = re.compile(r'^(VACUUM|PRAGMA|CREATE\s+DATABASE|DROP\s+DATABASE|ALTER\s+SYSTEM|REINDEX\s+DATABASE)\b|\bCONCURRENTLY\b',
+                         re.IGNORECASE)
+
+
+def is_transaction(statement: str) -> bool:
+    """
+    statement is transaction control (BEGIN / COMMIT / END), script transactions are managed by sql_file. \n
+    :param statement: SQL statement without comments.
+    :return: bool.
+    """
+    return _TRANSACTION.match(statement) is not None
+
+
+def is_autocommit(statement: str) -> bool:
+    """
+    statement can not run (or has no effect) inside transaction: VACUUM, PRAGMA, CREATE DATABASE, ... CONCURRENTLY. \n
+    :param statement: SQL statement without comments.
+    :return: bool.
+    """
+    return _AUTOCOMMIT.search(statement) is not None
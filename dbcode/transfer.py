@@ -0,0 +1,215 @@
+import io
+import re
+import gzip
+import json
+import decimal
+import datetime
+from contextlib import contextmanager
+
+
+FILE_FORMATS: tuple = ('csv', 'jsonl')
+
+
+class stream:
+    def __init__(self, file, progress=None) -> None:
+        """
+        text file wrapper counting characters read / written, csv and COPY read and write through it. \n
+        :param file: text file object.
+        :param progress: function (rows, size) called on every write / read, rows is None.
+        """
+        self.file = file
+        self.progress = progress
+        self.size: int = 0
+
+    def write(self, data: str) -> int:
+        self.size += len(data)
+        self.progress(None, self.size) if self.progress is not None else None
+        return self.file.write(data)
+
+    def read(self, size: int = -1) -> str:
+        data: str = self.file.read(size)
+        self.size += len(data)
+        self.progress(None, self.size) if self.progress is not None else None
+        return data
+
+    def readline(self, size: int = -1) -> str:
+        data: str = self.file.readline(size)
+        self.size += len(data)
+        return data
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> str:
+        data: str = self.readline()
+        if not data:
+            raise StopIteration
+        return data
+
+
+@contextmanager
+def open_stream(file, mode: str, compress: bool = None, encoding: str = 'utf-8'):
+    """
+    open path or file object as text stream, gzip-compressed if compress or path ends with .gz. \n
+    :param file: file path or file object (text, or binary for gzip).
+    :param mode: r / w.
+    :param compress: gzip (None - by file extension).
+    :param encoding: file encoding.
+    :return: stream.
+    """
+    if hasattr(file, 'read') or hasattr(file, 'write'):
+        if compress:
+            with gzip.open(file, f'{mode}t', encoding=encoding, newline='') as handle:
+                yield stream(handle)
+        elif isinstance(file, io.TextIOBase):
+            yield stream(file)
+        else:
+            handle = io.TextIOWrapper(file, encoding=encoding, newline='')
+            try:
+                yield stream(handle)
+            finally:
+                handle.flush() if mode == 'w' else None
+                handle.detach()
+        return
+    compress: bool = str(file).endswith('.gz') if compress is None else compress
+    if compress:
+        handle = gzip.open(file, f'{mode}t', encoding=encoding, newline='')
+    else:
+        handle = open(file, mode, encoding=encoding, newline='')
+    with handle:
+        yield stream(handle)
+
+
+def json_default(value):
+    """
+    JSON value of types json does not serialize (dates, bytes as postgresql bytea hex, decimals). \n
+    :param value: value.
+    :return: serializable value.
+    """
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return csv_value(value)
+    if isinstance(value, decimal.Decimal):
+        return float(value)
+    return str(value)
+
+
+def csv_value(value):
+    """
+    CSV value: bytes as postgresql bytea hex ('\\x...'), dict and list as JSON. \n
+    :param value: value.
+    :return: CSV value.
+    """
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return '\\x' + bytes(value).hex()
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, default=json_default)
+    return value
+
+
+_COPY_ESCAPES: dict = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r'})
+
+
+def copy_value(value) -> str:
+    """
+    postgresql COPY text format value: NULL as \\N, bytes as bytea hex, booleans as t / f,
+    backslash, tab and line breaks escaped. \n
+    :param value: bind parameter.
+    :return: COPY value.
+    """
+    if value is None:
+        return '\\N'
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+    value = csv_value(value)
+    return str(value).translate(_COPY_ESCAPES)
+
+
+def copy_rows(rows) -> str:
+    """
+    rows in postgresql COPY text format. \n
+    :param rows: list of rows (bind parameters).
+    :return: COPY data.
+    """
+    return ''.join('\t'.join(map(copy_value, row)) + '\n' for row in rows)
+
+
+_CSV_FIELD = re.compile(r'"((?:[^"]|"")*)"|([^,\r\n]*)')
+
+
+def csv_line(values) -> str:
+    """
+    CSV line as postgresql COPY CSV writes it: NULL is empty unquoted field, text is quoted
+    (empty string is ""), numbers are not quoted. \n
+    :param values: row values.
+    :return: CSV line.
+    """
+    fields: list = []
+    for value in values:
+        value = csv_value(value)
+        if value is None:
+            fields.append('')
+        elif isinstance(value, bool):
+            fields.append(str(int(value)))
+        elif isinstance(value, (int, float, decimal.Decimal)):
+            fields.append(repr(value) if isinstance(value, float) else str(value))
+        else:
+            fields.append('"' + str(value).replace('"', '""') + '"')
+    return ','.join(fields) + '\n'
+
+
+def read_csv(file):
+    """
+    read CSV file, empty unquoted field is NULL (None) and "" is empty string (csv.reader reads both as ''). \n
+    :param file: stream.
+    :return: generator of rows.
+    """
+    while True:
+        line: str = file.readline()
+        if not line:
+            return
+        # quoted field with line break continues on next line
+        while line.count('"') % 2:
+            more: str = file.readline()
+            if not more:
+                raise ValueError('unexpected end of file in quoted field')
+            line += more
+        line = line.rstrip('\r\n')
+        if not line:
+            continue
+        row: list = []
+        position: int = 0
+        while True:
+            match = _CSV_FIELD.match(line, position)
+            quoted, plain = match.groups()
+            row.append(quoted.replace('""', '"') if quoted is not None else (plain if plain != '' else None))
+            position = match.end()
+            if position >= len(line):
+                break
+            if line[position] != ',':
+                raise ValueError(f'unexpected character {line[position]!r} in CSV line {line[:80]!r}')
+            position += 1
+        yield row
+
+
+def read_jsonl(file, params: list = None):
+    """
+    read JSON Lines file. \n
+    :param file: stream.
+    :param params: columns (None - keys of the first line).
+    :return: (columns, generator of rows).
+    """
+    lines = (json.loads(line) for line in file if line.strip())
+    first: dict = next(lines, None)
+    if first is None:
+        return params or [], iter(())
+    params: list = list(first) if params is None else params
+
+    def rows():
+        yield [first.get(i) for i in params]
+        for line in lines:
+            yield [line.get(i) for i in params]
+    return params, rows()
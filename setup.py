@@ -12,7 +12,7 @@ setup(
     author="Vladimir N. Kalinin",
     author_email="<vkalininz@mail.ru>",
     description=DESCRIPTION,
-    packages=find_packages(),
+    packages=find_packages(exclude=['benchmarks', 'benchmarks.*']),
     install_requires=['psycopg2', 'psycopg2-binary'],
     keywords=['python', 'database', 'sqlite3', 'postgresql', 'psycopg2'],
     classifiers=[
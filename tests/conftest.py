@@ -0,0 +1,12 @@
+import pytest
+
+from dbcode import database
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = database()
+    db.connect_sql3(str(tmp_path / 'test.db'))
+    yield db
+    db.close()
+
@@ -0,0 +1,46 @@
+import asyncio
+
+import pytest
+
+from dbcode import async_database
+
+
+def run(coroutine):
+    return asyncio.run(asyncio.wait_for(coroutine, 10))
+
+
+@pytest.fixture
+def path(tmp_path, db):
+    db.create_table('t', {'t': {'n': 'INTEGER'}})
+    db.insert_many('t', [[i] for i in range(10)], 'n')
+    return str(tmp_path / 'test.db')
+
+
+def test_requests(path):
+    async def main():
+        db = async_database()
+        await db.connect_sql3(path)
+        counts = await asyncio.gather(*[db.select_count('t', 'n', i) for i in range(20)])
+        rows = [row['n'] async for row in db.iter_select('t', chunk_size=3)]
+        await db.close()
+        return counts, rows
+    counts, rows = run(main())
+    assert counts == [1] * 10 + [None] * 10
+    assert rows == list(range(10))
+
+
+def test_open_iterators_hold_pool(path):
+    # open iterators keep their pooled connections, other requests wait for them on event loop
+    async def main():
+        db = async_database()
+        await db.connect_sql3(path, pool_size=2, pool_timeout=1)
+        first, second = db.iter_select('t', chunk_size=2), db.iter_select('t', chunk_size=2)
+        assert (await first.__anext__())['n'] == (await second.__anext__())['n'] == 0
+        counts = asyncio.gather(db.select_count('t'), db.select_count('t'))
+        await asyncio.sleep(0.1)
+        rest = [row['n'] async for row in first]
+        await second.aclose()
+        result = await counts, rest
+        await db.close()
+        return result
+    assert run(main()) == ([10, 10], list(range(1, 10)))
@@ -0,0 +1,111 @@
+import threading
+
+import pytest
+
+from dbcode import database
+from dbcode.cache import result_cache, written_table
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = database(db_cache_size=16)
+    db.connect_sql3(str(tmp_path / 'test.db'))
+    db.create_table('t', {'t': {'name': 'TEXT', 'n': 'INTEGER', 'v': 'REAL'}})
+    db.insert_many('t', [('a', 1, 0.5), ('b', 2, 1.5), ('c', 3, 2.5)], ['name', 'n', 'v'])
+    yield db
+    db.close()
+
+
+def test_hit(db):
+    first = db.select('t', 'n', 1)
+    assert [tuple(i) for i in db.select('t', 'n', 1)] == [tuple(i) for i in first]
+    assert db.cache_stats()['hits'] == 1
+
+
+@pytest.mark.parametrize('result_format', [None, 'tuples'])
+def test_mutated_rows(db, result_format):
+    rows = db.select('t', result_format=result_format)
+    rows.clear()
+    assert len(db.select('t', result_format=result_format)) == 3
+    cached = db.select('t', result_format=result_format)
+    cached.pop()
+    assert len(db.select('t', result_format=result_format)) == 3
+
+
+def test_mutated_columns(db):
+    columns = db.select('t', result_format='columns')
+    columns['n'][0] = 999
+    columns['name'].append('x')
+    del columns['v']
+    cached = db.select('t', result_format='columns')
+    cached['n'][1] = 999
+    assert {i: list(v) for i, v in db.select('t', result_format='columns').items() if i != '_id'} == \
+        {'name': ['a', 'b', 'c'], 'n': [1, 2, 3], 'v': [0.5, 1.5, 2.5]}
+
+
+def test_mutated_aggregate(db):
+    rows = db.select_aggregate('t', {'total': ('sum', 'n')})
+    rows.clear()
+    assert db.select_aggregate('t', {'total': ('sum', 'n')})[0]['total'] == 6
+
+
+def test_invalidation(db):
+    assert db.select_count('t') == 3
+    assert len(db.select('t')) == 3
+    db.insert('t', ['d', 4, 3.5], ['name', 'n', 'v'])
+    assert db.select_count('t') == 4
+    assert len(db.select('t')) == 4
+    db.update('t', 'n', 10, 'name', 'd')
+    assert db.select('t', 'name', 'd')[0]['n'] == 10
+    db.delete('t', 'name', 'd')
+    assert db.select('t', 'name', 'd') is None
+    db.raw("INSERT INTO t (name, n, v) VALUES ('e', 5, 4.5)")
+    assert db.select_count('t') == 4
+
+
+def test_transaction_invalidation(db):
+    assert db.select_count('t') == 3
+    with db.transaction():
+        db.insert('t', ['d', 4, 3.5], ['name', 'n', 'v'])
+    assert db.select_count('t') == 4
+
+
+def test_generation():
+    # result read before invalidation is not cached after it
+    cache = result_cache()
+    generation = cache.generation('t')
+    cache.invalidate('t')
+    cache.set(('k',), 't', [(1,)], generation)
+    assert cache.get(('k',)) == (False, None)
+    cache.set(('k',), 't', [(1,)], cache.generation('t'))
+    assert cache.get(('k',)) == (True, [(1,)])
+    generation = cache.generation('t')
+    cache.invalidate()
+    cache.set(('k',), 't', [(2,)], generation)
+    assert cache.get(('k',)) == (False, None)
+
+
+def test_writer_race(db):
+    # result read while writer commits must not outlive the write
+    reads = threading.Event()
+    original = db._fetch
+
+    def fetch(cursor, result_format):
+        result = original(cursor, result_format)
+        reads.set()
+        writer.join()
+        return result
+
+    db._fetch = fetch
+    writer = threading.Thread(target=lambda: (reads.wait(), db._invalidate('t')))
+    writer.start()
+    db.select('t')
+    db._fetch = original
+    assert db.cache_stats()['size'] == 0
+
+
+def test_written_table():
+    assert written_table('INSERT INTO "main".t VALUES (1)') == 't'
+    assert written_table('UPDATE OR IGNORE t SET n = 1') == 't'
+    assert written_table('SELECT * FROM t') is None
+    assert written_table('SELECT 1; DELETE FROM t') is True
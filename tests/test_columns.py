@@ -0,0 +1,64 @@
+import sqlite3
+from array import array
+
+import pytest
+
+from dbcode import columns
+from dbcode.columns import fetch_columns, fetch_tuples, row_class
+
+
+@pytest.fixture(autouse=True)
+def no_numpy(monkeypatch):
+    # columns are compared as array.array also where numpy is installed
+    monkeypatch.setattr(columns, 'numpy', False)
+
+
+def fetch(values: list, chunk_size: int, fn=fetch_columns):
+    connection = sqlite3.connect(':memory:')
+    connection.execute('CREATE TABLE t (v)')
+    connection.executemany('INSERT INTO t VALUES (?)', [(i,) for i in values])
+    return fn(connection.execute('SELECT v, v FROM t ORDER BY rowid'), chunk_size)
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 3, 100])
+@pytest.mark.parametrize('values, typecode', [
+    ([1, 2, 3, 4], 'q'), ([1.5, 2.5, 3.5], 'd'), ([1, 2, 3.5, 4], 'd'), ([1.5, 2, 3, 4], 'd')])
+def test_numbers(values, typecode, chunk_size):
+    # int and float chunks are merged into float column
+    result = fetch(values, chunk_size)
+    assert list(result) == ['v', 'v_2']
+    assert isinstance(result['v'], array) and result['v'].typecode == typecode
+    assert list(result['v']) == values
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 100])
+@pytest.mark.parametrize('values', [[1, 2, None], [1.5, 'a', 2], [None, 1.5], ['a', 'b']])
+def test_lists(values, chunk_size):
+    # NULL or text turns column into list
+    result = fetch(values, chunk_size)
+    assert result['v'] == values and isinstance(result['v'], list)
+
+
+def test_overflow():
+    # integer overflowing int64 (postgresql numeric) turns column into list
+    storage = columns._extend(columns._extend(None, (1, 2)), (1 << 63,))
+    assert storage == [1, 2, 1 << 63]
+    assert columns._extend(None, (1.5, 1 << 70)) == array('d', [1.5, float(1 << 70)])
+
+
+def test_empty():
+    assert fetch([], 10) is None
+    assert fetch([], 10, fetch_tuples) is None
+
+
+def test_tuples():
+    rows = fetch([1, 2], 1, fetch_tuples)
+    assert rows == [(1, 1), (2, 2)]
+    assert rows[0].v == 1 and rows[0]._asdict() == {'v': 1, 'v_2': 1}
+
+
+def test_row_class():
+    row = row_class(['count', 'index', 'class', 'a b', 'name'])((1, 2, 3, 4, 5))
+    assert row.count(1) == 1 and row.index(2) == 1 and row.name == 5
+    assert row._fields[row._fields.index('class')] == 'class'
+    assert repr(row) == "row(count=1, index=2, class=3, a b=4, name=5)"
@@ -0,0 +1,116 @@
+import random
+import sqlite3
+
+import pytest
+
+from dbcode.compiler import compiler
+
+
+def test_select():
+    stmt = compiler().select('t', (('a', '='), ('b', ('IN', 3)), ('c', '!=')), ('a', 'b'), True, ('a',), 'DESC', True, 'OR')
+    assert stmt.sql == 'SELECT DISTINCT a, b FROM t WHERE a=? OR b IN (?, ?, ?) OR c!=? ORDER BY a DESC LIMIT ?'
+    assert compiler().select('t', ()).sql == 'SELECT * FROM t'
+
+
+def test_count_delete():
+    c = compiler()
+    assert c.count('t', (('a', '='),)).sql == 'SELECT count(*) AS count FROM t WHERE a=?'
+    assert c.delete('t', (('a', ('IN', 2)),)).sql == 'DELETE FROM t WHERE a IN (?, ?)'
+
+
+def test_insert_update():
+    c = compiler()
+    assert c.insert('t', ('a', 'b')).sql == 'INSERT INTO t (a, b) VALUES (?, ?)'
+    assert c.insert('t', ('a',), '_id').sql == 'INSERT INTO t (a) VALUES (?) RETURNING _id'
+    assert c.update('t', ('a', 'b'), (('_id', '='),)).sql == 'UPDATE t SET a=?, b=? WHERE _id=?'
+
+
+def test_prepare():
+    stmt = compiler('%s', prepare=True).update('t', ('a',), (('b', ('IN', 2)),))
+    assert stmt.sql == 'UPDATE t SET a=%s WHERE b IN (%s, %s)'
+    assert stmt.prepare == f'PREPARE {stmt.name} AS UPDATE t SET a=$1 WHERE b IN ($2, $3)'
+    assert stmt.execute == f'EXECUTE {stmt.name} (%s, %s, %s)'
+
+
+def test_cache():
+    c = compiler(max_size=2)
+    first = c.select('t', (('a', '='),))
+    assert c.select('t', (('a', '='),)) is first
+    assert first.hits == 1
+    c.count('t', ())
+    c.delete('t', (('a', '='),))
+    assert c.stats() == {'hits': 1, 'misses': 3, 'size': 2, 'max_size': 2}
+    assert c.select('t', (('a', '='),)) is not first
+    assert c.evicted == []
+
+
+def test_cache_evicted_prepared():
+    c = compiler('%s', prepare=True, max_size=1)
+    first = c.count('t', ())
+    c.count('u', ())
+    assert c.evicted == [first.name]
+    c.clear()
+    assert len(c.evicted) == 2 and c.stats()['size'] == 0
+
+
+def test_page_first():
+    stmt = compiler().page('t', (('a', '='),), None, ('v', '_id'))
+    assert stmt.sql == 'SELECT * FROM t WHERE (a=?) ORDER BY v ASC NULLS FIRST, _id ASC LIMIT ?'
+
+
+def test_page_row_comparison():
+    stmt = compiler().page('t', (), None, ('v', '_id'), 'ASC', (False, False))
+    assert stmt.sql == 'SELECT * FROM t WHERE (v, _id) > (?, ?) ORDER BY v ASC NULLS FIRST, _id ASC LIMIT ?'
+    assert compiler.seek_args([1, 2]) == [1, 2]
+
+
+@pytest.mark.parametrize('order_type', ['ASC', 'DESC'])
+@pytest.mark.parametrize('keys', [('_id',), ('a', '_id'), ('a', 'b', '_id')])
+def test_page_walk(order_type, keys):
+    # pages of keyset seek are the same as one ORDER BY request, NULL values included
+    connection = sqlite3.connect(':memory:')
+    connection.execute('CREATE TABLE t (_id INTEGER PRIMARY KEY, a, b)')
+    rng = random.Random(len(keys))
+    connection.executemany('INSERT INTO t (a, b) VALUES (?, ?)',
+                           [(rng.choice([None, 1, 2, 3]), rng.choice([None, 'x', 'y'])) for _ in range(200)])
+    c = compiler()
+    nulls: str = 'NULLS LAST' if order_type == 'DESC' else 'NULLS FIRST'
+    expected: list = connection.execute(
+        f"SELECT {', '.join(keys)} FROM t ORDER BY {', '.join(f'{i} {order_type} {nulls}' for i in keys)}").fetchall()
+    for size in (1, 7, 50):
+        rows: list = []
+        after: tuple = None
+        while True:
+            stmt = c.page('t', (), keys, keys, order_type, tuple(i is None for i in after) if after else None)
+            args: list = c.seek_args(list(after), order_type) if after else []
+            page: list = connection.execute(stmt.sql, args + [size]).fetchall()
+            if not page:
+                break
+            rows.extend(page)
+            after = page[-1]
+        assert rows == expected
+
+
+def test_upsert():
+    c = compiler()
+    assert c.upsert('t', ('_id', 'a'), ('_id',), ('a',)).sql == \
+        'INSERT INTO t (_id, a) VALUES (?, ?) ON CONFLICT (_id) DO UPDATE SET a=excluded.a'
+    assert c.upsert('t', ('_id', 'a'), ('_id',), ()).sql == 'INSERT INTO t (_id, a) VALUES (?, ?) ON CONFLICT (_id) DO NOTHING'
+
+
+def test_aggregate():
+    stmt = compiler().aggregate('t', (('a', '='),), (('n', 'count', '*'), ('s', 'sum', 'v')), ('g',),
+                                (('s', '>'),), ('s',), 'DESC', True)
+    assert stmt.sql == 'SELECT g, count(*) AS n, sum(v) AS s FROM t WHERE a=? GROUP BY g HAVING sum(v)>? ' \
+                       'ORDER BY s DESC LIMIT ?'
+
+
+def test_any():
+    c = compiler('%s')
+    assert c.select('t', (('a', 'ANY'),)).sql == 'SELECT * FROM t WHERE a = ANY(%s)'
+    assert c.select('t', (('a', ('ANY', 'TIMESTAMP')), ('b', '='))).sql == 'SELECT * FROM t WHERE a = ANY(%s::TIMESTAMP[]) AND b=%s'
+    assert c.delete('t', (('a', ('ANY', 'DOUBLE PRECISION')),)).sql == 'DELETE FROM t WHERE a = ANY(%s::DOUBLE PRECISION[])'
+
+
+def test_partition():
+    assert compiler().partition('t', (('a', '='),), None, '_id').sql == 'SELECT * FROM t WHERE (a=?) AND _id >= ? AND _id <= ?'
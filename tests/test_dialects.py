@@ -0,0 +1,37 @@
+import os
+import sys
+import decimal
+import datetime
+import subprocess
+
+from dbcode.dialects import dialect, sqlite3_dialect, postgresql_dialect
+from dbcode.schema import bind_value, column_definition
+
+
+class custom_dialect(dialect):
+    types: dict = {'TEXT': 'TEXT', 'NUMERIC': 'DECIMAL', 'BOOLEAN': 'BOOL', 'TIMESTAMP': 'DATETIME'}
+
+
+def test_registered_dialect_binds_native_values():
+    # dialect without own binding gets python values adapted by driver, not text of sqlite3
+    moment = datetime.datetime(2024, 5, 6, 7, 8, 9)
+    for backend in (custom_dialect(), postgresql_dialect()):
+        assert bind_value(backend, 'NUMERIC', ' 1.50') == decimal.Decimal('1.50')
+        assert bind_value(backend, 'BOOLEAN', 'yes') is True
+        assert bind_value(backend, 'TIMESTAMP', moment) is moment
+    assert column_definition(custom_dialect(), 'a', {'type': 'boolean', 'default': False}) == ('BOOLEAN', 'a BOOL DEFAULT FALSE')
+
+
+def test_sqlite3_binds_text_and_int():
+    backend = sqlite3_dialect()
+    assert bind_value(backend, 'NUMERIC', decimal.Decimal('1.50')) == '1.50'
+    assert bind_value(backend, 'BOOLEAN', 'off') == 0
+    assert bind_value(backend, 'TIMESTAMP', datetime.datetime(2024, 5, 6, 7, 8, 9)) == '2024-05-06 07:08:09'
+    assert column_definition(backend, 'a', {'type': 'boolean', 'default': True, 'null': False}) == \
+        ('BOOLEAN', 'a BOOLEAN NOT NULL DEFAULT 1')
+    assert column_definition(backend, 'b', "text default 'it''s'") == ('TEXT', "b TEXT default 'it''s'")
+
+
+def test_numpy_is_not_imported_with_package():
+    code = 'import sys, dbcode; dbcode.database(); assert "numpy" not in sys.modules'
+    assert subprocess.run([sys.executable, '-c', code], cwd=os.path.dirname(os.path.dirname(__file__))).returncode == 0
@@ -0,0 +1,41 @@
+import pytest
+
+
+@pytest.fixture
+def table(db):
+    db.create_table('u', {'u': {'count': 'INTEGER', 'name': 'TEXT'}})
+    db.insert_many('u', [(3, 'c'), (None, 'a'), (1, 'b'), (None, 'd'), (2, 'e')], ['count', 'name'])
+    return db
+
+
+def walk(db, page_size: int, **kwargs) -> list:
+    rows: list = []
+    after = None
+    for _ in range(100):
+        page, after = db.select_page('u', after, page_size, **kwargs)
+        rows.extend(tuple(i) for i in page or [])
+        if after is None:
+            return rows
+    raise AssertionError('pages do not end')
+
+
+@pytest.mark.parametrize('result_format', [None, 'tuples'])
+@pytest.mark.parametrize('order_type', ['ASC', 'DESC'])
+@pytest.mark.parametrize('page_size', [1, 2, 10])
+def test_walk(table, result_format, order_type, page_size):
+    expected: list = [tuple(i) for i in table.raw(
+        f"SELECT * FROM u ORDER BY count {order_type} {'NULLS LAST' if order_type == 'DESC' else 'NULLS FIRST'}, _id {order_type}")]
+    assert walk(table, page_size, order_fields='count', order_type=order_type, result_format=result_format) == expected
+
+
+def test_token_of_tuple_row_without_attribute(table):
+    # count has no attribute on tuple rows (tuple.count)
+    page, after = table.select_page('u', page_size=2, order_fields='count', result_format='tuples')
+    assert [tuple(i) for i in page] == [(2, None, 'a'), (4, None, 'd')]
+    page, after = table.select_page('u', after, page_size=2, order_fields='count', result_format='tuples')
+    assert [tuple(i) for i in page] == [(3, 1, 'b'), (5, 2, 'e')]
+
+
+def test_invalid_token(table):
+    assert table.select_page('u', 'not a token') is False
+    assert table.select_page('u', [1, 2, 3]) is False
@@ -0,0 +1,41 @@
+import decimal
+import datetime
+
+import pytest
+
+from dbcode.dialects import sqlite3_dialect, postgresql_dialect
+from dbcode.schema import column_type, bind_value
+
+
+@pytest.mark.parametrize('native, expected', [
+    ('INTEGER', 'INTEGER'), ('int4', 'INTEGER'), ('BIGINT', 'INTEGER'), ('unsigned big int', 'INTEGER'),
+    ('interval', 'TEXT'), ('point', 'TEXT'), ('varchar(10)', 'TEXT'), ('character varying', 'TEXT'),
+    ('numeric(10, 2)', 'NUMERIC'), ('DECIMAL', 'NUMERIC'), ('double  precision', 'REAL'), ('float8', 'REAL'),
+    ('timestamp with time zone', 'TIMESTAMP'), ('bool', 'BOOLEAN'), ('jsonb', 'JSON'), ('bytea', 'BLOB'),
+    ('', 'TEXT'), (None, 'TEXT')])
+def test_column_type(native, expected):
+    assert column_type(native) == expected
+
+
+@pytest.mark.parametrize('kind, value, expected', [
+    (None, 5, '5'), ('TEXT', '', ''), ('TEXT', None, None), ('INTEGER', '', None), ('INTEGER', '7', 7),
+    ('INTEGER', 'x', 'x'), ('REAL', '1.5', 1.5), ('NUMERIC', 3, 3), ('NUMERIC', '0.10', '0.10'),
+    ('NUMERIC', decimal.Decimal('1e-20'), '1E-20'), ('BOOLEAN', 'no', 0), ('BOOLEAN', 'True', 1),
+    ('TIMESTAMP', datetime.date(2024, 1, 2), '2024-01-02'), ('JSON', {'a': 1}, '{"a": 1}'),
+    ('BLOB', '\\x00ff', b'\x00\xff'), ('BLOB', 'ab', b'ab')])
+def test_bind_value_sqlite3(kind, value, expected):
+    assert bind_value(sqlite3_dialect(), kind, value) == expected
+
+
+def test_bind_value_postgresql():
+    backend = postgresql_dialect()
+    assert bind_value(backend, 'NUMERIC', '0.10') == decimal.Decimal('0.10')
+    assert bind_value(backend, 'BOOLEAN', 'f') is False
+    assert bind_value(backend, 'TIMESTAMP', '2024-01-02 03:04') == '2024-01-02 03:04'
+
+
+def test_numeric_keeps_precision(db):
+    db.create_table('t', {'t': {'d': 'NUMERIC', 's': 'TEXT'}})
+    db.insert_many('t', [['0.10', None], ['1234567890123456789', '']], ['d', 's'])
+    assert [tuple(i) for i in db.raw('SELECT d, s FROM t ORDER BY _id')] == [(0.1, None), (1234567890123456789, '')]
+    assert db.get_column_types('t') == {'d': 'NUMERIC', 's': 'TEXT'}
@@ -0,0 +1,141 @@
+import io
+import sqlite3
+
+import pytest
+
+from dbcode.script import script, strip_comments, is_transaction, is_autocommit
+
+
+CHUNK_SIZES: list = [1, 2, 7, 64, 1 << 20]
+
+
+def statements(text: str, chunk_size: int, complete=None) -> list:
+    return [statement for statement, _ in script(io.StringIO(text), complete, chunk_size)]
+
+
+@pytest.mark.parametrize('chunk_size', CHUNK_SIZES)
+def test_split(chunk_size):
+    text = 'CREATE TABLE a (x);\nINSERT INTO a VALUES (1);;\n  ;\nSELECT 1'
+    assert statements(text, chunk_size) == ['CREATE TABLE a (x)', 'INSERT INTO a VALUES (1)', 'SELECT 1']
+
+
+@pytest.mark.parametrize('chunk_size', CHUNK_SIZES)
+def test_quotes(chunk_size):
+    text = "INSERT INTO a VALUES ('x;y', 'it''s;', \"col;\");\n" \
+           "INSERT INTO a VALUES (E'back\\';slash', e'\\\\');\n" \
+           "SELECT 'tail'"
+    assert statements(text, chunk_size) == ["INSERT INTO a VALUES ('x;y', 'it''s;', \"col;\")",
+                                            "INSERT INTO a VALUES (E'back\\';slash', e'\\\\')",
+                                            "SELECT 'tail'"]
+
+
+@pytest.mark.parametrize('chunk_size', CHUNK_SIZES)
+def test_identifier_ending_with_e_is_not_escape_string(chunk_size):
+    text = "SELECT name'\\';\nSELECT 2"
+    assert statements(text, chunk_size) == ["SELECT name'\\'", 'SELECT 2']
+
+
+@pytest.mark.parametrize('chunk_size', CHUNK_SIZES)
+def test_comments(chunk_size):
+    text = '-- first; comment\nSELECT 1; /* block; /* nested; */ still; */ SELECT 2;\n-- only comment;\n/* x; */'
+    assert statements(text, chunk_size) == ['-- first; comment\nSELECT 1', '/* block; /* nested; */ still; */ SELECT 2']
+
+
+@pytest.mark.parametrize('chunk_size', CHUNK_SIZES)
+def test_dollar_tags(chunk_size):
+    body = "CREATE FUNCTION f() RETURNS trigger AS $fn$ BEGIN PERFORM 'a;'; RETURN $$x;$$; END $fn$ LANGUAGE plpgsql"
+    text = f'{body};\nDO $$ BEGIN NULL; END $$;\nSELECT $1, a$b$ FROM t; SELECT 3'
+    assert statements(text, chunk_size) == [body, 'DO $$ BEGIN NULL; END $$', 'SELECT $1, a$b$ FROM t', 'SELECT 3']
+
+
+@pytest.mark.parametrize('chunk_size', CHUNK_SIZES)
+def test_trigger(chunk_size):
+    trigger = 'CREATE TRIGGER t_track AFTER INSERT ON t BEGIN INSERT INTO log VALUES (1); UPDATE c SET n = n + 1; END'
+    text = f'CREATE TABLE t (x);\n{trigger};\nINSERT INTO t VALUES (1);'
+    assert statements(text, chunk_size, sqlite3.complete_statement) == \
+        ['CREATE TABLE t (x)', trigger, 'INSERT INTO t VALUES (1)']
+
+
+@pytest.mark.parametrize('chunk_size', CHUNK_SIZES)
+def test_unterminated(chunk_size):
+    assert statements("SELECT 1; SELECT 'open;", chunk_size) == ['SELECT 1', "SELECT 'open;"]
+
+
+@pytest.mark.parametrize('chunk_size', CHUNK_SIZES)
+def test_copy(chunk_size):
+    text = 'COPY a (x, y) FROM STDIN;\n1\t\\N\n2\tb;c\n\\.\nSELECT 1;\nCOPY a FROM stdin;\n3\tc\n\\.\nSELECT 2;'
+    result: list = []
+    for statement, data in script(io.StringIO(text), None, chunk_size):
+        result.append((statement, data.read() if data is not None and statement.endswith('STDIN') else None))
+    # data of second COPY is not read by caller, it is skipped
+    assert result == [('COPY a (x, y) FROM STDIN', '1\t\\N\n2\tb;c\n'), ('SELECT 1', None),
+                      ('COPY a FROM stdin', None), ('SELECT 2', None)]
+
+
+@pytest.mark.parametrize('chunk_size', CHUNK_SIZES)
+def test_copy_readline(chunk_size):
+    source = script(io.StringIO('COPY a FROM STDIN;\r\n1\r\n2\r\n\\.\r\nSELECT 1'), None, chunk_size)
+    iterator = iter(source)
+    statement, data = next(iterator)
+    assert statement == 'COPY a FROM STDIN'
+    assert [data.readline(), data.readline(), data.readline(), data.readline()] == ['1\r\n', '2\r\n', '', '']
+    assert next(iterator) == ('SELECT 1', None)
+
+
+@pytest.mark.parametrize('chunk_size', CHUNK_SIZES)
+def test_position(chunk_size):
+    text = 'SELECT 1;\nSELECT 22;\n-- end\n'
+    source = script(io.StringIO(text), None, chunk_size)
+    positions: list = [source.position for _ in source]
+    assert positions == [len('SELECT 1;'), len('SELECT 1;\nSELECT 22;')]
+    assert source.position == len(text)
+
+
+def test_strip_comments():
+    assert strip_comments('-- a\n SELECT /* b */ 1 ') == 'SELECT   1'
+    assert strip_comments('-- only\n/* comments */') == ''
+
+
+@pytest.mark.parametrize('statement, expected', [
+    ('BEGIN', True), ('begin immediate transaction', True), ('COMMIT', True), ('END WORK', True),
+    ('START TRANSACTION', True), ('BEGIN; SELECT 1', False), ('SELECT 1', False)])
+def test_is_transaction(statement, expected):
+    assert is_transaction(statement) is expected
+
+
+@pytest.mark.parametrize('statement, expected', [
+    ('VACUUM', True), ('PRAGMA optimize', True), ('CREATE INDEX CONCURRENTLY i ON t (x)', True),
+    ('CREATE DATABASE d', True), ('CREATE TABLE vacuum_log (x)', False), ('SELECT 1', False)])
+def test_is_autocommit(statement, expected):
+    assert is_autocommit(statement) is expected
+
+
+def test_sql_file(db, tmp_path):
+    path = tmp_path / 'script.sql'
+    path.write_text('BEGIN;\nCREATE TABLE a (x);\n'
+                    'CREATE TRIGGER a_double AFTER INSERT ON a BEGIN INSERT INTO b VALUES (NEW.x || NEW.x); END;\n'
+                    "CREATE TABLE b (y);\nINSERT INTO a VALUES (1);\nINSERT INTO a VALUES ('2;');\nCOMMIT;\n")
+    progress: list = []
+    assert db.sql_file(str(path), batch_size=2, progress=lambda count, size: progress.append(count)) == 7
+    # BEGIN / COMMIT of the file are skipped, but counted (resume_from is statement index)
+    assert progress == [2, 4, 6, 7]
+    assert [tuple(i) for i in db.raw('SELECT x FROM a ORDER BY rowid')] == [(1,), ('2;',)]
+    assert [tuple(i) for i in db.raw('SELECT y FROM b ORDER BY rowid')] == [('11',), ('2;2;',)]
+
+
+def test_sql_file_resume(db, tmp_path):
+    path = tmp_path / 'script.sql'
+    path.write_text('CREATE TABLE a (x);\n' + ''.join(f'INSERT INTO a VALUES ({i});\n' for i in range(5)) +
+                    'INSERT INTO missing VALUES (1);\nINSERT INTO a VALUES (5);\n')
+    progress: list = []
+    assert db.sql_file(str(path), batch_size=2, progress=lambda count, size: progress.append(count)) is False
+    # batch with failed statement is rolled back
+    assert progress == [2, 4, 6]
+    assert [i[0] for i in db.raw('SELECT x FROM a ORDER BY x')] == [0, 1, 2, 3, 4]
+
+    path.write_text(path.read_text().replace('missing', 'a'))
+    progress.clear()
+    assert db.sql_file(str(path), batch_size=2, resume_from=6, progress=lambda count, size: progress.append(count)) == 8
+    # skipped statements are counted
+    assert progress == [8]
+    assert [i[0] for i in db.raw('SELECT x FROM a ORDER BY x')] == [0, 1, 1, 2, 3, 4, 5]
@@ -0,0 +1,39 @@
+import pytest
+
+from dbcode import database
+
+
+@pytest.fixture
+def table(tmp_path):
+    db = database(db_cache_size=16)
+    db.connect_sql3(str(tmp_path / 'test.db'))
+    db.create_table('t', {'t': {'n': 'INTEGER', 'created': 'TIMESTAMP', 'name': None}})
+    db.insert_many('t', [(i, f'2024-01-{i + 1:02d}', f'n{i}') for i in range(20)], ['n', 'created', 'name'])
+    yield db
+    db.close()
+
+
+@pytest.mark.parametrize('chunk_size', [None, 1, 3, 7])
+def test_select_in(table, chunk_size):
+    rows = table.select_in('t', 'n', [1, 5, 5, 19, 30], chunk_size=chunk_size)
+    assert sorted(i['n'] for i in rows) == [1, 5, 19]
+
+
+def test_select_many_values(table):
+    # list value is IN condition, split under max count of bind parameters
+    table._dialect.max_variables = lambda: 4
+    assert table.select_count('t', 'n', [list(range(0, 20, 2))]) == 10
+
+
+def test_any_chunks(table):
+    # without max count of bind parameters chunk is one array, casted to column type array
+    table._dialect.max_variables = lambda: None
+    assert [c for c, _ in table._in_chunks('t', 'created', ['2024-01-01'])] == [('created', ('ANY', 'TIMESTAMP'))]
+    assert [c for c, _ in table._in_chunks('t', '_id', [1, 2])] == [('_id', ('ANY', 'INTEGER'))]
+    assert [c for c, _ in table._in_chunks('t', 'name', ['n1'])] == [('name', ('ANY', 'TEXT'))]
+
+
+def test_any_cache_key(table):
+    # array bind parameter is cached by value (sqlite3 itself has no = ANY)
+    table._dialect.max_variables = lambda: None
+    assert table.select_count('t', 'n', [[1, 2]]) is False
@@ -0,0 +1,59 @@
+import pytest
+
+from dbcode import database
+
+
+@pytest.fixture
+def target(tmp_path):
+    db = database()
+    db.connect_sql3(str(tmp_path / 'target.db'))
+    db.create_table('t', {'t': {'name': 'TEXT', 'n': 'INTEGER'}})
+    yield db
+    db.close()
+
+
+@pytest.fixture
+def source(db):
+    db.create_table('t', {'t': {'name': 'TEXT', 'n': 'INTEGER'}}, track=True)
+    return db
+
+
+def rows(db) -> list:
+    return [tuple(i) for i in db.raw('SELECT _id, name, n FROM t ORDER BY _id') or []]
+
+
+def test_sync(source, target):
+    source.insert_many('t', [[f'r{i}', i] for i in range(5)], ['name', 'n'])
+    versions = source.sync_to(target, 't', batch_size=2)
+    assert rows(target) == rows(source) and len(rows(target)) == 5
+
+    source.update('t', 'n', 10, '_id', 1)
+    source.delete('t', '_id', 2)
+    source.update('t', '_id', 20, '_id', 3)
+    source.insert('t', ['r5', 5], ['name', 'n'])
+    versions = source.sync_to(target, 't', versions, batch_size=2)
+    assert rows(target) == rows(source)
+    assert [i[0] for i in rows(target)] == [1, 4, 5, 20, 21]
+
+    # repeated sync from the same version is idempotent
+    assert source.sync_to(target, 't', versions) == versions
+    assert source.sync_to(target, 't', 0, batch_size=3) == versions
+    assert rows(target) == rows(source)
+
+
+def test_failed_batch_is_rolled_back(source, target):
+    target.create_index('t', 'name', unique=True)
+    target.insert('t', ['taken', 0], ['name', 'n'], _id=100)
+    source.insert_many('t', [['a', 1], ['b', 2], ['c', 3], ['taken', 4]], ['name', 'n'])
+    assert source.sync_to(target, 't', batch_size=2) is False
+    # first batch is applied, second one (with unique conflict) is rolled back
+    assert rows(target) == [(1, 'a', 1), (2, 'b', 2), (100, 'taken', 0)]
+    target.delete('t', '_id', 100)
+    versions = source.sync_to(target, 't', {'t': 2}, batch_size=2)
+    assert versions == {'t': 4}
+    assert rows(target) == rows(source)
+
+
+def test_not_tracked(source, target):
+    source.create_table('u', {'u': {'name': 'TEXT'}})
+    assert source.sync_to(target, ['t', 'u']) is False
@@ -0,0 +1,77 @@
+import sqlite3
+
+import pytest
+
+
+@pytest.fixture
+def table(db):
+    db.create_table('t', {'t': {'name': 'TEXT NOT NULL'}})
+    return db
+
+
+def names(db) -> list:
+    return [i[0] for i in db.raw('SELECT name FROM t ORDER BY _id') or []]
+
+
+def test_commit(table):
+    with table.transaction():
+        table.insert('t', 'a', 'name')
+        table.insert('t', 'b', 'name')
+    assert names(table) == ['a', 'b']
+
+
+def test_exception(table):
+    with pytest.raises(KeyError):
+        with table.transaction():
+            table.insert('t', 'a', 'name')
+            raise KeyError('x')
+    assert names(table) == []
+
+
+def test_failed_request(table):
+    # method returns False on driver error, transaction is rolled back and error is raised on exit
+    with pytest.raises(sqlite3.IntegrityError):
+        with table.transaction():
+            assert table.insert('t', 'a', 'name')
+            assert table.insert('t', 'b', 'name', 1) is False
+            assert table.insert('t', 'c', 'name')
+    assert names(table) == []
+    with table.transaction():
+        table.insert('t', 'd', 'name')
+    assert names(table) == ['d']
+
+
+@pytest.mark.parametrize('call', [
+    lambda db: db.insert_many('t', [['a'], [None]], 'name'),
+    lambda db: db.upsert('t', [[1, 'a'], [2, None]], ['_id', 'name']),
+    lambda db: db.update_many('t', [[None, 1]], ['name', '_id']),
+    lambda db: db.select('missing'),
+    lambda db: list(db.iter_select('missing'))])
+def test_failed_bulk_request(table, call):
+    table.insert('t', 'x', 'name')
+    with pytest.raises(sqlite3.Error):
+        with table.transaction():
+            table.insert('t', 'y', 'name')
+            call(table)
+    assert names(table) == ['x']
+
+
+def test_nested(table):
+    with pytest.raises(sqlite3.IntegrityError):
+        with table.transaction():
+            table.insert('t', 'a', 'name')
+            with table.transaction():
+                table.insert('t', 'b', 'name', 1)
+            table.insert('t', 'c', 'name')
+    assert names(table) == []
+
+
+def test_savepoint(table):
+    with table.transaction():
+        table.insert('t', 'a', 'name')
+        with pytest.raises(sqlite3.IntegrityError):
+            with table.savepoint():
+                table.insert('t', 'b', 'name')
+                table.insert('t', 'b', 'name', 1)
+        table.insert('t', 'c', 'name')
+    assert names(table) == ['a', 'c']
@@ -0,0 +1,79 @@
+import io
+import gzip
+
+import pytest
+
+from dbcode.transfer import csv_line, read_csv, read_jsonl, copy_rows
+
+
+ROWS: list = [(1, 'plain', 1.5), (2, '', None), (3, None, 2.0), (4, 'quote " comma, \nline', -3.25)]
+
+
+@pytest.fixture
+def db(db):
+    db.create_table('t', {'t': {'n': 'INTEGER', 's': 'TEXT', 'r': 'REAL'}})
+    db.insert_many('t', [list(i) for i in ROWS], ['n', 's', 'r'])
+    db.create_table('u', {'u': {'n': 'INTEGER', 's': 'TEXT', 'r': 'REAL'}})
+    return db
+
+
+def table(db, name: str) -> list:
+    return [tuple(i) for i in db.raw(f'SELECT n, s, r FROM {name} ORDER BY n') or []]
+
+
+def test_csv_line():
+    assert csv_line([1, '', None, 'a"b', 1.5, True, b'\x00\xff']) == '1,"",,"a""b",1.5,1,"\\x00ff"\n'
+
+
+def test_read_csv():
+    text = 'n,s\n1,""\n2,\n3,"a ""b"",\nc"\r\n\n4,x\n'
+    assert list(read_csv(io.StringIO(text))) == [['n', 's'], ['1', ''], ['2', None], ['3', 'a "b",\nc'], ['4', 'x']]
+    with pytest.raises(ValueError):
+        list(read_csv(io.StringIO('1,"open\n')))
+    with pytest.raises(ValueError):
+        list(read_csv(io.StringIO('"a"b\n')))
+
+
+def test_read_jsonl():
+    params, rows = read_jsonl(io.StringIO('{"a": 1, "b": null}\n\n{"b": "x"}\n'))
+    assert params == ['a', 'b'] and list(rows) == [[1, None], [None, 'x']]
+    assert read_jsonl(io.StringIO(''), ['a'])[0] == ['a']
+
+
+@pytest.mark.parametrize('file_format', ['csv', 'jsonl'])
+def test_round_trip(db, tmp_path, file_format):
+    # NULL and empty string are kept apart in both formats
+    path = str(tmp_path / f't.{file_format}')
+    assert db.export_table('t', path, file_format) == len(ROWS)
+    assert db.import_table('u', path, file_format) == len(ROWS)
+    assert table(db, 'u') == ROWS
+
+
+def test_round_trip_gzip_and_params(db, tmp_path):
+    path = str(tmp_path / 't.csv.gz')
+    progress: list = []
+    assert db.export_table('t', path, params='n', values=2, fields=['s', 'n']) == 1
+    with gzip.open(path, 'rt') as file:
+        assert file.read() == '"s","n"\n"",2\n'
+    assert db.import_table('u', path, params=['n', 's'], progress=lambda count, size: progress.append(count)) == 1
+    assert table(db, 'u') == [(2, '', None)]
+    assert progress == [1]
+
+
+def test_import_errors(db, tmp_path):
+    path = tmp_path / 'bad.csv'
+    path.write_text('n,s\n1,"open\n')
+    assert db.import_table('u', str(path)) is False
+    path.write_text('')
+    assert db.import_table('u', str(path)) == 0
+    assert db.export_table('t', str(path), 'xml') is False
+    assert table(db, 'u') == []
+
+
+def test_copy_rows():
+    # NULL is \N and empty string stays empty, special characters are escaped
+    rows = [(None, '', 'a\tb\nc\\d\re'), (True, False, b'\x00\xff'), (1.5, {'k': [1]}, '\\N')]
+    assert copy_rows(rows) == '\\N\t\ta\\tb\\nc\\\\d\\re\n' \
+                              't\tf\t\\\\x00ff\n' \
+                              '1.5\t{"k": [1]}\t\\\\N\n'
+    assert copy_rows([]) == ''